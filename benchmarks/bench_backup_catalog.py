@@ -0,0 +1,90 @@
+"""
+Benchmark backup listing from the backup catalog against a directory scan.
+
+Fills a temporary folder with --count server backup files (plus unrelated
+files, like a shared backup drive), then times:
+  - scan: glob + getmtime per file + sort, as the backup lists were built
+    before the catalog (--stat-latency adds a delay per stat to mimic a
+    network share)
+  - catalog: the full list and one page (--page) from the SQLite catalog
+  - reconcile: a background pass over the folder with nothing changed
+
+Usage (from the repository root):
+    python benchmarks/bench_backup_catalog.py [--count 5000] [--runs 5] [--stat-latency 0.0005]
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import backup_catalog
+from server import is_server_backup
+
+def scan_folder(folder, stat_latency):
+    """The backup list as built by scanning the folder"""
+    backups = []
+    for path in glob.glob(os.path.join(folder, 'server-backup-*.zip')):
+        time.sleep(stat_latency)
+        backups.append((path, os.path.getmtime(path), os.path.basename(path)))
+    backups.sort(key=lambda x: x[1], reverse=True)
+    return backups
+
+def median_time(func, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=5000, help="backup files in the folder")
+    parser.add_argument('--runs', type=int, default=5, help="runs per measurement (median is shown)")
+    parser.add_argument('--page', type=int, default=50, help="backups per page for the paginated query")
+    parser.add_argument('--stat-latency', type=float, default=0.0, help="seconds added to each stat of the scan")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        folder = os.path.join(directory, "backups")
+        os.makedirs(folder)
+        created = time.time() - args.count - 10 * backup_catalog.RECENT_WRITE_GRACE
+        for i in range(args.count):
+            path = os.path.join(folder, f"server-backup-{i:06d}.zip")
+            with open(path, 'wb') as f:
+                f.write(b"PK")
+            os.utime(path, (created + i, created + i))
+            if i % 10 == 0:
+                with open(os.path.join(folder, f"notes-{i:06d}.txt"), 'w') as f:
+                    f.write("not a backup")
+
+        catalog = backup_catalog.BackupCatalog(os.path.join(directory, "catalog.db"))
+        start = time.perf_counter()
+        catalog.list_backups(backup_catalog.BACKUP_TYPE_SERVER, folder, is_server_backup)
+        first = time.perf_counter() - start
+
+        expected = scan_folder(folder, 0)
+        listed = catalog.list_backups(backup_catalog.BACKUP_TYPE_SERVER, folder, is_server_backup)
+        if [path for path, _, _ in listed] != [path for path, _, _ in expected]:
+            print("The catalog does not match the folder scan")
+            return
+
+        results = [
+            ("scan", median_time(lambda: scan_folder(folder, args.stat_latency), args.runs)),
+            ("catalog", median_time(lambda: catalog.list_backups(backup_catalog.BACKUP_TYPE_SERVER, folder, is_server_backup), args.runs)),
+            (f"catalog page of {args.page}", median_time(
+                lambda: catalog.list_backups(backup_catalog.BACKUP_TYPE_SERVER, folder, is_server_backup, 1000, args.page), args.runs)),
+            ("reconcile", median_time(lambda: catalog.reconcile(backup_catalog.BACKUP_TYPE_SERVER), args.runs)),
+        ]
+        print(f"{args.count} backups, first listing (builds the catalog) {first * 1000:.0f} ms")
+        print(f"{'listing':<22} {'ms':>9} {'vs scan':>9}")
+        for name, seconds in results:
+            print(f"{name:<22} {seconds * 1000:>9.2f} {results[0][1] / seconds:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
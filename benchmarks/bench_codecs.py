@@ -0,0 +1,84 @@
+"""
+Benchmark the remote protocol wire codecs.
+
+Encodes and decodes a representative message of every type the server sends
+with each available codec, and reports the frame size and the time spent
+encoding and decoding one frame.
+
+Usage (from the repository root):
+    python benchmarks/bench_codecs.py [--iterations 2000]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from remote_protocol import (
+    RemoteMessage, encode_frame, decode_frame_payload, available_codecs, get_codec,
+    CMD_AUTH, CMD_SERVER_STATUS, CMD_RESOURCE_STATS, CMD_LOG_MESSAGE, CMD_PROGRESS_UPDATE,
+    STATUS_OK
+)
+
+def sample_messages():
+    """One realistic message per message type"""
+    backups = [
+        {
+            "path": f"C:\\FXServer\\backups\\database\\backup_2026-01-{day:02d}_03-00-00.sql",
+            "timestamp": f"2026-01-{day:02d} 03:00:00",
+            "filename": f"backup_2026-01-{day:02d}_03-00-00.sql"
+        }
+        for day in range(1, 31)
+    ]
+    return {
+        "AUTH": RemoteMessage(CMD_AUTH, status=STATUS_OK, message="Authentication successful",
+                              data={"request_ids": True, "codec": "json"}),
+        "COMMAND": RemoteMessage("GET_SERVER_STATUS", request_id=42),
+        "SERVER_STATUS": RemoteMessage(CMD_SERVER_STATUS, status=STATUS_OK, request_id=42,
+                                       data={"status": "RUNNING", "pid": 12345}),
+        "RESOURCE_STATS": RemoteMessage(CMD_RESOURCE_STATS, data={
+            "timestamp": "2026-01-15 12:00:00", "cpu_percent": 23.4, "ram_percent": 61.2,
+            "ram_used_gb": 9.79, "ram_total_gb": 16.0, "disk_percent": 48.1,
+            "disk_used_gb": 229.4, "disk_total_gb": 476.9, "network_sent_mb": 10234.56,
+            "network_recv_mb": 20456.78, "network_rate_mbps": 1.37
+        }),
+        "LOG_MESSAGE": RemoteMessage(CMD_LOG_MESSAGE, data={
+            "message": "Database backup completed: backup_2026-01-15_03-00-00.sql",
+            "timestamp": "12:00:00"
+        }),
+        "PROGRESS_UPDATE": RemoteMessage(CMD_PROGRESS_UPDATE, data={
+            "progress": 57, "message": "Backing up resources/[maps]/stream"
+        }),
+        "DB_BACKUPS": RemoteMessage("DB_BACKUPS", status=STATUS_OK, request_id=43,
+                                    data={"backups": backups}),
+    }
+
+def time_per_call(func, iterations):
+    """Average microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    codecs = [get_codec(name) for name in available_codecs()]
+    print(f"Codecs: {', '.join(codec.name for codec in codecs)}")
+    print(f"{'message':<16} {'codec':<8} {'bytes':>7} {'encode us':>10} {'decode us':>10}")
+
+    for name, message in sample_messages().items():
+        for codec in codecs:
+            frame = encode_frame(message, codec)
+            payload = frame[4:]
+            assert decode_frame_payload(payload, codec).data == message.data
+
+            encode_us = time_per_call(lambda: encode_frame(message, codec), args.iterations)
+            decode_us = time_per_call(lambda: decode_frame_payload(payload, codec), args.iterations)
+            print(f"{name:<16} {codec.name:<8} {len(frame):>7} {encode_us:>10.1f} {decode_us:>10.1f}")
+
+if __name__ == "__main__":
+    main()
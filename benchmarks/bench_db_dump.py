@@ -0,0 +1,135 @@
+"""
+Benchmark the database backup pipeline for each dump compression.
+
+Runs database.create_backup() against a stand-in mysqldump that streams a
+dump file to stdout, so the measurement covers the real pipeline (pipe
+reads, compression and disk writes) without a MySQL server. Reports the
+throughput in MB/s of uncompressed dump, the size on disk and the
+compression ratio, and checks that restore_backup() reproduces the dump.
+
+Without --dump a synthetic dump of FiveM/RedM-style INSERT statements is
+generated. Use a real mysqldump output for figures that match your data.
+
+Usage (from the repository root):
+    python benchmarks/bench_db_dump.py [--dump backup.sql] [--size-mb 200] [--runs 3]
+"""
+import os
+import sys
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import database
+
+def write_synthetic_dump(path, size_mb):
+    """Write about size_mb of mysqldump-like SQL with player, inventory and log rows"""
+    rng = random.Random(42)
+    target = size_mb * 1024 * 1024
+    items = ["bread", "water", "ammo_revolver", "pelt_deer", "gold_nugget", "bandage", "whiskey", "lockpick"]
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("-- MySQL dump (synthetic)\nSET NAMES utf8mb4;\n")
+        row_id = 0
+        while f.tell() < target:
+            f.write("INSERT INTO `characters` VALUES ")
+            f.write(",".join(
+                f"({row_id + i},'steam:1100001{rng.randrange(16 ** 8):08x}','{rng.choice(['John', 'Arthur', 'Sadie'])}',"
+                f"'{{\"cash\":{rng.random() * 5000:.2f},\"gold\":{rng.random() * 50:.2f},\"xp\":{rng.randrange(100000)}}}',"
+                f"'{{\"x\":{rng.uniform(-6000, 3000):.4f},\"y\":{rng.uniform(-4000, 2000):.4f},\"z\":{rng.uniform(0, 500):.4f}}}',"
+                f"'2026-0{rng.randrange(1, 10)}-{rng.randrange(10, 29)} {rng.randrange(10, 24)}:{rng.randrange(10, 60)}:00')"
+                for i in range(200)
+            ))
+            f.write(";\nINSERT INTO `character_inventories` VALUES ")
+            f.write(",".join(
+                f"({row_id + i},{rng.randrange(1, 5000)},'{rng.choice(items)}',{rng.randrange(1, 50)},NULL,'default')"
+                for i in range(200)
+            ))
+            f.write(";\n")
+            row_id += 200
+
+def make_fake_client(directory, dump_file):
+    """Stand-ins for mysqldump (prints the dump) and mysql (stores stdin). Returns (mysqldump, mysql, restored file)"""
+    restored = os.path.join(directory, "restored.sql")
+    if os.name == 'nt':
+        mysqldump, mysql = os.path.join(directory, "mysqldump.bat"), os.path.join(directory, "mysql.bat")
+        scripts = {mysqldump: f'@type "{dump_file}"\r\n', mysql: f'@more > "{restored}"\r\n'}
+    else:
+        mysqldump, mysql = os.path.join(directory, "mysqldump"), os.path.join(directory, "mysql")
+        scripts = {mysqldump: f'#!/bin/sh\nexec cat "{dump_file}"\n', mysql: f'#!/bin/sh\nexec cat > "{restored}"\n'}
+    for path, script in scripts.items():
+        with open(path, 'w', newline='') as f:
+            f.write(script)
+        os.chmod(path, 0o755)
+    return mysqldump, mysql, restored
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dump', help="mysqldump output to replay (default: generate a synthetic dump)")
+    parser.add_argument('--size-mb', type=int, default=200, help="size of the synthetic dump")
+    parser.add_argument('--runs', type=int, default=3, help="backups per compression (median is shown)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        dump_file = args.dump
+        if not dump_file:
+            dump_file = os.path.join(directory, "dump.sql")
+            print(f"Generating a {args.size_mb} MB synthetic dump...")
+            write_synthetic_dump(dump_file, args.size_mb)
+        dump_size = os.path.getsize(dump_file)
+        expected = file_digest(dump_file)
+
+        mysqldump, mysql, restored = make_fake_client(directory, dump_file)
+        database.MYSQLDUMP_PATH = mysqldump
+        database.MYSQL_PATH = mysql
+        database.BACKUP_DIR = os.path.join(directory, "backups")
+
+        # Reading the dump through the pipe alone is the ceiling for every compression
+        start = time.perf_counter()
+        with open(dump_file, 'rb') as f:
+            while f.read(database.DUMP_CHUNK_SIZE):
+                pass
+        print(f"Dump: {dump_size / (1024 * 1024):.1f} MB (read at {dump_size / (1024 * 1024) / (time.perf_counter() - start):.0f} MB/s)")
+        print()
+
+        compressions = ["none", "gzip"] + (["zstd"] if database.zstandard else [])
+        print(f"{'compression':<12} {'dump MB/s':>10} {'restore MB/s':>13} {'on disk MB':>11} {'ratio':>7}")
+        for compression in compressions:
+            database.DB_BACKUP_COMPRESSION = compression
+            dump_times, restore_times = [], []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                success, backup_file = database.create_backup()
+                dump_times.append(time.perf_counter() - start)
+                if not success:
+                    print(f"{compression:<12} failed: {backup_file}")
+                    break
+                size = os.path.getsize(backup_file)
+
+                start = time.perf_counter()
+                success, message = database.restore_backup(backup_file)
+                restore_times.append(time.perf_counter() - start)
+                os.remove(backup_file)
+                if not success or file_digest(restored) != expected:
+                    print(f"{compression:<12} restore did not reproduce the dump: {message}")
+                    break
+                # Timestamped names have a one second resolution
+                time.sleep(1)
+            else:
+                dump_rate = dump_size / (1024 * 1024) / statistics.median(dump_times)
+                restore_rate = dump_size / (1024 * 1024) / statistics.median(restore_times)
+                print(f"{compression:<12} {dump_rate:>10.0f} {restore_rate:>13.0f} "
+                      f"{size / (1024 * 1024):>11.1f} {dump_size / size:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
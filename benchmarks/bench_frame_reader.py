@@ -0,0 +1,100 @@
+"""
+Benchmark the remote protocol receive path.
+
+Streams length-prefixed frames over a loopback TCP connection and measures
+receive throughput with the previous reader (recv() chunks joined with
+`data += chunk`) and with FrameReader (recv_into() a reusable buffer).
+Two workloads are run: large frames just under the 10 MB cap, and a burst
+of small frames like RESOURCE_STATS and LOG_MESSAGE broadcasts.
+
+Usage (from the repository root):
+    python benchmarks/bench_frame_reader.py [--large 10] [--small 50000]
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from remote_protocol import FrameReader, MAX_MESSAGE_SIZE
+
+def legacy_read_frame(sock):
+    """The receive loop RemoteServer and RemoteClient used before FrameReader"""
+    length_bytes = b''
+    while len(length_bytes) < 4:
+        chunk = sock.recv(4 - len(length_bytes))
+        if not chunk:
+            return None
+        length_bytes += chunk
+    length = int.from_bytes(length_bytes, byteorder='big')
+    data = b''
+    while len(data) < length:
+        chunk = sock.recv(min(4096, length - len(data)))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+def frame_reader_read_frame(reader):
+    frame = reader.read_frame()
+    return frame[0] if frame else None
+
+def connected_pair():
+    """A loopback TCP connection: (sending socket, receiving socket)"""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    sender = socket.create_connection(listener.getsockname())
+    receiver, _ = listener.accept()
+    listener.close()
+    return sender, receiver
+
+def run(read_frame_factory, payload_size, count):
+    """Send `count` frames from a thread and time receiving them. Returns MB/s."""
+    sender, receiver = connected_pair()
+    frame = payload_size.to_bytes(4, byteorder='big') + os.urandom(16) * (payload_size // 16) + b'x' * (payload_size % 16)
+
+    def send_all():
+        for _ in range(count):
+            sender.sendall(frame)
+        sender.shutdown(socket.SHUT_WR)
+
+    read_frame = read_frame_factory(receiver)
+    thread = threading.Thread(target=send_all, daemon=True)
+    start = time.perf_counter()
+    thread.start()
+    for _ in range(count):
+        payload = read_frame()
+        assert payload is not None and len(payload) == payload_size
+    elapsed = time.perf_counter() - start
+    thread.join()
+    sender.close()
+    receiver.close()
+    return payload_size * count / elapsed / (1024 * 1024)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--large', type=int, default=10, help="number of ~10 MB frames")
+    parser.add_argument('--small', type=int, default=50000, help="number of 200 byte frames")
+    args = parser.parse_args()
+
+    readers = {
+        "legacy": lambda sock: (lambda: legacy_read_frame(sock)),
+        "FrameReader": lambda sock: (lambda reader=FrameReader(sock): frame_reader_read_frame(reader)),
+    }
+    workloads = [
+        (f"{args.large} x {(MAX_MESSAGE_SIZE - 1024) // (1024 * 1024)} MB", MAX_MESSAGE_SIZE - 1024, args.large),
+        (f"{args.small} x 200 B", 200, args.small),
+    ]
+
+    print(f"{'workload':<18} {'reader':<12} {'MB/s':>9}")
+    for label, payload_size, count in workloads:
+        for name, factory in readers.items():
+            throughput = run(factory, payload_size, count)
+            print(f"{label:<18} {name:<12} {throughput:>9.1f}")
+
+if __name__ == "__main__":
+    main()
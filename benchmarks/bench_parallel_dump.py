@@ -0,0 +1,261 @@
+"""
+Benchmark the parallel per-table database dump and restore against the
+single-stream ones.
+
+By default the configured database is dumped (into a temporary folder, not
+the backup directory) once per mode and worker count, and the median
+wall-clock time, throughput and speed-up over the single-stream dump are
+reported. With --restore each dump is also restored with as many mysql
+sessions as dump workers, and a single table is restored on its own from
+each - this OVERWRITES the configured database, so only use it against a
+scratch server (or with --simulate).
+
+With --simulate no MySQL server is needed: stand-in mysql and mysqldump
+clients serve a synthetic schema (a few large tables and many small ones,
+two of them with a quote and a backtick in their names),
+each producing (or, for a restore, loading) rows at --table-rate MB/s like
+a client limited by one core. This shows how the worker pool overlaps the tables; compression still
+uses real CPU time, so the speed-up also depends on the cores available.
+Each simulated backup is checked to list every table, so it can be
+restored on its own.
+
+Usage (from the repository root):
+    python benchmarks/bench_parallel_dump.py [--workers 2,4,8] [--runs 3]
+    python benchmarks/bench_parallel_dump.py --simulate [--restore] [--size-mb 200] [--table-rate 60]
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+# Synthetic schema: share of the total size per large table; the rest is split over SMALL_TABLES
+LARGE_TABLES = {"characters": 0.35, "character_inventories": 0.25, "loadout": 0.12, "logs": 0.08}
+SMALL_TABLES = 30
+QUOTED_TABLES = ["o'neil", "player`notes"]  # Names mysqldump writes as `o'neil` and `player``notes`
+
+def fake_client(program, args):
+    """Stand-in mysql/mysqldump (run by the wrapper scripts with FAKE_DB_DIR set)"""
+    directory = os.environ["FAKE_DB_DIR"]
+    rate = float(os.environ.get("FAKE_TABLE_RATE", "60")) * 1024 * 1024
+    with open(os.path.join(directory, "schema.json")) as f:
+        schema = json.load(f)
+    out = sys.stdout.buffer
+
+    if program == "mysql" and "-e" in args:
+        query = args[args.index("-e") + 1]
+        if "COUNT(*)" in query:
+            # Foreign key check after a restore - no orphaned rows
+            out.write(b"0\n" * query.count("COUNT(*)"))
+            out.flush()
+            return
+        # list_tables() query
+        for name, size in schema["tables"].items():
+            out.write(f"{name}\tBASE TABLE\t{size}\n".encode())
+        for name in schema["views"]:
+            out.write(f"{name}\tVIEW\t0\n".encode())
+    elif program == "mysql":
+        # Read lock session, or a restore - answer the lock's SELECT and keep what is restored
+        started = time.perf_counter()
+        received = 0
+        with open(os.path.join(directory, "restored.sql"), 'ab') as restored:
+            for line in sys.stdin.buffer:
+                if line.startswith(b"SELECT 'locked'"):
+                    out.write(b"locked\n")
+                    out.flush()
+                elif not line.startswith((b"FLUSH TABLES", b"UNLOCK TABLES", b"SET SESSION")):
+                    restored.write(line)
+                    # Limit the rate like a mysql client bound by one core
+                    received += len(line)
+                    delay = received / rate - (time.perf_counter() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+    else:
+        names = [arg for arg in args if not arg.startswith("--")][1:]
+        if "--no-data" in args:
+            for name in names:
+                out.write(f"CREATE VIEW `{name}` AS SELECT 1;\n".encode())
+            return
+        # One table per call from the parallel dump, all of them (with titles like mysqldump's) from the single-stream dump
+        if not names:
+            out.write(b"-- MySQL dump (simulated)\n/*!40101 SET NAMES utf8mb4 */;\n"
+                      b"/*!40014 SET @OLD_FOREIGN_KEY_CHECKS=@@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS=0 */;\n")
+        for name in names or list(schema["tables"]):
+            if not names:
+                out.write(f"\n--\n-- Table structure for table `{quote_name(name)}`\n--\n\n".encode())
+            started = time.perf_counter()
+            sent = 0
+            with open(os.path.join(directory, f"{name}.sql"), 'rb') as f:
+                for chunk in iter(lambda: f.read(256 * 1024), b""):
+                    out.write(chunk)
+                    sent += len(chunk)
+                    # Limit the rate like a mysqldump bound by one core
+                    delay = sent / rate - (time.perf_counter() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+        if not names:
+            out.write(b"/*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;\n\n/*!40101 SET SQL_MODE=@OLD_SQL_MODE */;\n"
+                      b"/*!40014 SET FOREIGN_KEY_CHECKS=@OLD_FOREIGN_KEY_CHECKS */;\n\n-- Dump completed\n")
+    out.flush()
+
+def quote_name(name):
+    """A table name as it appears between backticks"""
+    return name.replace("`", "``")
+
+def write_schema(directory, size_mb):
+    """Table dumps for the simulated database"""
+    rng = random.Random(7)
+    total = size_mb * 1024 * 1024
+    small_share = (1 - sum(LARGE_TABLES.values())) / SMALL_TABLES
+    shares = dict(LARGE_TABLES, **{f"small_table_{i:02d}": small_share * rng.uniform(0.2, 1.8) for i in range(SMALL_TABLES)})
+    shares.update({name: shares.pop(f"small_table_{i:02d}") for i, name in enumerate(QUOTED_TABLES)})
+    tables = {}
+    for name, share in shares.items():
+        target = int(total * share)
+        with open(os.path.join(directory, f"{name}.sql"), 'w', newline='\n') as f:
+            key = ",\n  CONSTRAINT `fk_character` FOREIGN KEY (`id`) REFERENCES `characters` (`id`)" if name == "character_inventories" else ""
+            f.write(f"DROP TABLE IF EXISTS `{quote_name(name)}`;\nCREATE TABLE `{quote_name(name)}` (\n  `id` int,\n  `data` text{key}\n);\n")
+            row = 0
+            while f.tell() < target:
+                values = ",".join(
+                    f"({row + i},'{{\"cash\":{rng.random() * 5000:.2f},\"id\":\"steam:1100001{rng.randrange(16 ** 8):08x}\"}}')"
+                    for i in range(100)
+                )
+                f.write(f"INSERT INTO `{quote_name(name)}` VALUES {values};\n")
+                row += 100
+        # Size estimate like information_schema's (pages are bigger than the SQL text)
+        tables[name] = int(target * 1.3)
+    with open(os.path.join(directory, "schema.json"), 'w') as f:
+        json.dump({"tables": tables, "views": ["character_summary"]}, f)
+
+def make_wrappers(directory):
+    """Executable mysql/mysqldump wrappers that run fake_client. Returns (mysqldump, mysql)"""
+    paths = []
+    for program in ("mysqldump", "mysql"):
+        if os.name == 'nt':
+            path = os.path.join(directory, f"{program}.bat")
+            script = f'@"{sys.executable}" "{os.path.abspath(__file__)}" --fake {program} %*\r\n'
+        else:
+            path = os.path.join(directory, program)
+            script = f'#!/bin/sh\nexec "{sys.executable}" "{os.path.abspath(__file__)}" --fake {program} "$@"\n'
+        with open(path, 'w', newline='') as f:
+            f.write(script)
+        os.chmod(path, 0o755)
+        paths.append(path)
+    return paths
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--fake":
+        fake_client(sys.argv[2], sys.argv[3:])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', default="2,4,8", help="comma-separated worker counts to compare")
+    parser.add_argument('--runs', type=int, default=3, help="dumps per mode (median is shown)")
+    parser.add_argument('--consistency', choices=["lock", "transaction"], help="parallel dump consistency (default: configured)")
+    parser.add_argument('--restore', action='store_true', help="also restore each dump (overwrites the database)")
+    parser.add_argument('--simulate', action='store_true', help="use stand-in clients and a synthetic schema")
+    parser.add_argument('--size-mb', type=int, default=200, help="size of the simulated database")
+    parser.add_argument('--table-rate', type=float, default=60, help="MB/s of each simulated mysqldump")
+    args = parser.parse_args()
+
+    from config_manager import load_config, apply_config_to_module
+    apply_config_to_module(load_config())
+    import database
+
+    with tempfile.TemporaryDirectory() as directory:
+        database.BACKUP_DIR = os.path.join(directory, "backups")
+        if args.simulate:
+            schema_dir = os.path.join(directory, "db")
+            os.makedirs(schema_dir)
+            print(f"Generating a {args.size_mb} MB simulated database...")
+            write_schema(schema_dir, args.size_mb)
+            os.environ["FAKE_DB_DIR"] = schema_dir
+            os.environ["FAKE_TABLE_RATE"] = str(args.table_rate)
+            with open(os.path.join(schema_dir, "schema.json")) as f:
+                schema = json.load(f)
+            database.MYSQLDUMP_PATH, database.MYSQL_PATH = make_wrappers(directory)
+        if args.consistency:
+            database.DB_DUMP_CONSISTENCY = args.consistency
+
+        modes = [("single", 1)] + [("parallel", int(workers)) for workers in args.workers.split(",")]
+        print(f"Database '{database.DB_NAME}', {database.backup_compression()} compression, {os.cpu_count()} CPUs")
+        header = f"{'mode':<10} {'workers':>7} {'wall s':>8} {'MB/s':>8} {'on disk MB':>11} {'speed-up':>9}"
+        if args.restore:
+            header += f" {'restore s':>10} {'speed-up':>9} {'1 table s':>10}"
+        print(header)
+        baseline = restore_baseline = None
+        for mode, workers in modes:
+            database.DB_DUMP_MODE = mode
+            database.DB_DUMP_WORKERS = workers
+            database.DB_RESTORE_WORKERS = workers
+            times, restore_times, table_times = [], [], []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                success, result = database.create_backup()
+                times.append(time.perf_counter() - start)
+                if not success:
+                    print(f"{mode:<10} {workers:>7} failed: {result}")
+                    return
+                if args.simulate:
+                    # Every table is listed (and so can be restored on its own), quoted names included
+                    success, tables = database.get_backup_tables(result)
+                    missing = set(schema["tables"]) - {table["name"] for table in tables} if success else tables
+                    if missing:
+                        print(f"{mode:<10} {workers:>7} tables missing from the backup's index: {missing}")
+                        return
+                if args.restore:
+                    if args.simulate:
+                        restored = os.path.join(schema_dir, "restored.sql")
+                        if os.path.exists(restored):
+                            os.remove(restored)
+                    start = time.perf_counter()
+                    success, message = database.restore_backup(result)
+                    restore_times.append(time.perf_counter() - start)
+                    if not success:
+                        print(f"{mode:<10} {workers:>7} restore failed: {message}")
+                        return
+                    # A mid-sized table on its own, as after a bad admin command
+                    success, tables = database.get_backup_tables(result)
+                    if not success:
+                        print(f"{mode:<10} {workers:>7} {tables}")
+                        return
+                    table = sorted(tables, key=lambda table: table["bytes"])[len(tables) // 2]["name"]
+                    start = time.perf_counter()
+                    success, message = database.restore_tables(result, [table])
+                    table_times.append(time.perf_counter() - start)
+                    if not success:
+                        print(f"{mode:<10} {workers:>7} table restore failed: {message}")
+                        return
+                if os.path.isdir(result):
+                    manifest = database.read_manifest(result)
+                    dumped = sum(table["bytes"] for table in manifest["tables"])
+                    size = sum(table["size"] for table in manifest["tables"])
+                    shutil.rmtree(result)
+                else:
+                    size = os.path.getsize(result)
+                    with database.open_backup_reader(result) as f:
+                        dumped = sum(len(chunk) for chunk in iter(lambda: f.read(1024 * 1024), b""))
+                    database.remove_backup_file(result)
+                # Timestamped names have a one second resolution
+                time.sleep(1)
+
+            wall = statistics.median(times)
+            baseline = baseline or wall
+            line = (f"{mode:<10} {workers:>7} {wall:>8.2f} {dumped / (1024 * 1024) / wall:>8.1f} "
+                    f"{size / (1024 * 1024):>11.1f} {baseline / wall:>8.2f}x")
+            if restore_times:
+                restore_wall = statistics.median(restore_times)
+                restore_baseline = restore_baseline or restore_wall
+                line += f" {restore_wall:>10.2f} {restore_baseline / restore_wall:>8.2f}x {statistics.median(table_times):>10.2f}"
+            print(line)
+
+if __name__ == "__main__":
+    main()
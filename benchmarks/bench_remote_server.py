@@ -0,0 +1,153 @@
+"""
+Benchmark the remote control server engines.
+
+Starts the server in a child process with each engine, connects 1, 50 and 500
+authenticated clients, then measures the server's memory/thread footprint and
+the round-trip latency of commands sent by every client at the same time.
+
+Usage (from the repository root):
+    python benchmarks/bench_remote_server.py [--clients 1 50 500] [--rounds 20]
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import selectors
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from remote_protocol import (
+    RemoteMessage, create_remote_server, encode_frame, decode_frame_payload,
+    ENGINE_THREADED, ENGINE_ASYNCIO, STATUS_OK
+)
+
+AUTH_KEY = "bench-bench-bench-bench-bench"
+
+def serve(engine, port, work_ms):
+    """Child process: run a server with a trivial command handler until stdin closes"""
+    def handler(message):
+        if work_ms:
+            time.sleep(work_ms / 1000.0)
+        return RemoteMessage(command=message.command, status=STATUS_OK, data=message.data)
+    
+    server = create_remote_server(port=port, command_handler=handler, engine=engine)
+    server.auth_key = AUTH_KEY
+    server.auth_salt, server.auth_hash = server.hash_auth_key(AUTH_KEY)
+    # Every benchmark client connects from 127.0.0.1
+    server.admission.max_connections = server.admission.max_per_ip = 10000
+    if not server.start():
+        print("FAILED", flush=True)
+        return
+    print("READY", flush=True)
+    sys.stdin.read()
+    server.stop()
+
+def recv_exact(sock, num_bytes):
+    data = bytearray()
+    while len(data) < num_bytes:
+        chunk = sock.recv(num_bytes - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return bytes(data)
+
+def recv_message(sock):
+    length = int.from_bytes(recv_exact(sock, 4), byteorder='big')
+    return decode_frame_payload(recv_exact(sock, length))
+
+def open_client(port):
+    sock = socket.create_connection(('127.0.0.1', port), timeout=30)
+    recv_message(sock)  # AUTH_REQUIRED
+    sock.sendall(encode_frame(RemoteMessage(command="AUTH", data={"auth_key": AUTH_KEY})))
+    result = recv_message(sock)
+    if result.status != STATUS_OK:
+        raise RuntimeError(f"auth failed: {result.message}")
+    return sock
+
+def run_round(clients):
+    """Send one command from every client at once; return per-command latencies (ms)"""
+    selector = selectors.DefaultSelector()
+    frame = encode_frame(RemoteMessage(command="BENCH", data={"n": 1}))
+    sent_at = {}
+    for sock in clients:
+        sock.setblocking(True)
+        sent_at[sock] = time.perf_counter()
+        sock.sendall(frame)
+        selector.register(sock, selectors.EVENT_READ)
+    
+    latencies = []
+    while len(latencies) < len(clients):
+        for key, _ in selector.select(timeout=30):
+            sock = key.fileobj
+            recv_message(sock)
+            latencies.append((time.perf_counter() - sent_at[sock]) * 1000)
+            selector.unregister(sock)
+    selector.close()
+    return latencies
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def measure(engine, num_clients, rounds, port, work_ms):
+    import psutil
+    child = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--serve', engine, '--port', str(port),
+         '--work-ms', str(work_ms)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        if child.stdout.readline().strip() != "READY":
+            raise RuntimeError(f"{engine} server failed to start")
+        
+        proc = psutil.Process(child.pid)
+        rss_idle = proc.memory_info().rss
+        clients = [open_client(port) for _ in range(num_clients)]
+        time.sleep(0.5)
+        
+        latencies = []
+        for _ in range(rounds):
+            latencies.extend(run_round(clients))
+        rss = proc.memory_info().rss
+        threads = proc.num_threads()
+        
+        for sock in clients:
+            sock.close()
+        return {
+            "rss_mb": rss / (1024 ** 2),
+            "rss_delta_mb": (rss - rss_idle) / (1024 ** 2),
+            "threads": threads,
+            "p50_ms": percentile(latencies, 50),
+            "p99_ms": percentile(latencies, 99),
+        }
+    finally:
+        child.stdin.close()
+        child.wait(timeout=10)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--serve', choices=[ENGINE_THREADED, ENGINE_ASYNCIO])
+    parser.add_argument('--port', type=int, default=40190)
+    parser.add_argument('--work-ms', type=float, default=1.0, help="simulated handler work per command")
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 50, 500])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve(args.serve, args.port, args.work_ms)
+        return
+    
+    print(f"{'engine':<10} {'clients':>7} {'RSS MB':>8} {'+MB':>7} {'threads':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    port = args.port
+    for num_clients in args.clients:
+        for engine in (ENGINE_THREADED, ENGINE_ASYNCIO):
+            result = measure(engine, num_clients, args.rounds, port, args.work_ms)
+            port += 1  # Avoid TIME_WAIT collisions between runs
+            print(f"{engine:<10} {num_clients:>7} {result['rss_mb']:>8.1f} {result['rss_delta_mb']:>7.1f} "
+                  f"{result['threads']:>7} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark controller startup time and memory: headless vs GUI.
+
+Each mode is started in a fresh interpreter, the way app.py starts it
+(configuration applied, then the controller built and started), and the
+child reports how long imports and construction took and its resident
+memory once it is up. The GUI build needs a display; without one it is
+measured up to the imports only. A bare interpreter is the baseline.
+
+Usage (from the repository root):
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Child programs print {"import": s, "init": s, "rss": bytes, "modules": n}, with "skipped" instead of "init" when no window could be created
+CHILD_PREFIX = """
+import sys, time, json
+start = time.perf_counter()
+sys.path.insert(0, %r)
+import psutil
+from config_manager import load_config, apply_config_to_module
+apply_config_to_module(load_config())
+"""
+
+CHILDREN = {
+    "python": """
+import sys, json, psutil
+print(json.dumps({"import": 0, "init": 0, "rss": psutil.Process().memory_info().rss, "modules": len(sys.modules)}))
+""",
+    "headless": CHILD_PREFIX + """
+from controller import Controller
+imported = time.perf_counter()
+controller = Controller()
+controller.start()
+ready = time.perf_counter()
+result = {"import": imported - start, "init": ready - imported, "rss": psutil.Process().memory_info().rss,
+          "modules": len(sys.modules), "tkinter": "tkinter" in sys.modules}
+controller.shutdown()
+print(json.dumps(result))
+""",
+    "gui": CHILD_PREFIX + """
+import tkinter as tk
+from app.main import BackupApp
+imported = time.perf_counter()
+try:
+    root = tk.Tk()
+except tk.TclError as e:
+    # No display - the imports alone are still worth comparing
+    print(json.dumps({"skipped": str(e), "import": imported - start, "rss": psutil.Process().memory_info().rss,
+                      "modules": len(sys.modules)}))
+    sys.exit(0)
+app = BackupApp(root)
+root.update()
+ready = time.perf_counter()
+result = {"import": imported - start, "init": ready - imported, "rss": psutil.Process().memory_info().rss,
+          "modules": len(sys.modules)}
+app.shutdown()
+root.destroy()
+print(json.dumps(result))
+""",
+}
+
+def run_child(code):
+    """Run one child interpreter and return its report plus the total wall time"""
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, timeout=120, cwd=SRC_DIR
+    )
+    wall = time.perf_counter() - start
+    if output.returncode != 0:
+        raise RuntimeError(output.stderr.strip().splitlines()[-1] if output.stderr else "child failed")
+    report = json.loads(output.stdout.strip().splitlines()[-1])
+    report["wall"] = wall
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per mode (median is shown)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'wall s':>8} {'import s':>9} {'init s':>8} {'RSS MB':>8} {'modules':>8}")
+    for mode, code in CHILDREN.items():
+        if mode != "python":
+            code = code % os.path.abspath(SRC_DIR)
+        try:
+            reports = [run_child(code) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{mode:<10} failed: {e}")
+            continue
+        if reports[0].get("tkinter"):
+            print(f"warning: {mode} imported tkinter")
+
+        median = lambda key: statistics.median(report[key] for report in reports)
+        init = "n/a" if "skipped" in reports[0] else f"{median('init'):.3f}"
+        print(
+            f"{mode:<10} {median('wall'):>8.3f} {median('import'):>9.3f} {init:>8} "
+            f"{median('rss') / (1024 * 1024):>8.1f} {median('modules'):>8.0f}"
+        )
+        if "skipped" in reports[0]:
+            print(f"{'':<10} window not created: {reports[0]['skipped']}")
+
+if __name__ == "__main__":
+    main()
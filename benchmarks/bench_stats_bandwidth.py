@@ -0,0 +1,98 @@
+"""
+Benchmark RESOURCE_STATS bandwidth per client.
+
+Replays an hour of one-second resource samples (a synthetic but realistic
+trace: a noisy CPU, slowly drifting RAM, an almost static disk, growing
+network counters) through RemoteServer.broadcast_resource_stats and counts
+the bytes queued for a client that receives full stats every second (older
+clients) and for one that negotiated the keyframe + delta stream, with each
+available codec. The delta stream is also decoded with StatsReconstructor
+and checked against the quantized samples.
+
+Usage (from the repository root):
+    python benchmarks/bench_stats_bandwidth.py [--seconds 3600]
+"""
+import os
+import sys
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from remote_protocol import (
+    RemoteServer, ClientConnection, StatsReconstructor, decode_frame_payload, parse_frame_header,
+    available_codecs, get_codec, quantize_stats, STATS_PRECISION, TOPIC_RESOURCES
+)
+
+def stats_trace(seconds, seed=1):
+    """Yield one stats dict per second shaped like ResourceMonitor.get_current_stats()"""
+    rng = random.Random(seed)
+    cpu, ram_used, disk_used = 25.0, 9.8, 229.4
+    sent, recv = 10234.56, 20456.78
+    for second in range(seconds):
+        cpu = min(100.0, max(0.0, cpu + rng.gauss(0, 4)))
+        ram_used = min(15.5, max(4.0, ram_used + rng.gauss(0, 0.01)))
+        if second % 600 == 0:
+            disk_used += 0.05
+        rate = max(0.0, rng.gauss(1.4, 0.5))
+        sent += rate / 8 * 0.4
+        recv += rate / 8 * 0.6
+        yield {
+            "timestamp": f"2026-01-15 12:{second // 60 % 60:02d}:{second % 60:02d}",
+            "cpu_percent": round(cpu, 1),
+            "ram_percent": round(ram_used / 16.0 * 100, 1),
+            "ram_used_gb": round(ram_used, 2),
+            "ram_total_gb": 16.0,
+            "disk_percent": round(disk_used / 476.9 * 100, 1),
+            "disk_used_gb": round(disk_used, 2),
+            "disk_total_gb": 476.9,
+            "network_sent_mb": round(sent, 2),
+            "network_recv_mb": round(recv, 2),
+            "network_rate_mbps": round(rate, 2),
+        }
+
+def make_client(server, codec, stats_delta):
+    conn = ClientConnection(None, (f"{codec.name}-{'delta' if stats_delta else 'full'}", 0))
+    conn.authenticated = True
+    conn.codec = codec
+    conn.topics = frozenset([TOPIC_RESOURCES])
+    conn.stats_delta = stats_delta
+    server.client_sockets[conn.address] = conn
+    return conn
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=int, default=3600, help="samples to replay (one per second)")
+    args = parser.parse_args()
+
+    server = RemoteServer(port=0)
+    clients = {}
+    for name in available_codecs():
+        codec = get_codec(name)
+        clients[(name, "full")] = make_client(server, codec, False)
+        clients[(name, "delta")] = make_client(server, codec, True)
+    received = {key: 0 for key in clients}
+    reconstructors = {key: StatsReconstructor() for key in clients if key[1] == "delta"}
+
+    for stats in stats_trace(args.seconds):
+        server.broadcast_resource_stats(stats)
+        # Pretend a second went by so keyframes come every STATS_KEYFRAME_INTERVAL samples
+        server.stats_keyframe_at -= 1
+        for key, conn in clients.items():
+            for frame in conn.queue.get_all_nowait():
+                received[key] += len(frame)
+                if key in reconstructors:
+                    _, compressed = parse_frame_header(frame[:4])
+                    message = decode_frame_payload(frame[4:], conn.codec, compressed=compressed)
+                    rebuilt = reconstructors[key].apply(message.data)
+                    if message.data.get("delta"):
+                        assert {k: rebuilt[k] for k in STATS_PRECISION} == quantize_stats(stats)
+
+    server.auth_pool.shutdown(wait=False)
+    scale = 3600 / args.seconds
+    print(f"{'codec':<8} {'stream':<6} {'KB/client/hour':>15} {'bytes/sample':>13}")
+    for (codec, stream), total in received.items():
+        print(f"{codec:<8} {stream:<6} {total * scale / 1024:>15.1f} {total / args.seconds:>13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -67,7 +67,7 @@ echo [Step 2/6] Installing Python dependencies...
 echo This may take a few minutes...
 echo.
 
-set PACKAGES=pyinstaller requests beautifulsoup4 psutil pywin32 winshell Pillow
+set PACKAGES=pyinstaller requests beautifulsoup4 psutil pywin32 winshell Pillow msgpack zstandard
 
 for %%p in (%PACKAGES%) do (
     echo Installing %%p...
@@ -62,7 +62,7 @@ echo "[Step 2/6] Installing Python dependencies..."
 echo "This may take a few minutes..."
 echo ""
 
-PACKAGES="pyinstaller requests beautifulsoup4 psutil Pillow"
+PACKAGES="pyinstaller requests beautifulsoup4 psutil Pillow msgpack zstandard"
 
 for package in $PACKAGES; do
     echo "Installing $package..."
@@ -7,6 +7,13 @@ import sys
 import logging
 import traceback
 
+# --profile-startup: time every startup phase and import (report written once the window is drawn)
+if '--profile-startup' in sys.argv[1:]:
+    from startup_profile import StartupProfile
+    startup_profile = StartupProfile()
+else:
+    startup_profile = None
+
 # Import config manager functions
 from config_manager import get_logs_dir
 
@@ -41,8 +48,18 @@ except Exception as e:
     logging.error(f"Failed to load configuration: {e}")
     logging.error(traceback.format_exc())
 
+if startup_profile:
+    startup_profile.mark("Logging and configuration")
+
 def main():
-    """Main function to run the GUI application"""
+    """Main function to run the GUI application (or the windowless controller with --headless)"""
+    if '--headless' in sys.argv[1:]:
+        # Scheduler, resource monitor and remote server only - nothing imports tkinter
+        if startup_profile:
+            startup_profile.stop()  # The report covers the window's startup
+        from controller import run_headless
+        sys.exit(run_headless())
+    
     try:
         # Import tkinter
         import tkinter as tk
@@ -54,15 +71,30 @@ def main():
         from app.main import BackupApp
         
         logging.info("BackupApp imported successfully")
+        if startup_profile:
+            startup_profile.mark("Import tkinter and the app")
         
         # Create root window
         root = tk.Tk()
         logging.info("Root window created")
+        if startup_profile:
+            startup_profile.mark("Create root window")
         
         # Create app
         app = BackupApp(root)
         logging.info("BackupApp initialized")
         
+        if startup_profile:
+            startup_profile.mark("Build BackupApp (first tab only)")
+            
+            def report_startup():
+                # Runs once the main loop is idle, i.e. after the window has been drawn
+                root.update_idletasks()
+                startup_profile.mark("First paint")
+                startup_profile.report()
+            
+            root.after_idle(report_startup)
+        
         # Start main loop
         root.mainloop()
         
@@ -27,6 +27,15 @@ a = Analysis(
         'threading',
         'collections',
         'collections.defaultdict',
+        # Tabs are imported by name when first selected (app/main.py TABS)
+        'app.server_control',
+        'app.server_backup',
+        'app.database_backup',
+        'app.txadmin_update',
+        'app.activity_log',
+        'app.remote_control',
+        'app.discord_config',
+        'app.configuration',
     ],
     hookspath=[],
     hooksconfig={},
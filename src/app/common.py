@@ -135,3 +135,12 @@ def log_message(text_widget, message):
     text_widget.insert(tk.END, f"[{timestamp}] {message}\n")
     text_widget.see(tk.END)
     text_widget.config(state=tk.DISABLED)
+
+def log_messages(text_widget, entries):
+    """Add several (timestamp, message) entries to the log display in one update"""
+    if not entries:
+        return
+    text_widget.config(state=tk.NORMAL)
+    text_widget.insert(tk.END, "".join(f"[{timestamp}] {message}\n" for timestamp, message in entries))
+    text_widget.see(tk.END)
+    text_widget.config(state=tk.DISABLED)
@@ -132,6 +132,12 @@ class ConfigurationTab:
         frame.pack(fill=tk.X, padx=10, pady=10)
         
         self.create_path_entry(frame, "BACKUP_DIR", "Database Backup Directory:", r"C:\backups\database")
+        
+        self.create_choice(frame, "DB_BACKUP_COMPRESSION", "Backup Compression:", ["gzip", "zstd", "none"], "gzip")
+        self.create_choice(frame, "DB_DUMP_MODE", "Dump Mode:", ["single", "parallel"], "single")
+        self.create_entry(frame, "DB_DUMP_WORKERS", "Parallel Dump Workers:", "4")
+        self.create_choice(frame, "DB_DUMP_CONSISTENCY", "Parallel Dump Consistency:", ["lock", "transaction"], "lock")
+        self.create_entry(frame, "DB_RESTORE_WORKERS", "Parallel Restore Workers:", "4")
     
     def create_server_section(self):
         """Create server backup configuration section"""
@@ -205,6 +211,30 @@ class ConfigurationTab:
             entry.config(show=show)
         entry.grid(row=row, column=1, columnspan=2, sticky=tk.W, padx=10, pady=5)
     
+    def create_choice(self, parent, key, label, values, default):
+        """Create a labeled drop-down list"""
+        row = parent.grid_size()[1]
+        
+        ttk.Label(
+            parent,
+            text=label,
+            background=COLORS['panel']
+        ).grid(row=row, column=0, sticky=tk.W, padx=10, pady=5)
+        
+        # Get value from loaded config or use default
+        value = self.config_vars.get(key, default)
+        
+        var = tk.StringVar(value=value)
+        self.config_vars[f"{key}_VAR"] = var
+        
+        ttk.Combobox(
+            parent,
+            textvariable=var,
+            values=values,
+            state="readonly",
+            width=12
+        ).grid(row=row, column=1, sticky=tk.W, padx=10, pady=5)
+    
     def create_path_entry(self, parent, key, label, default, file=False):
         """Create a labeled entry field with browse button"""
         row = parent.grid_size()[1]
@@ -251,7 +281,8 @@ class ConfigurationTab:
             
             # String values
             string_keys = ['DB_HOST', 'DB_USER', 'DB_PASSWORD', 'DB_NAME',
-                          'BACKUP_DIR', 'MYSQLDUMP_PATH', 'MYSQL_PATH',
+                          'BACKUP_DIR', 'MYSQLDUMP_PATH', 'MYSQL_PATH', 'DB_BACKUP_COMPRESSION',
+                          'DB_DUMP_MODE', 'DB_DUMP_CONSISTENCY',
                           'SERVER_FOLDER', 'SERVER_BACKUP_DIR',
                           'TXADMIN_SERVER_DIR', 'TXADMIN_BACKUP_DIR',
                           'TXADMIN_DOWNLOAD_DIR', 'SEVEN_ZIP_PATH']
@@ -262,14 +293,14 @@ class ConfigurationTab:
                     config_dict[key] = var.get()
             
             # Integer values
-            int_keys = ['SERVER_BACKUP_KEEP_COUNT', 'TXADMIN_KEEP_COUNT']
-            for key in int_keys:
+            int_keys = {'SERVER_BACKUP_KEEP_COUNT': 10, 'TXADMIN_KEEP_COUNT': 10, 'DB_DUMP_WORKERS': 4, 'DB_RESTORE_WORKERS': 4}
+            for key, default in int_keys.items():
                 var = self.config_vars.get(f"{key}_VAR")
                 if var:
                     try:
                         config_dict[key] = int(var.get())
                     except ValueError:
-                        config_dict[key] = 10  # default
+                        config_dict[key] = default
             
             # Array values
             var = self.config_vars.get("DB_BACKUP_HOURS_ENTRY")
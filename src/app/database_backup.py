@@ -1,13 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from config import COLORS, DB_BACKUP_HOURS, BACKUP_MINUTE
 from app.common import ModernScrolledText
-from database import create_backup, restore_backup, delete_old_backups, get_backup_files
-from utils import calculate_next_backup_time
+from database import create_backup, restore_backup, delete_old_backups, get_backup_files, get_backup_tables, preview_backup_table
 from discord_webhook import send_discord_webhook
+from jobs import JOB_DATABASE_BACKUP, JOB_DATABASE_RESTORE
 
 class DatabaseBackupTab:
     def __init__(self, notebook, app):
@@ -50,6 +49,35 @@ class DatabaseBackupTab:
         )
         backup_button.pack(fill=tk.X, padx=10, pady=10)
         
+        # Progress of the current (or last) backup or restore - one line per table for per-table backups
+        progress_frame = ttk.LabelFrame(self.tab, text="Backup / Restore Progress")
+        progress_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        self.progress_var = tk.DoubleVar()
+        ttk.Progressbar(
+            progress_frame,
+            variable=self.progress_var,
+            length=100,
+            mode='determinate'
+        ).pack(fill=tk.X, padx=10, pady=(10, 5))
+        
+        self.progress_label = ttk.Label(
+            progress_frame,
+            text="No backup running",
+            background=COLORS['panel'],
+            wraplength=800
+        )
+        self.progress_label.pack(anchor=tk.W, padx=10, pady=(0, 5))
+        
+        self.table_progress = ModernScrolledText(
+            progress_frame,
+            wrap=tk.NONE,
+            height=5
+        )
+        self.table_progress.pack(fill=tk.X, padx=10, pady=(0, 10))
+        self.table_progress.config(state=tk.DISABLED)
+        self.table_progress_text = ""
+        
         # Restore section
         restore_frame = ttk.LabelFrame(self.tab, text="Restore Database")
         restore_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
@@ -81,6 +109,13 @@ class DatabaseBackupTab:
         )
         restore_button.pack(side=tk.LEFT)
         
+        # Restore only some tables of the backup
+        ttk.Button(
+            input_frame,
+            text="Restore Tables...",
+            command=self.open_table_restore
+        ).pack(side=tk.LEFT, padx=(10, 0))
+        
         # Available backups list
         ttk.Label(
             restore_frame, 
@@ -106,9 +141,9 @@ class DatabaseBackupTab:
         if hasattr(self.app, 'broadcast_progress'):
             self.app.broadcast_progress("Starting manual database backup...", 0)
         
-        # Run backup in a separate thread to avoid freezing UI
-        def do_backup():
-            success, message = create_backup()
+        # Run backup as a job (waits for other disk-heavy jobs to finish)
+        def do_backup(job):
+            success, message = create_backup(cancel_event=job.cancel_event, progress=job.update)
             if success:
                 if hasattr(self.app, 'broadcast_progress'):
                     self.app.broadcast_progress("Database backup completed, cleaning old backups...", 90)
@@ -142,8 +177,10 @@ class DatabaseBackupTab:
                     self.app.broadcast_progress(f"Database backup failed: {message}", 0)
             
             self.app.root.after(0, lambda: self.app.status_label.config(text="Status: Running"))
+            return success, message
         
-        threading.Thread(target=do_backup, daemon=True).start()
+        if not self.app.start_job(JOB_DATABASE_BACKUP, do_backup):
+            self.app.status_label.config(text="Status: Running")
     
     def restore_database(self):
         """Restore the database from a selected backup"""
@@ -169,9 +206,13 @@ class DatabaseBackupTab:
             if hasattr(self.app, 'broadcast_progress'):
                 self.app.broadcast_progress(f"Starting database restore from backup {index+1}...", 10)
             
-            # Run restore in a separate thread
-            def do_restore():
-                success, message = restore_backup(backup_path)
+            # Run restore as a job (ahead of queued backups and updates)
+            def do_restore(job):
+                success, message = restore_backup(
+                    backup_path,
+                    cancel_event=job.cancel_event,
+                    progress=self.app.progress_reporter(job, "Database restore")
+                )
                 if success:
                     self.app.log_message("Database restore completed successfully!")
                     if hasattr(self.app, 'broadcast_progress'):
@@ -182,12 +223,45 @@ class DatabaseBackupTab:
                         self.app.broadcast_progress(f"Database restore failed: {message}", 0)
                 
                 self.app.root.after(0, lambda: self.app.status_label.config(text="Status: Running"))
+                return success, message
             
-            threading.Thread(target=do_restore, daemon=True).start()
+            if not self.app.start_job(JOB_DATABASE_RESTORE, do_restore):
+                self.app.status_label.config(text="Status: Running")
             
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid number")
     
+    def open_table_restore(self):
+        """Pick tables of the selected backup to restore on their own"""
+        try:
+            index = int(self.restore_var.get()) - 1
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid number")
+            return
+        if index < 0 or index >= len(self.backup_files):
+            messagebox.showerror("Error", f"Invalid backup index. Please enter a value between 1 and {len(self.backup_files)}")
+            return
+        
+        backup_path = self.backup_files[index][0]
+        filename = self.backup_files[index][2]
+        success, tables = get_backup_tables(backup_path)
+        if not success:
+            messagebox.showerror("Error", tables)
+            return
+        TableRestoreDialog(self.app.root, self, backup_path, filename, tables)
+    
+    def start_table_restore(self, backup_path, tables):
+        """Restore the given tables of a backup as a job"""
+        self.app.status_label.config(text="Status: Table restore in progress...")
+        
+        def do_restore(job):
+            success, message = self.app.run_table_restore_job(job, backup_path, tables)
+            self.app.root.after(0, lambda: self.app.status_label.config(text="Status: Running"))
+            return success, message
+        
+        if not self.app.start_job(JOB_DATABASE_RESTORE, do_restore, description=f"Restore of {len(tables)} table(s)"):
+            self.app.status_label.config(text="Status: Running")
+    
     def update_backup_list(self):
         """Update the list of available backups"""
         self.backup_files = get_backup_files()
@@ -207,21 +281,72 @@ class DatabaseBackupTab:
         # Update the app's reference to the backup files
         self.app.backup_files = self.backup_files
     
+    def update_backup_progress(self):
+        """Show the progress of the latest database backup or restore job, refreshed every second"""
+        if not self.app.running:
+            return
+        
+        jobs = [job for job in (self.app.jobs.latest(JOB_DATABASE_BACKUP), self.app.jobs.latest(JOB_DATABASE_RESTORE)) if job]
+        job = max(jobs, key=lambda job: job.created_at, default=None)
+        if job is None:
+            self.app.root.after(1000, self.update_backup_progress)
+            return
+        
+        status = job.as_dict()
+        self.progress_var.set(status["percent"] or 0)
+        summary = f"{job.description} (job {job.id}): {job.state}"
+        if status["files_total"]:
+            summary += f" - {status['files_done']} of {status['files_total']} tables"
+        if status["bytes_done"]:
+            summary += f", {status['bytes_done'] / (1024 * 1024):.1f} MB"
+            if status["bytes_total"]:
+                summary += f" of {status['bytes_total'] / (1024 * 1024):.1f} MB"
+        if status["eta"] is not None:
+            summary += f" (about {status['eta']}s left)"
+        if status["message"] and not job.active:
+            summary += f"\n{status['message']}"
+        self.progress_label.config(text=summary)
+        
+        # Running tables first, then queued, then finished (largest first within each)
+        order = {"running": 0, "failed": 1, "queued": 2, "done": 3, "cancelled": 4}
+        lines = []
+        for part in sorted(status["parts"] or [], key=lambda part: order.get(part["state"], 5)):
+            size = f"{part['bytes_done'] / (1024 * 1024):.1f} MB"
+            if part["bytes_total"]:
+                size += f" of ~{part['bytes_total'] / (1024 * 1024):.1f} MB"
+            lines.append(f"{part['name']}: {part['state']} - {size}")
+        text = "\n".join(lines)
+        
+        # Only redraw when something changed
+        if text != self.table_progress_text:
+            self.table_progress_text = text
+            self.table_progress.config(state=tk.NORMAL)
+            self.table_progress.delete(1.0, tk.END)
+            self.table_progress.insert(tk.END, text)
+            self.table_progress.config(state=tk.DISABLED)
+        
+        self.app.root.after(1000, self.update_backup_progress)
+    
     def update_next_backup_timer(self):
         """Update the next scheduled backup time and countdown display"""
         if not self.app.running:
             return
             
-        # Calculate the next backup time
-        next_backup_time, backup_type = calculate_next_backup_time()
+        # Next backup from the scheduler's precomputed table
+        next_backup_time, backup_type = self.app.scheduler.next_run()
+        if next_backup_time is None:
+            self.next_backup_label.config(text="No backups scheduled")
+            self.countdown_label.config(text="")
+            self.app.root.after(1000, self.update_next_backup_timer)
+            return
         
         # Format the date for display
         formatted_time = next_backup_time.strftime('%Y-%m-%d %H:%M:%S')
         self.next_backup_label.config(text=f"Next {backup_type} Backup: {formatted_time}")
         
-        # Calculate time remaining
+        # Calculate time remaining (a missed backup being caught up is already due)
         now = datetime.now()
-        time_diff = next_backup_time - now
+        time_diff = max(next_backup_time - now, timedelta(0))
         hours, remainder = divmod(time_diff.seconds, 3600)
         minutes, seconds = divmod(remainder, 60)
         days = time_diff.days
@@ -236,3 +361,97 @@ class DatabaseBackupTab:
         
         # Update every second for real-time countdown
         self.app.root.after(1000, self.update_next_backup_timer)
+
+class TableRestoreDialog(tk.Toplevel):
+    """Dialog to pick tables of a database backup to restore, with a preview of each"""
+    
+    def __init__(self, parent, tab, backup_path, filename, tables):
+        super().__init__(parent)
+        
+        self.tab = tab
+        self.backup_path = backup_path
+        self.filename = filename
+        self.tables = tables
+        
+        self.title(f"Restore Tables - {filename}")
+        self.geometry("900x500")
+        self.configure(bg=COLORS['bg'])
+        self.transient(parent)
+        
+        ttk.Label(
+            self,
+            text="Select the tables to restore (Ctrl or Shift for several). The rest of the database is left as it is."
+        ).pack(anchor=tk.W, padx=10, pady=(10, 5))
+        
+        body = ttk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True, padx=10)
+        
+        # Table list
+        list_frame = ttk.Frame(body)
+        list_frame.pack(side=tk.LEFT, fill=tk.Y)
+        self.table_list = tk.Listbox(
+            list_frame,
+            selectmode=tk.EXTENDED,
+            exportselection=False,
+            width=40,
+            background=COLORS['panel'],
+            foreground=COLORS['text'],
+            selectbackground=COLORS['accent'],
+            borderwidth=0,
+            font=('Consolas', 9)
+        )
+        scrollbar = ttk.Scrollbar(list_frame, command=self.table_list.yview)
+        self.table_list.config(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.table_list.pack(side=tk.LEFT, fill=tk.Y)
+        for table in tables:
+            self.table_list.insert(tk.END, f"{table['name']} ({table['bytes'] / (1024 * 1024):.1f} MB)")
+        self.table_list.bind("<<ListboxSelect>>", self.show_preview)
+        
+        # Preview of the last selected table
+        self.preview = ModernScrolledText(body, wrap=tk.NONE)
+        self.preview.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
+        self.preview.insert(tk.END, "Select a table to preview its structure and first rows.")
+        self.preview.config(state=tk.DISABLED)
+        
+        # Buttons
+        button_frame = ttk.Frame(self)
+        button_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(
+            button_frame,
+            text="Restore Selected Tables",
+            style="Primary.TButton",
+            command=self.restore
+        ).pack(side=tk.RIGHT, padx=(5, 0))
+        ttk.Button(
+            button_frame,
+            text="Close",
+            command=self.destroy
+        ).pack(side=tk.RIGHT)
+    
+    def selected_tables(self):
+        return [self.tables[i]["name"] for i in self.table_list.curselection()]
+    
+    def show_preview(self, event=None):
+        """Show the start of the last selected table's SQL"""
+        selection = self.table_list.curselection()
+        if not selection:
+            return
+        success, text = preview_backup_table(self.backup_path, self.tables[selection[-1]]["name"])
+        self.preview.config(state=tk.NORMAL)
+        self.preview.delete(1.0, tk.END)
+        self.preview.insert(tk.END, text if success else f"Preview failed: {text}")
+        self.preview.config(state=tk.DISABLED)
+    
+    def restore(self):
+        """Confirm and start the restore of the selected tables"""
+        tables = self.selected_tables()
+        if not tables:
+            messagebox.showerror("Error", "Please select at least one table", parent=self)
+            return
+        if not messagebox.askyesno("Confirm Restore",
+            f"Restore {len(tables)} table(s) from backup:\n{self.filename}?\n\n{', '.join(tables)}\n\n"
+            "WARNING: This will overwrite these tables in your current database!", parent=self):
+            return
+        self.tab.start_table_restore(self.backup_path, tables)
+        self.destroy()
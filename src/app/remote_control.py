@@ -3,11 +3,24 @@ import socket
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
+import time
 
 from config import COLORS
 from app.common import ModernScrolledText, update_setting
-from remote_protocol import RemoteServer, RemoteMessage, STATUS_OK, STATUS_ERROR
+from remote_protocol import RemoteMessage, STATUS_OK, STATUS_ERROR, ALL_TOPICS
 from utils import add_firewall_rule
+from controller import FIREWALL_RULE_NAME
+
+def ensure_firewall_rule(app, port):
+    """Check for and add a firewall rule for the given port (also used when the server starts before this tab is built)"""
+    success, message = add_firewall_rule(FIREWALL_RULE_NAME, port)
+    app.log_message(message)
+    if not success:
+        # If it fails, inform the user they may need to add it manually
+        messagebox.showwarning("Firewall Rule", 
+                           "Could not automatically add a Windows Firewall rule. "
+                           "You may need to run this application as an Administrator or "
+                           f"manually allow TCP traffic on port {port}.")
 
 class RemoteControlTab:
     def __init__(self, notebook, app):
@@ -24,7 +37,7 @@ class RemoteControlTab:
         remote_control_frame.pack(fill=tk.X, padx=10, pady=10)
         
         # Enable/disable remote control
-        self.remote_enabled_var = tk.BooleanVar(value=self.app.settings["remote_control"]["enabled"])
+        self.remote_enabled_var = tk.BooleanVar(value=self.app.remote_enabled)
         ttk.Checkbutton(
             remote_control_frame,
             text="Enable Remote Control",
@@ -75,7 +88,11 @@ class RemoteControlTab:
         auth_frame = ttk.LabelFrame(self.tab, text="Authentication Key")
         auth_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        saved_auth_key = self.app.settings["remote_control"]["auth_key"] or "Not generated"
+        # The server may already be running (started at launch) with a newly generated key
+        if self.app.remote_server:
+            saved_auth_key = self.app.remote_server.auth_key
+        else:
+            saved_auth_key = self.app.settings["remote_control"]["auth_key"] or "Not generated"
         self.auth_key_var = tk.StringVar(value=saved_auth_key)
         
         ttk.Label(
@@ -215,33 +232,11 @@ class RemoteControlTab:
             # Enable remote control
             try:
                 port = int(self.port_var.get())
-                if not (1024 <= port <= 65535):
-                    raise ValueError("Port must be between 1024 and 65535")
-                
-                # Save port to settings
-                update_setting("remote_control", "port", port)
-                
-                # Use saved auth key if one exists
-                saved_auth_key = self.app.settings["remote_control"]["auth_key"]
-                
-                self.app.remote_server = RemoteServer(port=port, command_handler=self.app.handle_remote_command)
-                
-                # If we have a saved key, use it instead of generating a new one
-                if saved_auth_key:
-                    self.app.remote_server.auth_key = saved_auth_key
-                    self.app.remote_server.auth_salt, self.app.remote_server.auth_hash = self.app.remote_server.hash_auth_key(saved_auth_key)
-                    self.app.log_message(f"Using saved authentication key")
-                
-                if self.app.remote_server.start():
-                    self.app.remote_enabled = True
+                success, message = self.app.start_remote_server(port)
+                self.app.log_message(message)
+                if success:
                     self.auth_key_var.set(self.app.remote_server.auth_key)
                     
-                    # Save the auth key and enabled state
-                    update_setting("remote_control", "auth_key", self.app.remote_server.auth_key)
-                    update_setting("remote_control", "enabled", True)
-                    
-                    self.app.log_message(f"Remote control server started on port {port}")
-                    
                     # Automatically add firewall rule
                     self.ensure_firewall_rule(port)
                     
@@ -249,7 +244,6 @@ class RemoteControlTab:
                 else:
                     self.remote_enabled_var.set(False)
                     update_setting("remote_control", "enabled", False)
-                    self.app.log_message("Failed to start remote control server")
             except Exception as e:
                 self.remote_enabled_var.set(False)
                 update_setting("remote_control", "enabled", False)
@@ -257,9 +251,7 @@ class RemoteControlTab:
         else:
             # Disable remote control
             if self.app.remote_server:
-                self.app.remote_server.stop()
-                self.app.remote_server = None
-                self.app.remote_enabled = False
+                self.app.stop_remote_server()
                 
                 # Save disabled state
                 update_setting("remote_control", "enabled", False)
@@ -274,15 +266,7 @@ class RemoteControlTab:
     
     def ensure_firewall_rule(self, port):
         """Check for and add a firewall rule for the given port."""
-        rule_name = "FIVEM-REDM-Controller-Remote"
-        success, message = add_firewall_rule(rule_name, port)
-        self.app.log_message(message)
-        if not success:
-            # If it fails, inform the user they may need to add it manually
-            messagebox.showwarning("Firewall Rule", 
-                               "Could not automatically add a Windows Firewall rule. "
-                               "You may need to run this application as an Administrator or "
-                               f"manually allow TCP traffic on port {port}.")
+        ensure_firewall_rule(self.app, port)
 
     def update_clients_list(self):
         """Update the list of connected clients"""
@@ -295,9 +279,32 @@ class RemoteControlTab:
         if not self.app.remote_server.client_sockets:
             self.clients_list.insert(tk.END, "No clients connected")
         else:
-            for sock, (address, is_authenticated) in self.app.remote_server.client_sockets.items():
-                status = "Authenticated" if is_authenticated else "Not authenticated"
-                self.clients_list.insert(tk.END, f"{address[0]}:{address[1]} - {status}\n")
+            for conn in list(self.app.remote_server.client_sockets.values()):
+                status = "Authenticated" if conn.authenticated else "Not authenticated"
+                line = f"{conn.address[0]}:{conn.address[1]} - {status}"
+                if conn.rtt is not None:
+                    line += f" - RTT {conn.rtt * 1000:.0f} ms"
+                line += f" - last seen {int(time.time() - conn.last_seen)}s ago"
+                if conn.topics != ALL_TOPICS:
+                    line += f" - topics: {', '.join(sorted(conn.topics)) or 'none'}"
+                if conn.queue.dropped:
+                    line += f" ({conn.queue.dropped} updates dropped - slow link)"
+                self.clients_list.insert(tk.END, line + "\n")
+            
+            admission = self.app.remote_server.admission.stats()
+            if admission["rejected"] or admission["banned"]:
+                self.clients_list.insert(
+                    tk.END,
+                    f"\nRefused connections: {admission['rejected']} ({admission['banned']} IPs banned)\n"
+                )
+            
+            stats = self.app.remote_server.compression_stats.as_dict()
+            if stats["frames_compressed"]:
+                self.clients_list.insert(
+                    tk.END,
+                    f"\nCompressed frames: {stats['frames_compressed']} "
+                    f"(ratio {stats['ratio']}x, {stats['compress_ms_per_frame']} ms/frame)\n"
+                )
         
         self.clients_list.config(state=tk.DISABLED)
         
@@ -1,12 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
 from datetime import datetime
 
 from config import COLORS, SERVER_FOLDER, SERVER_BACKUP_HOURS, SERVER_BACKUP_KEEP_COUNT
 from app.common import ModernScrolledText
 from server import backup_server_folder, restore_server_backup, delete_old_server_backups, get_server_backup_files
 from discord_webhook import send_discord_webhook
+from jobs import JOB_SERVER_BACKUP, JOB_SERVER_RESTORE
 
 class ServerBackupTab:
     def __init__(self, notebook, app):
@@ -105,15 +105,15 @@ class ServerBackupTab:
         if hasattr(self.app, 'broadcast_progress'):
             self.app.broadcast_progress("Starting manual server backup...", 0)
         
-        # Run backup in a separate thread
-        def do_backup():
+        # Run backup as a job (waits for other disk-heavy jobs to finish)
+        def do_backup(job):
             def progress_callback(msg):
                 self.app.log_message(msg)
                 # Broadcast progress updates
                 if hasattr(self.app, 'broadcast_progress'):
                     self.app.broadcast_progress(msg, None)
             
-            success, result = backup_server_folder(progress_callback)
+            success, result = backup_server_folder(progress_callback, cancel_event=job.cancel_event, progress=job.update)
             if success:
                 if hasattr(self.app, 'broadcast_progress'):
                     self.app.broadcast_progress("Server backup completed, cleaning old backups...", 90)
@@ -143,8 +143,10 @@ class ServerBackupTab:
                     self.app.broadcast_progress(f"Server backup failed: {result}", 0)
             
             self.app.root.after(0, lambda: self.app.status_label.config(text="Status: Running"))
+            return success, result
         
-        threading.Thread(target=do_backup, daemon=True).start()
+        if not self.app.start_job(JOB_SERVER_BACKUP, do_backup):
+            self.app.status_label.config(text="Status: Running")
     
     def restore_server(self):
         """Restore the server from a selected backup"""
@@ -171,8 +173,8 @@ class ServerBackupTab:
             if hasattr(self.app, 'broadcast_progress'):
                 self.app.broadcast_progress(f"Starting server restore from backup {index+1}...", 10)
             
-            # Run restore in a separate thread
-            def do_restore():
+            # Run restore as a job (ahead of queued backups and updates)
+            def do_restore(job):
                 def progress_callback(msg):
                     self.app.log_message(msg)
                     # Broadcast progress updates
@@ -190,8 +192,10 @@ class ServerBackupTab:
                         self.app.broadcast_progress(f"Server restore failed: {message}", 0)
                 
                 self.app.root.after(0, lambda: self.app.status_label.config(text="Status: Running"))
+                return success, message
             
-            threading.Thread(target=do_restore, daemon=True).start()
+            if not self.app.start_job(JOB_SERVER_RESTORE, do_restore):
+                self.app.status_label.config(text="Status: Running")
             
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid number")
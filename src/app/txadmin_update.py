@@ -1,7 +1,6 @@
 import os
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
 from datetime import datetime
 
 from config import COLORS, TXADMIN_SERVER_DIR, TXADMIN_DOWNLOAD_DIR, SEVEN_ZIP_PATH
@@ -11,6 +10,7 @@ from txadmin import (
     restore_txadmin_backup, delete_old_txadmin_backups, get_txadmin_backups
 )
 from discord_webhook import send_discord_webhook
+from jobs import JOB_TXADMIN_UPDATE, JOB_TXADMIN_RESTORE
 
 class TxAdminUpdateTab:
     def __init__(self, notebook, app):
@@ -154,36 +154,41 @@ class TxAdminUpdateTab:
         self.update_txadmin_status("Starting TxAdmin update...", 0)
         self.progress_var.set(0)
         
-        # Run in a separate thread to keep UI responsive
-        def do_update():
+        # Run as a job so the update waits for backups and restores using the disk
+        def do_update(job):
             try:
                 # Step 1: Get the latest URL
                 self.update_txadmin_status("Getting latest recommended version...", 5)
                 url = get_latest_txadmin_url(self.update_txadmin_status)
                 if not url:
                     self.update_txadmin_status("Failed to get download URL.", 0)
-                    return
+                    return False, "Failed to get download URL"
                 
                 # Step 2: Backup the current server
                 self.update_txadmin_status("Backing up current server...", 10)
                 backup_success, backup_result = backup_txadmin(self.update_txadmin_status)
                 if not backup_success:
                     self.update_txadmin_status(f"Backup failed: {backup_result}", 0)
-                    return
+                    return False, f"Backup failed: {backup_result}"
+                if job.cancel_event.is_set():
+                    self.update_txadmin_status("TxAdmin update cancelled", 0)
+                    return False, "TxAdmin update cancelled"
                 
                 # Step 3: Download the update
                 self.update_txadmin_status("Downloading update...", 20)
-                download_success, download_path = download_txadmin(url, self.update_txadmin_status)
+                download_success, download_path = download_txadmin(
+                    url, self.update_txadmin_status, cancel_event=job.cancel_event, progress=job.update
+                )
                 if not download_success:
                     self.update_txadmin_status(f"Download failed: {download_path}", 0)
-                    return
+                    return False, f"Download failed: {download_path}"
                 
                 # Step 4: Extract the update
                 self.update_txadmin_status("Extracting update...", 80)
                 extract_success, extract_message = extract_txadmin(download_path, self.update_txadmin_status)
                 if not extract_success:
                     self.update_txadmin_status(f"Extraction failed: {extract_message}", 0)
-                    return
+                    return False, f"Extraction failed: {extract_message}"
                 
                 # Step 5: Clean up old backups
                 self.update_txadmin_status("Cleaning up old backups...", 90)
@@ -203,14 +208,17 @@ class TxAdminUpdateTab:
                 # Broadcast to remote clients
                 if hasattr(self.app, 'broadcast_txadmin_backups'):
                     self.app.broadcast_txadmin_backups()
+                return True, "TxAdmin update completed"
                 
             except Exception as e:
                 error_message = f"TxAdmin update failed with error: {str(e)}"
                 self.update_txadmin_status(error_message, 0)
                 # Send Discord webhook for failure
                 send_discord_webhook('server_error', custom_message=f"❌ **TxAdmin Update Failed**\n{str(e)}")
+                return False, error_message
         
-        threading.Thread(target=do_update, daemon=True).start()
+        if not self.app.start_job(JOB_TXADMIN_UPDATE, do_update):
+            self.update_txadmin_status("A TxAdmin update is already queued or running", 0)
     
     def restore_txadmin(self):
         """Restore TxAdmin from a selected backup"""
@@ -238,18 +246,21 @@ class TxAdminUpdateTab:
             self.app.log_message(f"Starting TxAdmin restore from backup {index+1}...")
             self.update_txadmin_status("Restoring TxAdmin...", 10)
             
-            # Run restore in a separate thread
-            def do_restore():
+            # Run restore as a job (ahead of queued backups and updates)
+            def do_restore(job):
                 try:
                     success, message = restore_txadmin_backup(backup_path, self.update_txadmin_status)
                     if success:
                         self.update_txadmin_status("TxAdmin restore completed successfully!", 100)
                     else:
                         self.update_txadmin_status(f"TxAdmin restore failed: {message}", 0)
+                    return success, message
                 except Exception as e:
                     self.update_txadmin_status(f"TxAdmin restore failed: {str(e)}", 0)
+                    return False, str(e)
             
-            threading.Thread(target=do_restore, daemon=True).start()
+            if not self.app.start_job(JOB_TXADMIN_RESTORE, do_restore):
+                self.update_txadmin_status("A TxAdmin restore is already queued or running", 0)
             
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid number")
@@ -0,0 +1,295 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+from config_manager import get_data_dir
+
+CATALOG_FILE = os.path.join(get_data_dir(), "backup_catalog.db")
+RECONCILE_INTERVAL = 300  # Seconds between background checks of the backup folders
+RECENT_WRITE_GRACE = 60  # Files modified this recently are left to the code writing them (a dump in progress)
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+CHECKSUM_THROTTLE = 0.005  # Seconds to sleep per chunk hashed, so checksumming does not compete with backups
+
+# Backup types - the same names as Controller.refresh_backup_list() kinds
+BACKUP_TYPE_DATABASE = "database"
+BACKUP_TYPE_SERVER = "server"
+BACKUP_TYPE_TXADMIN = "txadmin"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS backups (
+    path TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    created REAL NOT NULL,  -- Modification time, the order the folder scans sorted by
+    size INTEGER NOT NULL,  -- Bytes on disk (all files of a per-table backup folder)
+    checksum TEXT,  -- SHA-256, filled in by the background thread
+    duration REAL,  -- Seconds the backup took (NULL for files found on disk)
+    source_version TEXT  -- MySQL server or TxAdmin version that was backed up
+);
+CREATE INDEX IF NOT EXISTS backups_by_folder ON backups (type, folder, created DESC);
+CREATE TABLE IF NOT EXISTS scans (
+    type TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    scanned REAL NOT NULL,
+    PRIMARY KEY (type, folder)
+);
+"""
+
+def normalize_folder(folder):
+    return os.path.normcase(os.path.abspath(folder))
+
+def catalog_key(path):
+    """The catalog's key for a backup path - the same however the path was spelled (case-insensitive on Windows)"""
+    return os.path.normcase(os.path.abspath(path))
+
+def backup_size(path):
+    """Bytes on disk of a backup file or folder"""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path) for name in files
+    )
+
+def backup_checksum(path, stop_event=None):
+    """SHA-256 of a backup file, or of the names and contents of a backup folder's files. None if stopped."""
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.relpath(os.path.join(root, name), path)
+            for root, _, names in os.walk(path) for name in names
+        )
+    else:
+        files = [""]
+    
+    digest = hashlib.sha256()
+    for name in files:
+        if name:
+            digest.update(name.replace(os.sep, "/").encode('utf-8') + b"\0")
+        with open(os.path.join(path, name) if name else path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b""):
+                if stop_event and stop_event.is_set():
+                    return None
+                digest.update(chunk)
+                time.sleep(CHECKSUM_THROTTLE)
+    return digest.hexdigest()
+
+class BackupCatalog:
+    """
+    SQLite catalog of the database, server and TxAdmin backups: one row per
+    backup file (or per-table backup folder) with its size, checksum, how
+    long the backup took and the version that was backed up. Backup lists
+    are an indexed query on it instead of listing and stat-ing the backup
+    folder on every refresh, which stalls on network shares.
+    
+    The code that creates and prunes backups adds and removes their rows.
+    Backups added, changed or deleted outside the application are picked up
+    by reconcile(): once when a folder is first listed, then by the
+    background thread (start()), which also fills in checksums.
+    """
+    
+    def __init__(self, path=CATALOG_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.executescript(SCHEMA)
+        self.sources = {}  # {backup type: (folder, is_backup(path))}, registered by list_backups()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.interval = RECONCILE_INTERVAL
+        self.checksums = True
+        self.on_change = None  # Called with the backup types whose list changed in a background pass
+    
+    def list_backups(self, backup_type, folder, is_backup, offset=0, limit=None):
+        """
+        Backups of a type in folder as [(path, modification time, file name)],
+        newest first, optionally one page of them. is_backup(path) tells the
+        backups apart from other files when the folder is scanned.
+        """
+        folder = normalize_folder(folder)
+        self.sources[backup_type] = (folder, is_backup)
+        with self.lock:
+            scanned = self.connection.execute(
+                "SELECT 1 FROM scans WHERE type = ? AND folder = ?", (backup_type, folder)
+            ).fetchone()
+        if not scanned:
+            self.reconcile(backup_type)
+        
+        with self.lock:
+            return self.connection.execute(
+                "SELECT path, created, filename FROM backups WHERE type = ? AND folder = ? "
+                "ORDER BY created DESC LIMIT ? OFFSET ?",
+                (backup_type, folder, -1 if limit is None else limit, offset)
+            ).fetchall()
+    
+    def count_backups(self, backup_type):
+        """Number of backups of a type in the folder it was last listed from"""
+        if backup_type not in self.sources:
+            return 0
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM backups WHERE type = ? AND folder = ?", (backup_type, self.sources[backup_type][0])
+            ).fetchone()[0]
+    
+    def get_backup(self, path):
+        """Everything recorded about a backup as a dict, or None if it is not in the catalog"""
+        with self.lock:
+            cursor = self.connection.execute("SELECT * FROM backups WHERE path = ?", (catalog_key(path),))
+            row = cursor.fetchone()
+        return dict(zip([column[0] for column in cursor.description], row)) if row else None
+    
+    def add_backup(self, backup_type, path, duration=None, source_version=None):
+        """Record a backup that was just created"""
+        path = os.path.abspath(path)
+        try:
+            created, size = os.path.getmtime(path), backup_size(path)
+            with self.lock, self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO backups (path, type, folder, filename, created, size, duration, source_version) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (catalog_key(path), backup_type, normalize_folder(os.path.dirname(path)), os.path.basename(path),
+                     created, size, duration, source_version)
+                )
+        except (OSError, sqlite3.Error) as e:
+            # The backup itself is fine - the next reconcile adds it
+            logging.warning(f"Failed to add {path} to the backup catalog: {e}")
+    
+    def remove_backups(self, paths):
+        """Forget backups that were deleted (in one transaction)"""
+        try:
+            with self.lock, self.connection:
+                self.connection.executemany("DELETE FROM backups WHERE path = ?", [(catalog_key(path),) for path in paths])
+        except sqlite3.Error as e:
+            logging.warning(f"Failed to remove deleted backups from the backup catalog: {e}")
+    
+    def reconcile(self, backup_type):
+        """
+        Bring the catalog in line with the backup folder of a type: add
+        backups found on disk, update changed ones and drop deleted ones (and
+        rows of folders the type no longer uses). The folder is scanned
+        without holding the catalog lock. Returns True if anything changed.
+        """
+        folder, is_backup = self.sources[backup_type]
+        try:
+            with os.scandir(folder) as entries:
+                # A DirEntry's stat() comes with the listing on Windows - no extra round trip per file
+                found = {
+                    catalog_key(entry.path): (entry.name, entry.stat().st_mtime, None if entry.is_dir() else entry.stat().st_size)
+                    for entry in entries if is_backup(entry.path)
+                }
+        except FileNotFoundError:
+            found = {}
+        except OSError as e:
+            # An unreachable share - keep the catalog as it is rather than emptying it
+            logging.warning(f"Failed to scan {folder} for the backup catalog: {e}")
+            return False
+        
+        with self.lock:
+            known = {
+                path: (created, size) for path, created, size in self.connection.execute(
+                    "SELECT path, created, size FROM backups WHERE type = ? AND folder = ?", (backup_type, folder)
+                )
+            }
+        
+        now = time.time()
+        changed = []
+        for path, (filename, created, size) in found.items():
+            if path in known and known[path][0] == created and size in (None, known[path][1]):
+                continue
+            if path not in known and abs(now - created) < RECENT_WRITE_GRACE:
+                continue  # Probably still being written - added by its creator when done
+            try:
+                changed.append((path, filename, created, size if size is not None else backup_size(path)))
+            except OSError:
+                continue
+        # A backup added by its creator after the scan is known but not found - it still exists
+        removed = [path for path in known if path not in found and not os.path.exists(path)]
+        
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO backups (path, type, folder, filename, created, size) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET filename = excluded.filename, created = excluded.created, size = excluded.size, checksum = NULL",
+                [(path, backup_type, folder, filename, created, size) for path, filename, created, size in changed]
+            )
+            self.connection.executemany("DELETE FROM backups WHERE path = ?", [(path,) for path in removed])
+            # Rows of a folder the type used before (its folder setting was changed)
+            moved = self.connection.execute(
+                "DELETE FROM backups WHERE type = ? AND folder != ?", (backup_type, folder)
+            ).rowcount
+            self.connection.execute("DELETE FROM scans WHERE type = ? AND folder != ?", (backup_type, folder))
+            self.connection.execute("INSERT OR REPLACE INTO scans (type, folder, scanned) VALUES (?, ?, ?)", (backup_type, folder, now))
+        
+        if changed or removed or moved:
+            logging.info(f"Backup catalog: {len(changed)} {backup_type} backup(s) added or updated, "
+                         f"{len(removed) + moved} removed")
+        return bool(changed or removed or moved)
+    
+    def fill_checksums(self):
+        """Compute the checksums still missing, newest backups first (stops early when the catalog is stopped)"""
+        with self.lock:
+            missing = self.connection.execute(
+                "SELECT path, created, size FROM backups WHERE checksum IS NULL ORDER BY created DESC"
+            ).fetchall()
+        for path, created, size in missing:
+            try:
+                checksum = backup_checksum(path, self.stop_event)
+            except OSError as e:
+                logging.debug(f"Failed to checksum {path}: {e}")
+                continue
+            if checksum is None:
+                return
+            with self.lock, self.connection:
+                # Only if the backup did not change while it was hashed
+                self.connection.execute(
+                    "UPDATE backups SET checksum = ? WHERE path = ? AND created = ? AND size = ?",
+                    (checksum, path, created, size)
+                )
+    
+    def start(self, interval=RECONCILE_INTERVAL, checksums=True, on_change=None):
+        """Reconcile the listed backup folders (and fill in checksums) every interval seconds in the background"""
+        self.interval = interval
+        self.checksums = checksums
+        self.on_change = on_change
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="backup-catalog", daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+    
+    def _run(self):
+        # The first pass runs right away - it catches changes made while the application was closed
+        delay = 0
+        while not self.stop_event.wait(delay):
+            delay = self.interval
+            try:
+                changed = [backup_type for backup_type in list(self.sources) if self.reconcile(backup_type)]
+                if changed and self.on_change:
+                    self.on_change(changed)
+                if self.checksums:
+                    self.fill_checksums()
+            except Exception as e:
+                logging.error(f"Backup catalog reconcile failed: {e}", exc_info=True)
+
+catalog = None
+catalog_lock = threading.Lock()
+
+def get_catalog():
+    """The application's backup catalog, opened on first use (a damaged catalog file is set aside and rebuilt)"""
+    global catalog
+    with catalog_lock:
+        if catalog is None:
+            try:
+                catalog = BackupCatalog(CATALOG_FILE)
+            except sqlite3.DatabaseError as e:
+                logging.error(f"Backup catalog {CATALOG_FILE} is damaged ({e}) - rebuilding it from the backup folders")
+                os.replace(CATALOG_FILE, CATALOG_FILE + ".damaged")
+                catalog = BackupCatalog(CATALOG_FILE)
+        return catalog
@@ -1,8 +1,6 @@
 import os
 import re
 import logging
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
 
 # --- Configuration ---
 # Hard-coded configuration values
@@ -18,6 +16,11 @@ DB_NAME = 'vorpcore_d7f8d9'
 BACKUP_DIR = r'C:\\Users\\Administrator\\Documents\\server_backups\\database'
 MYSQLDUMP_PATH = r'C:\\xampp\\mysql\\bin\\mysqldump.exe'
 MYSQL_PATH = r'C:\\xampp\\mysql\\bin\\mysql.exe'
+DB_BACKUP_COMPRESSION = 'gzip'  # 'gzip', 'zstd' (needs zstandard) or 'none'
+DB_DUMP_MODE = 'single'  # 'single' (one mysqldump) or 'parallel' (one mysqldump per table)
+DB_DUMP_WORKERS = 4  # mysqldump processes running at once in parallel mode
+DB_DUMP_CONSISTENCY = 'lock'  # 'lock' (global read lock for the dump) or 'transaction' (per-table snapshots)
+DB_RESTORE_WORKERS = 4  # mysql sessions loading tables at once when restoring a per-table backup
 
 # Server backup configuration
 SERVER_FOLDER = r'C:\\Users\\Administrator\\Desktop\\txData\\VORPCore_D7F8D9.base\\resources'
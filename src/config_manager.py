@@ -67,6 +67,11 @@ def load_config():
         'BACKUP_DIR': os.path.join(os.path.expanduser('~'), 'backups', 'database'),
         'MYSQLDUMP_PATH': get_default_mysqldump_path(),
         'MYSQL_PATH': get_default_mysql_path(),
+        'DB_BACKUP_COMPRESSION': 'gzip',
+        'DB_DUMP_MODE': 'single',
+        'DB_DUMP_WORKERS': 4,
+        'DB_DUMP_CONSISTENCY': 'lock',
+        'DB_RESTORE_WORKERS': 4,
         'SERVER_FOLDER': os.path.join(os.path.expanduser('~'), 'server', 'resources'),
         'SERVER_BACKUP_DIR': os.path.join(os.path.expanduser('~'), 'backups', 'server'),
         'SERVER_BACKUP_KEEP_COUNT': 10,
@@ -0,0 +1,800 @@
+import os
+import time
+import signal
+import logging
+import threading
+from datetime import datetime, timedelta
+from collections import deque
+
+import config
+from utils import add_firewall_rule
+from database import create_backup, delete_old_backups, get_backup_files, get_backup_tables, preview_backup_table, restore_tables
+from server import backup_server_folder, delete_old_server_backups, get_server_backup_files
+from txadmin import get_txadmin_backups, check_for_txadmin_updates, find_fxserver_processes, auto_update_txadmin, start_fxserver, stop_fxserver
+from remote_protocol import (
+    RemoteMessage, LogBatcher, create_remote_server, STATUS_OK, STATUS_ERROR,
+    TOPIC_STATUS, TOPIC_LOGS, TOPIC_RESOURCES, TOPIC_PROGRESS, TOPIC_BACKUPS,
+    CMD_JOB_LIST, CMD_JOB_STATUS, CMD_JOB_CANCEL, CMD_JOB_UPDATE,
+    CMD_GET_DB_BACKUP_TABLES, CMD_PREVIEW_DB_TABLE, CMD_RESTORE_DB_TABLES
+)
+from jobs import JobManager, JOB_DATABASE_BACKUP, JOB_SERVER_BACKUP, JOB_TXADMIN_UPDATE, JOB_DATABASE_RESTORE, JOB_UPDATE_INTERVAL
+from scheduler import Scheduler, hours_to_cron
+from settings import load_settings, update_setting
+from resource_monitor import ResourceMonitor
+from backup_catalog import get_catalog
+
+RECENT_LOG_LINES = 200  # Log lines kept for remote snapshots
+LOAD_SAMPLE_INTERVAL = 60  # Seconds between load profile samples (smart backup window)
+STATUS_INTERVAL = 3  # Seconds between server status broadcasts when running headless
+FIREWALL_RULE_NAME = "FIVEM-REDM-Controller-Remote"
+
+class Controller:
+    """
+    The controller without a window: backup/restore/update jobs, the backup
+    scheduler, resource monitoring and the remote control server.
+    
+    BackupApp builds the Tk interface on top of it; run_headless() runs it
+    on its own (a Linux box that only needs scheduled backups and remote
+    control). Nothing here imports tkinter.
+    """
+    
+    def __init__(self):
+        # Set running and remote flags early to avoid AttributeError
+        self.running = True
+        self.remote_server = None
+        self.remote_enabled = False
+        self.recent_logs = deque(maxlen=RECENT_LOG_LINES)
+        
+        # Log lines reach remote clients in batches (LOG_BATCH) instead of one frame each
+        self.log_batcher = LogBatcher(self.send_log_batch)
+        self.log_batcher.start()
+        
+        # Load settings early before they're needed
+        logging.info("Loading settings...")
+        self.settings = load_settings()
+        
+        # Backups, restores and updates (manual, remote or scheduled) run as jobs that can be
+        # polled and cancelled; disk-heavy jobs are serialized by the job manager
+        self.jobs = JobManager(
+            on_change=self.broadcast_job_update,
+            limits=self.settings.get("jobs", {}).get("resource_limits")
+        )
+        self.jobs.start()
+        
+        # Initialize resource monitor (also learns the load profile used by the smart backup window)
+        self.resource_monitor = ResourceMonitor()
+        
+        # Scheduled backups - the scheduler thread is started by start()
+        self.smart_window = self.settings.get("schedule", {}).get("smart_window", {})
+        self.smart_window_timers = {}  # {job type: threading.Timer} for backups waiting for their quiet slot
+        self.scheduler = self.create_scheduler()
+        self.monitor_thread = None
+    
+    def start(self):
+        """
+        Start the backup scheduler (catches up backups missed while closed), the resource monitor thread
+        and the backup catalog's background reconcile
+        """
+        self.scheduler.start()
+        self.monitor_thread = threading.Thread(target=self.resource_monitor_loop, daemon=True)
+        self.monitor_thread.start()
+        catalog_settings = self.settings.get("backup_catalog", {})
+        get_catalog().start(
+            interval=max(1, catalog_settings.get("reconcile_minutes", 5)) * 60,
+            checksums=catalog_settings.get("checksums", True),
+            on_change=self.on_backup_catalog_change
+        )
+    
+    def shutdown(self):
+        """Stop scheduling, cancel jobs, flush batched log lines and stop the remote server"""
+        self.scheduler.stop()
+        get_catalog().stop()
+        for timer in list(self.smart_window_timers.values()):
+            timer.cancel()
+        self.resource_monitor.load_profile.save()
+        self.jobs.stop()
+        self.log_batcher.stop()
+        self.stop_remote_server()
+        self.running = False
+    
+    def log_message(self, message):
+        """Record an activity log line (file log, remote snapshot and subscribed clients)"""
+        timestamp = datetime.now().isoformat()
+        self.recent_logs.append({"message": message, "timestamp": timestamp})
+        
+        # Also log to file
+        logging.info(message)
+        
+        # Also queue for remote clients if enabled (sent by the log batcher)
+        if self.remote_enabled and self.wants_broadcast(TOPIC_LOGS):
+            self.log_batcher.add(message, timestamp)
+    
+    def refresh_backup_list(self, kind):
+        """Called after a job changed the "database", "server" or "txadmin" backups - the UI reloads its list"""
+        pass
+    
+    def on_backup_catalog_change(self, kinds):
+        """Backup catalog callback: backups were added or deleted outside the application"""
+        broadcasts = {
+            "database": self.broadcast_database_backups,
+            "server": self.broadcast_server_backups,
+            "txadmin": self.broadcast_txadmin_backups,
+        }
+        for kind in kinds:
+            broadcasts[kind]()
+            self.refresh_backup_list(kind)
+    
+    def start_remote_server(self, port):
+        """
+        Start the remote control server with the saved settings and auth key.
+        Returns tuple (success, message)
+        """
+        if not (1024 <= port <= 65535):
+            update_setting("remote_control", "enabled", False)
+            return False, "Port must be between 1024 and 65535"
+        
+        # Save port to settings
+        update_setting("remote_control", "port", port)
+        
+        remote_settings = self.settings["remote_control"]
+        self.remote_server = create_remote_server(
+            port=port,
+            command_handler=self.handle_remote_command,
+            engine=remote_settings.get("engine", "threaded"),
+            max_workers=remote_settings.get("executor_workers", 4),
+            compression_threshold=remote_settings.get("compression_threshold", 4096)
+        )
+        admission = self.remote_server.admission
+        admission.max_connections = remote_settings.get("max_connections", admission.max_connections)
+        admission.max_per_ip = remote_settings.get("max_connections_per_ip", admission.max_per_ip)
+        
+        # If we have a saved key, use it instead of generating a new one
+        saved_auth_key = remote_settings["auth_key"]
+        if saved_auth_key:
+            self.remote_server.auth_key = saved_auth_key
+            self.remote_server.auth_salt, self.remote_server.auth_hash = self.remote_server.hash_auth_key(saved_auth_key)
+            self.log_message("Using saved authentication key")
+        
+        if not self.remote_server.start():
+            self.remote_server = None
+            update_setting("remote_control", "enabled", False)
+            return False, "Failed to start remote control server"
+        
+        self.remote_enabled = True
+        
+        # Save the auth key and enabled state
+        update_setting("remote_control", "auth_key", self.remote_server.auth_key)
+        update_setting("remote_control", "enabled", True)
+        return True, f"Remote control server started on port {port}"
+    
+    def stop_remote_server(self):
+        """Stop the remote control server if it is running"""
+        if self.remote_server:
+            self.remote_server.stop()
+            self.remote_server = None
+        self.remote_enabled = False
+    
+    def handle_remote_command(self, message):
+        """Handle commands received from remote clients"""
+        try:
+            command = message.command
+            data = message.data or {}
+            
+            self.log_message(f"[Remote] Received command: {command}")
+            
+            if command == "GET_SERVER_STATUS":
+                return RemoteMessage(
+                    command="SERVER_STATUS",
+                    status=STATUS_OK,
+                    data=self.get_server_status_data()
+                )
+            
+            elif command == "START_SERVER":
+                success, msg = start_fxserver(callback=self.log_message)
+                
+                # Broadcast status change to all clients
+                if self.remote_server:
+                    self.broadcast_server_status()
+                
+                return RemoteMessage(
+                    command="START_SERVER",
+                    status=STATUS_OK if success else STATUS_ERROR,
+                    message=msg
+                )
+            
+            elif command == "STOP_SERVER":
+                was_running, success, msg = stop_fxserver(callback=self.log_message)
+                
+                # Broadcast status change to all clients
+                if self.remote_server:
+                    self.broadcast_server_status()
+                
+                return RemoteMessage(
+                    command="STOP_SERVER",
+                    status=STATUS_OK if success else STATUS_ERROR,
+                    message=msg
+                )
+            
+            elif command == "RESTART_SERVER":
+                # Stop then start
+                was_running, stop_success, server_path = stop_fxserver(callback=self.log_message)
+                if stop_success:
+                    time.sleep(2)
+                    start_success, start_msg = start_fxserver(
+                        server_path=server_path if isinstance(server_path, str) else None,
+                        callback=self.log_message
+                    )
+                    
+                    # Broadcast status change to all clients
+                    if self.remote_server:
+                        self.broadcast_server_status()
+                    
+                    return RemoteMessage(
+                        command="RESTART_SERVER",
+                        status=STATUS_OK if start_success else STATUS_ERROR,
+                        message=start_msg
+                    )
+                else:
+                    return RemoteMessage(
+                        command="RESTART_SERVER",
+                        status=STATUS_ERROR,
+                        message=server_path
+                    )
+            
+            elif command == "GET_DATABASE_BACKUPS":
+                return self.backup_list_reply("DATABASE_BACKUPS", "database", get_backup_files, data)
+            
+            elif command == "GET_SERVER_BACKUPS":
+                return self.backup_list_reply("SERVER_BACKUPS", "server", get_server_backup_files, data)
+            
+            elif command == "GET_TXADMIN_BACKUPS":
+                return self.backup_list_reply("TXADMIN_BACKUPS", "txadmin", get_txadmin_backups, data)
+            
+            elif command == "GET_NEXT_BACKUP_TIME":
+                return RemoteMessage(
+                    command="NEXT_BACKUP_TIME",
+                    status=STATUS_OK,
+                    data=self.get_next_backup_data()
+                )
+            
+            elif command == "GET_SNAPSHOT":
+                # Everything a freshly connected dashboard needs, in one reply
+                resource_monitor = getattr(self, 'resource_monitor', None)
+                snapshot = {
+                    "server_status": self.get_server_status_data(),
+                    "database_backups": self.serialize_backups(get_backup_files()),
+                    "server_backups": self.serialize_backups(get_server_backup_files()),
+                    "txadmin_backups": self.serialize_backups(get_txadmin_backups()),
+                    "next_backup_time": self.get_next_backup_data(),
+                    "resource_history": resource_monitor.get_history() if resource_monitor else None,
+                    "recent_logs": list(self.recent_logs)
+                }
+                return RemoteMessage(
+                    command="SNAPSHOT",
+                    status=STATUS_OK,
+                    data=snapshot  # Large frames are compressed by the protocol layer
+                )
+            
+            elif command == "BACKUP_DATABASE":
+                return self.submit_remote_job(command, JOB_DATABASE_BACKUP, self.run_database_backup_job)
+            
+            elif command == "BACKUP_SERVER":
+                return self.submit_remote_job(command, JOB_SERVER_BACKUP, self.run_server_backup_job)
+            
+            elif command == "UPDATE_TXADMIN":
+                return self.submit_remote_job(command, JOB_TXADMIN_UPDATE, self.run_txadmin_update_job)
+            
+            elif command in (CMD_GET_DB_BACKUP_TABLES, CMD_PREVIEW_DB_TABLE, CMD_RESTORE_DB_TABLES):
+                return self.handle_table_command(command, data)
+            
+            elif command == CMD_JOB_LIST:
+                return RemoteMessage(
+                    command=CMD_JOB_LIST,
+                    status=STATUS_OK,
+                    data={
+                        "jobs": [job.as_dict() for job in self.jobs.list_jobs()],
+                        "queue": self.jobs.queue_stats()
+                    }
+                )
+            
+            elif command == CMD_JOB_STATUS:
+                job = self.jobs.get(data.get("job_id"))
+                if job is None:
+                    return RemoteMessage(
+                        command=CMD_JOB_STATUS,
+                        status=STATUS_ERROR,
+                        message=f"Unknown job: {data.get('job_id')}"
+                    )
+                return RemoteMessage(
+                    command=CMD_JOB_STATUS,
+                    status=STATUS_OK,
+                    data=job.as_dict()
+                )
+            
+            elif command == CMD_JOB_CANCEL:
+                success, msg = self.jobs.cancel(data.get("job_id"))
+                return RemoteMessage(
+                    command=CMD_JOB_CANCEL,
+                    status=STATUS_OK if success else STATUS_ERROR,
+                    message=msg
+                )
+            
+            else:
+                return RemoteMessage(
+                    command=command,
+                    status=STATUS_ERROR,
+                    message=f"Unknown command: {command}"
+                )
+        
+        except Exception as e:
+            error_msg = f"Error handling remote command {command}: {str(e)}"
+            self.log_message(error_msg)
+            logging.error(error_msg, exc_info=True)
+            return RemoteMessage(
+                command=message.command,
+                status=STATUS_ERROR,
+                message=str(e)
+            )
+    
+    def start_job(self, job_type, func, description=None):
+        """Queue a local or scheduled job. Returns the Job, or None (and logs why) if one of the same type is already waiting or running."""
+        success, result = self.jobs.submit(job_type, func, description)
+        if not success:
+            self.log_message(result)
+            return None
+        return result
+    
+    def submit_remote_job(self, command, job_type, func):
+        """Queue a job for a remote command and reply with its ID (or why it was refused)"""
+        success, result = self.jobs.submit(job_type, func)
+        if not success:
+            return RemoteMessage(command=command, status=STATUS_ERROR, message=result)
+        
+        return RemoteMessage(
+            command=command,
+            status=STATUS_OK,
+            message=f"{result.description} started (job {result.id})",
+            data={"job_id": result.id}
+        )
+    
+    def run_database_backup_job(self, job):
+        """Job: database backup requested by a remote client"""
+        success, result = create_backup(cancel_event=job.cancel_event, progress=job.update)
+        if success:
+            delete_old_backups(keep_count=100)
+            # Broadcast updated backup list to subscribed clients
+            self.broadcast_database_backups()
+            self.refresh_backup_list("database")
+        return success, result
+    
+    def handle_table_command(self, command, data):
+        """List, preview or restore tables of a database backup, named by its file name"""
+        backup_path = next((path for path, _, filename in get_backup_files() if filename == data.get("backup")), None)
+        if backup_path is None:
+            return RemoteMessage(command=command, status=STATUS_ERROR, message=f"Unknown database backup: {data.get('backup')}")
+        
+        if command == CMD_GET_DB_BACKUP_TABLES:
+            success, result = get_backup_tables(backup_path)
+            if not success:
+                return RemoteMessage(command=command, status=STATUS_ERROR, message=result)
+            return RemoteMessage(command=command, status=STATUS_OK, data={"backup": data["backup"], "tables": result})
+        
+        if command == CMD_PREVIEW_DB_TABLE:
+            success, result = preview_backup_table(backup_path, data.get("table"))
+            if not success:
+                return RemoteMessage(command=command, status=STATUS_ERROR, message=result)
+            return RemoteMessage(command=command, status=STATUS_OK, data={"table": data.get("table"), "text": result})
+        
+        tables = data.get("tables") or []
+        success, result = self.jobs.submit(
+            JOB_DATABASE_RESTORE,
+            lambda job: self.run_table_restore_job(job, backup_path, tables),
+            description=f"Restore of {len(tables)} table(s)"
+        )
+        if not success:
+            return RemoteMessage(command=command, status=STATUS_ERROR, message=result)
+        return RemoteMessage(
+            command=command,
+            status=STATUS_OK,
+            message=f"{result.description} started (job {result.id})",
+            data={"job_id": result.id}
+        )
+    
+    def run_table_restore_job(self, job, backup_path, tables):
+        """Job: restore of selected tables of a database backup"""
+        self.log_message(f"Restoring {', '.join(tables)} from {os.path.basename(backup_path)}...")
+        success, message = restore_tables(
+            backup_path, tables,
+            cancel_event=job.cancel_event,
+            progress=self.progress_reporter(job, "Table restore")
+        )
+        self.log_message(f"Table restore {'completed' if success else 'failed'}: {message}")
+        return success, message
+    
+    def run_server_backup_job(self, job):
+        """Job: server backup requested by a remote client"""
+        def callback(msg):
+            self.log_message(msg)
+            job.update(msg)
+        
+        success, result = backup_server_folder(callback, cancel_event=job.cancel_event, progress=job.update)
+        if success:
+            delete_old_server_backups(keep_count=config.SERVER_BACKUP_KEEP_COUNT)
+            # Broadcast updated backup list to subscribed clients
+            self.broadcast_server_backups()
+            self.refresh_backup_list("server")
+        return success, result
+    
+    def run_txadmin_update_job(self, job):
+        """Job: TxAdmin update requested by a remote client"""
+        def progress_callback(msg, progress=None):
+            self.log_message(msg)
+            self.broadcast_progress(msg, progress)
+            job.update(msg)
+        
+        success, result = auto_update_txadmin(progress_callback, cancel_event=job.cancel_event, progress=job.update)
+        if success:
+            # Broadcast updated backup list
+            self.broadcast_txadmin_backups()
+            self.refresh_backup_list("txadmin")
+        return success, result
+    
+    def serialize_backups(self, backups):
+        """Convert (path, timestamp, filename) tuples to serializable dictionaries"""
+        return [{"path": p, "timestamp": t, "filename": f} for p, t, f in backups]
+    
+    def backup_list_reply(self, command, kind, list_backups, data):
+        """
+        Reply to a GET_*_BACKUPS command with the backup list, or one page of it
+        when data has "offset" and/or "limit" (the reply adds the total count)
+        """
+        offset = max(0, int(data.get("offset") or 0))
+        limit = data.get("limit")
+        backups = list_backups(offset, int(limit) if limit is not None else None)
+        total = get_catalog().count_backups(kind)
+        return RemoteMessage(
+            command=command,
+            status=STATUS_OK,
+            data={"backups": self.serialize_backups(backups), "total": total, "offset": offset}
+        )
+    
+    def get_server_status_data(self):
+        """Current FXServer status as sent to remote clients"""
+        processes = find_fxserver_processes()
+        if processes:
+            return {"status": "RUNNING", "pid": processes[0].pid}
+        return {"status": "STOPPED"}
+    
+    def get_next_backup_data(self):
+        """Next scheduled backup (and the full next-run table) as sent to remote clients"""
+        next_time, backup_type = self.scheduler.next_run()
+        return {
+            "next_backup_time": next_time.strftime('%Y-%m-%d %H:%M:%S') if next_time else None,
+            "next_backup_timestamp": next_time.timestamp() if next_time else None,  # Unix timestamp for accurate sync
+            "server_time": datetime.now().timestamp(),  # Current server time
+            "backup_type": backup_type,
+            "schedule": [
+                {
+                    "job": entry["name"],
+                    "label": entry["label"],
+                    "cron": entry["expression"],
+                    "time": entry["time"].strftime('%Y-%m-%d %H:%M:%S'),
+                    "timestamp": entry["time"].timestamp()
+                }
+                for entry in self.scheduler.next_runs()
+            ]
+        }
+    
+    def wants_broadcast(self, topic):
+        """True if a remote client is subscribed to this topic - check before building a payload"""
+        return bool(self.remote_server) and self.remote_server.has_subscribers(topic)
+    
+    def broadcast_server_status(self):
+        """Broadcast current server status to subscribed remote clients"""
+        if not self.wants_broadcast(TOPIC_STATUS):
+            return
+        
+        try:
+            self.remote_server.broadcast_message(RemoteMessage(
+                command="SERVER_STATUS",
+                status=STATUS_OK,
+                data=self.get_server_status_data()
+            ))
+        except Exception as e:
+            logging.error(f"Error broadcasting server status: {e}")
+    
+    def send_log_batch(self, lines):
+        """Log batcher callback: broadcast gathered log lines to subscribed clients"""
+        if self.remote_server:
+            self.remote_server.broadcast_log_lines(lines)
+    
+    def broadcast_database_backups(self):
+        """Broadcast updated database backup list to subscribed clients"""
+        if self.wants_broadcast(TOPIC_BACKUPS):
+            self.remote_server.broadcast_message(RemoteMessage(
+                command="DATABASE_BACKUPS",
+                status=STATUS_OK,
+                data={"backups": self.serialize_backups(get_backup_files())}
+            ))
+    
+    def broadcast_server_backups(self):
+        """Broadcast updated server backup list to subscribed clients"""
+        if self.wants_broadcast(TOPIC_BACKUPS):
+            self.remote_server.broadcast_message(RemoteMessage(
+                command="SERVER_BACKUPS",
+                status=STATUS_OK,
+                data={"backups": self.serialize_backups(get_server_backup_files())}
+            ))
+    
+    def broadcast_txadmin_backups(self):
+        """Broadcast updated TxAdmin backup list to subscribed clients"""
+        if self.wants_broadcast(TOPIC_BACKUPS):
+            self.remote_server.broadcast_message(RemoteMessage(
+                command="TXADMIN_BACKUPS",
+                status=STATUS_OK,
+                data={"backups": self.serialize_backups(get_txadmin_backups())}
+            ))
+    
+    def broadcast_next_backup_time(self):
+        """Broadcast next backup time to subscribed clients"""
+        if self.wants_broadcast(TOPIC_STATUS):
+            try:
+                self.remote_server.broadcast_message(RemoteMessage(
+                    command="NEXT_BACKUP_TIME",
+                    status=STATUS_OK,
+                    data=self.get_next_backup_data()
+                ))
+            except Exception as e:
+                logging.error(f"Error broadcasting next backup time: {e}")
+    
+    def broadcast_progress(self, message, progress=None):
+        """Broadcast progress updates to subscribed clients"""
+        if self.wants_broadcast(TOPIC_PROGRESS):
+            self.remote_server.broadcast_message(RemoteMessage(
+                command="PROGRESS_UPDATE",
+                status=STATUS_OK,
+                data={"message": message, "progress": progress or 0}
+            ))
+    
+    def progress_reporter(self, job, label):
+        """
+        Progress callback for a job that also broadcasts it as PROGRESS_UPDATE
+        ("label: 3/40 tables, 120.5 of 800.0 MB") at most every JOB_UPDATE_INTERVAL,
+        for clients that only show the progress stream.
+        """
+        last_broadcast = 0
+        
+        def report(message=None, **fields):
+            nonlocal last_broadcast
+            job.update(message, **fields)
+            now = time.monotonic()
+            if now - last_broadcast < JOB_UPDATE_INTERVAL:
+                return
+            last_broadcast = now
+            details = []
+            if job.files_total:
+                details.append(f"{job.files_done}/{job.files_total} tables")
+            if job.bytes_done:
+                size = f"{job.bytes_done / (1024 * 1024):.1f}"
+                if job.bytes_total:
+                    size += f" of {job.bytes_total / (1024 * 1024):.1f}"
+                details.append(f"{size} MB")
+            text = f"{label}: {', '.join(details)}" if details else label
+            fraction = job.fraction()
+            self.broadcast_progress(text, int(fraction * 100) if fraction is not None else None)
+        
+        return report
+    
+    def broadcast_job_update(self, job):
+        """Job manager callback: broadcast a job's state and progress to subscribed clients"""
+        if self.wants_broadcast(TOPIC_PROGRESS):
+            self.remote_server.broadcast_message(RemoteMessage(
+                command=CMD_JOB_UPDATE,
+                status=STATUS_OK,
+                data=dict(job.as_dict(), queue=self.jobs.queue_stats())
+            ))
+    
+    def create_scheduler(self):
+        """Scheduler with a cron schedule per backup type (settings "schedule", else the configured backup hours)"""
+        schedule = self.settings.get("schedule", {})
+        scheduler = Scheduler(self.run_scheduled_job, catch_up_hours=schedule.get("catch_up_hours", 24))
+        
+        defaults = {
+            JOB_DATABASE_BACKUP: ("Database", hours_to_cron(config.DB_BACKUP_HOURS, config.BACKUP_MINUTE)),
+            JOB_SERVER_BACKUP: ("Server", hours_to_cron(config.SERVER_BACKUP_HOURS, config.BACKUP_MINUTE)),
+        }
+        for job_type, (label, default_cron) in defaults.items():
+            expression = schedule.get(job_type) or default_cron
+            if not expression:
+                continue
+            try:
+                scheduler.add(job_type, expression, label)
+            except ValueError as e:
+                logging.error(f"Invalid {label.lower()} backup schedule '{expression}': {e}")
+                if default_cron and expression != default_cron:
+                    scheduler.add(job_type, default_cron, label)
+        return scheduler
+    
+    def run_scheduled_job(self, job_type, scheduled_for, missed):
+        """Scheduler callback: queue a scheduled backup job, or plan it in the smart window"""
+        label = "database" if job_type == JOB_DATABASE_BACKUP else "server"
+        if missed:
+            self.log_message(f"Starting missed {label} backup (scheduled for {scheduled_for:%Y-%m-%d %H:%M})...")
+            self.start_scheduled_backup(job_type)
+        elif self.smart_window.get("enabled"):
+            self.plan_smart_window_backup(job_type, label)
+        else:
+            self.log_message(f"Starting scheduled {label} backup...")
+            self.start_scheduled_backup(job_type)
+        
+        # The next-run table moved on
+        self.broadcast_next_backup_time()
+    
+    def start_scheduled_backup(self, job_type):
+        if job_type == JOB_DATABASE_BACKUP:
+            self.start_job(JOB_DATABASE_BACKUP, self.run_scheduled_database_backup)
+        elif job_type == JOB_SERVER_BACKUP:
+            self.start_job(JOB_SERVER_BACKUP, self.run_scheduled_server_backup)
+    
+    def plan_smart_window_backup(self, job_type, label):
+        """Start a scheduled backup at the quietest point of the smart window, judged by the learned load profile"""
+        if job_type in self.smart_window_timers:
+            # A schedule that fires more often than the window - the backup already waiting covers this run
+            self.log_message(f"Scheduled {label} backup skipped - one is already planned in the smart window")
+            return
+        window_start = datetime.now()
+        window_end = window_start + timedelta(minutes=self.smart_window.get("window_minutes", 120))
+        slot, expected = self.resource_monitor.load_profile.quietest_slot(
+            window_start, window_end, self.smart_window.get("player_weight", 5.0)
+        )
+        
+        if expected is None:
+            self.log_message(f"No load history for the {label} backup window yet, starting scheduled {label} backup now...")
+            self.start_scheduled_backup(job_type)
+            return
+        
+        players = f", {expected['players']:.0f} players" if expected["players"] is not None else ""
+        self.log_message(
+            f"Smart window: {label} backup planned for {slot:%H:%M} "
+            f"(expected CPU {expected['cpu']:.0f}%{players}, window {window_start:%H:%M}-{window_end:%H:%M})"
+        )
+        timer = threading.Timer(
+            max(0.0, (slot - datetime.now()).total_seconds()),
+            self.start_smart_window_backup, args=(job_type, label)
+        )
+        timer.daemon = True
+        self.smart_window_timers[job_type] = timer
+        timer.start()
+    
+    def start_smart_window_backup(self, job_type, label):
+        """Smart window timer: log the load at start time and queue the backup"""
+        self.smart_window_timers.pop(job_type, None)
+        cpu, players = self.resource_monitor.get_load(self.smart_window.get("fxserver_port", 30120))
+        players = f", {players} players online" if players is not None else ""
+        self.log_message(f"Starting scheduled {label} backup in its quiet slot (CPU {cpu:.0f}%{players})...")
+        self.start_scheduled_backup(job_type)
+    
+    def run_scheduled_database_backup(self, job):
+        """Job: scheduled database backup, followed by the TxAdmin update check"""
+        success, result = create_backup(cancel_event=job.cancel_event, progress=job.update)
+        if success:
+            deleted = delete_old_backups(keep_count=100)
+            self.log_message(f"Scheduled database backup completed successfully")
+            if deleted:
+                self.log_message(f"Deleted {deleted} old database backup(s)")
+            
+            # Update local UI
+            self.refresh_backup_list("database")
+            
+            # Broadcast to all remote clients
+            self.broadcast_database_backups()
+            
+            # Check for TxAdmin updates after database backup if enabled (queued behind other disk work)
+            if config.AUTO_UPDATE_TXADMIN:
+                self.start_job(JOB_TXADMIN_UPDATE, self.run_scheduled_txadmin_update)
+        else:
+            self.log_message(f"Scheduled database backup failed: {result}")
+        return success, result
+    
+    def run_scheduled_txadmin_update(self, job):
+        """Job: scheduled TxAdmin update check and download"""
+        self.log_message("Checking for TxAdmin updates...")
+        update_available, _, _ = check_for_txadmin_updates(self.log_message)
+        if not update_available:
+            self.log_message("TxAdmin is already up to date.")
+            return True, "TxAdmin is already up to date"
+        
+        self.log_message("TxAdmin update available. Starting update process...")
+        success, message = auto_update_txadmin(self.log_message, cancel_event=job.cancel_event, progress=job.update)
+        if success:
+            self.log_message(f"TxAdmin automatic update completed: {message}")
+            self.refresh_backup_list("txadmin")
+            self.broadcast_txadmin_backups()
+        else:
+            self.log_message(f"TxAdmin automatic update failed: {message}")
+        return success, message
+    
+    def run_scheduled_server_backup(self, job):
+        """Job: scheduled server backup"""
+        success, result = backup_server_folder(self.log_message, cancel_event=job.cancel_event, progress=job.update)
+        if success:
+            deleted = delete_old_server_backups(keep_count=config.SERVER_BACKUP_KEEP_COUNT)
+            self.log_message(f"Scheduled server backup completed successfully")
+            if deleted:
+                self.log_message(f"Deleted {deleted} old server backup(s)")
+            
+            # Update local UI
+            self.refresh_backup_list("server")
+            
+            # Broadcast to all remote clients
+            self.broadcast_server_backups()
+        else:
+            self.log_message(f"Scheduled server backup failed: {result}")
+        return success, result
+    
+    def resource_monitor_loop(self):
+        """Background thread that broadcasts resource stats every second and samples the load profile every minute"""
+        next_load_sample = time.time()
+        while self.running:
+            try:
+                # Only collect stats if a remote client is subscribed to them
+                if self.remote_enabled and self.wants_broadcast(TOPIC_RESOURCES):
+                    stats = self.resource_monitor.get_current_stats()
+                    if stats:
+                        self.broadcast_resource_stats(stats)
+                
+                # Learn the daily load pattern for the smart backup window
+                if self.smart_window.get("enabled") and time.time() >= next_load_sample:
+                    next_load_sample = time.time() + LOAD_SAMPLE_INTERVAL
+                    self.resource_monitor.record_load_sample(self.smart_window.get("fxserver_port", 30120))
+            except Exception as e:
+                logging.error(f"Error in resource monitor loop: {e}")
+            
+            # Wait 1 second before next update
+            time.sleep(1)
+    
+    def broadcast_resource_stats(self, stats):
+        """Broadcast resource statistics to subscribed remote clients (as keyframes and deltas where supported)"""
+        if self.remote_server:
+            self.remote_server.broadcast_resource_stats(stats)
+
+def run_headless():
+    """
+    Run the controller without a window until SIGTERM or Ctrl+C: scheduled
+    backups, resource monitoring and - if enabled in settings - the remote
+    control server. Activity goes to the log files.
+    Returns the process exit code.
+    """
+    stop_event = threading.Event()
+    
+    def request_stop(signum, frame):
+        logging.info(f"Received {signal.Signals(signum).name}, shutting down...")
+        stop_event.set()
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    if hasattr(signal, "SIGBREAK"):
+        signal.signal(signal.SIGBREAK, request_stop)  # Ctrl+Break / console close on Windows
+    
+    controller = Controller()
+    controller.start()
+    controller.log_message("Backup & Restore Tool started (headless)")
+    
+    remote_settings = controller.settings["remote_control"]
+    if remote_settings["enabled"]:
+        success, message = controller.start_remote_server(remote_settings["port"])
+        controller.log_message(message)
+        if success:
+            success, message = add_firewall_rule(FIREWALL_RULE_NAME, remote_settings["port"])
+            controller.log_message(message)
+    else:
+        controller.log_message("Remote control is disabled in settings - running scheduled backups only")
+    
+    # The main thread only waits (in short steps, so signals are handled promptly on Windows too)
+    # and keeps subscribed clients' server status current, as the Server Control tab does in the GUI
+    while not stop_event.wait(STATUS_INTERVAL):
+        controller.broadcast_server_status()
+    
+    controller.shutdown()
+    logging.info("Headless controller stopped")
+    return 0
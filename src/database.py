@@ -1,14 +1,62 @@
 import os
+import re
+import gzip
+import json
+import time
 import subprocess
 import logging
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 # Import from config which will have values applied from JSON
 from config import (
     BACKUP_DIR, DB_HOST, DB_USER, DB_PASSWORD, DB_NAME,
-    MYSQLDUMP_PATH, MYSQL_PATH
+    MYSQLDUMP_PATH, MYSQL_PATH, DB_BACKUP_COMPRESSION,
+    DB_DUMP_MODE, DB_DUMP_WORKERS, DB_DUMP_CONSISTENCY, DB_RESTORE_WORKERS
 )
 from config_manager import is_windows
+from backup_catalog import get_catalog, BACKUP_TYPE_DATABASE
+
+try:
+    import zstandard
+except ImportError:  # Optional - without it database backups are written with gzip
+    zstandard = None
+
+# Extension of the dump file for each DB_BACKUP_COMPRESSION setting
+BACKUP_EXTENSIONS = {"zstd": ".sql.zst", "gzip": ".sql.gz", "none": ".sql"}
+DUMP_CHUNK_SIZE = 1024 * 1024  # Bytes read from mysqldump (or the backup file) at a time
+GZIP_LEVEL = 3  # Level 6 compresses ~10% smaller at half the speed - slower than mysqldump on large dumps
+ZSTD_LEVEL = 3
+ZSTD_THREADS = -1  # One compression worker per CPU
+
+# Per-table backups (DB_DUMP_MODE 'parallel'): a backup-<timestamp> folder of table dumps and a manifest
+MANIFEST_FILE = "manifest.json"
+MANIFEST_FORMAT = "per-table"
+PARTIAL_SUFFIX = ".partial"  # Folder name while the dump is running
+LOCK_TIMEOUT = 30  # Seconds to wait for the global read lock before dumping without it
+
+# Parallel restore of per-table backups
+RESTORE_SESSION_SETUP = b"SET SESSION FOREIGN_KEY_CHECKS = 0, SESSION UNIQUE_CHECKS = 0;\n"
+CREATE_TABLE_SCAN_SIZE = 256 * 1024  # Bytes read from the start of a table's dump to find its CREATE TABLE
+FOREIGN_KEY_PATTERN = re.compile(
+    r"CONSTRAINT `((?:[^`]|``)+)` FOREIGN KEY \(([^)]*)\) REFERENCES (?:`((?:[^`]|``)+)`\.)?`((?:[^`]|``)+)` \(([^)]*)\)"
+)
+
+# Table-offset index of single-file dumps (see IndexedDumpWriter)
+INDEX_SUFFIX = ".index.json"  # Sidecar file next to the backup
+INDEX_FORMAT = "table-offsets"
+MAX_PENDING_LINE = 16 * 1024 * 1024  # Longer lines are written before their end is seen - they are never section titles
+PREVIEW_SIZE = 16 * 1024  # Bytes of a table's SQL shown by preview_backup_table
+PREVIEW_LINE_LENGTH = 300  # Longer lines (extended INSERTs) are cut in previews
+# The comment titles mysqldump writes before each table, view and the routines, and the first line of its footer.
+# Table and view names are backtick-quoted (a ` doubled, a ' as is), database names single-quoted
+SECTION_PATTERN = re.compile(
+    rb"\n(?:-- (Table|Temporary (?:view|table)|Final view|Dumping (?:events|routines)) "
+    rb"(?:structure for (?:table|view)|for database) (?:`((?:[^`\n]|``)*)`|'([^'\n]*)')"
+    rb"|/\*!40103 SET TIME_ZONE=@OLD_TIME_ZONE \*/;|/\*!40101 SET SQL_MODE=@OLD_SQL_MODE \*/;)(?=\n)"
+)
+SECTION_KINDS = {b"Table": "table", b"Temporary": "view_placeholder", b"Final": "view", b"Dumping": "routines"}
 
 def find_executable(name):
     """Find executable in PATH or use configured path"""
@@ -23,10 +71,300 @@ def find_executable(name):
     
     return name  # Return original and let subprocess fail with clear error
 
-def create_backup():
+def backup_compression():
+    """The configured dump compression, falling back to gzip when zstandard is not installed"""
+    compression = DB_BACKUP_COMPRESSION if DB_BACKUP_COMPRESSION in BACKUP_EXTENSIONS else "gzip"
+    if compression == "zstd" and zstandard is None:
+        logging.warning("zstandard is not installed - writing the database backup with gzip")
+        compression = "gzip"
+    return compression
+
+def open_backup_writer(backup_file, compression):
+    """Binary file object that compresses what is written to it into backup_file"""
+    if compression == "zstd":
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=ZSTD_THREADS)
+        return compressor.stream_writer(open(backup_file, 'wb'))
+    if compression == "gzip":
+        return gzip.open(backup_file, 'wb', compresslevel=GZIP_LEVEL)
+    return open(backup_file, 'wb')
+
+def open_backup_reader(backup_file, raw=None):
+    """
+    Binary file object with the uncompressed SQL of a .sql, .sql.gz or .sql.zst
+    backup. Pass raw (backup_file opened in binary mode) to follow how much of
+    the file has been read with raw.tell().
+    """
+    if backup_file.endswith(BACKUP_EXTENSIONS["zstd"]):
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed - run 'pip install zstandard' to restore .sql.zst backups")
+        # Indexed dumps have a zstd frame per table
+        return zstandard.ZstdDecompressor().stream_reader(raw or open(backup_file, 'rb'), read_across_frames=True, closefd=True)
+    if backup_file.endswith(BACKUP_EXTENSIONS["gzip"]):
+        return gzip.GzipFile(fileobj=raw, mode='rb') if raw else gzip.open(backup_file, 'rb')
+    return raw or open(backup_file, 'rb')
+
+class IndexedDumpWriter:
+    """
+    Write-only file object like open_backup_writer that also builds the
+    dump's table-offset index. mysqldump titles each table's DDL and data
+    with a comment; the stream is split at those titles into sections
+    (header, one per table and view, routines, footer) and the uncompressed
+    and on-disk offset and length of each is recorded. Compressed dumps end
+    the gzip member or zstd frame at every section, so any section can be
+    decompressed on its own after seeking to it (see read_sections).
+    The index is written next to the backup (see index_path) on close.
+    """
+    
+    def __init__(self, backup_file, compression):
+        self.backup_file = backup_file
+        self.compression = compression
+        self.raw = open(backup_file, 'wb')
+        self.zstd = None
+        self.gzip = None  # Member being written, started on the first write of each section
+        if compression == "zstd":
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=ZSTD_THREADS)
+            self.zstd = compressor.stream_writer(self.raw, closefd=False)
+        self.sections = []  # [{kind, name, offset, length, raw_offset, raw_length}]
+        self.position = 0  # Uncompressed bytes written
+        self.pending = b""  # Held back from the last newline on, so a title is never split between writes
+        self.start_section("header", None)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def write(self, data):
+        data = self.pending + data
+        end = data.rfind(b"\n")
+        if end < 0:
+            if len(data) < MAX_PENDING_LINE:
+                self.pending = data
+                return
+            end = len(data)
+        
+        start = 0
+        for match in SECTION_PATTERN.finditer(data, 0, end + 1):
+            kind = SECTION_KINDS[match.group(1).split(b" ")[0]] if match.group(1) else "footer"
+            if kind == "footer" and self.sections[-1]["kind"] == "footer":
+                continue  # The footer's second SET line
+            self._write(data[start:match.start() + 1])
+            start = match.start() + 1
+            if match.group(2) is not None:
+                name = match.group(2).replace(b"``", b"`").decode('utf-8', errors='replace')
+            else:
+                name = match.group(3).decode('utf-8', errors='replace') if match.group(3) is not None else None
+            self.start_section(kind, name)
+        self._write(data[start:end])
+        self.pending = data[end:]
+    
+    def _write(self, data):
+        if not data:
+            return
+        if self.zstd:
+            self.zstd.write(data)
+        elif self.compression == "gzip":
+            if self.gzip is None:
+                self.gzip = gzip.GzipFile(fileobj=self.raw, mode='wb', compresslevel=GZIP_LEVEL)
+            self.gzip.write(data)
+        else:
+            self.raw.write(data)
+        self.position += len(data)
+    
+    def end_section(self):
+        """End the current section's gzip member or zstd frame and record its lengths"""
+        if self.zstd:
+            self.zstd.flush(zstandard.FLUSH_FRAME)
+        elif self.gzip:
+            self.gzip.close()  # Leaves self.raw open
+            self.gzip = None
+        section = self.sections[-1]
+        section["length"] = self.position - section["offset"]
+        section["raw_length"] = self.raw.tell() - section["raw_offset"]
+    
+    def start_section(self, kind, name):
+        if self.sections:
+            self.end_section()
+        self.sections.append({"kind": kind, "name": name, "offset": self.position, "raw_offset": self.raw.tell()})
+    
+    def close(self):
+        if self.raw.closed:
+            return
+        try:
+            self._write(self.pending)
+            self.pending = b""
+            self.end_section()
+            if self.zstd:
+                self.zstd.close()
+        finally:
+            self.raw.close()
+        
+        try:
+            with open(index_path(self.backup_file), 'w') as f:
+                json.dump({
+                    "format": INDEX_FORMAT,
+                    "version": 1,
+                    "compression": self.compression,
+                    "size": os.path.getsize(self.backup_file),
+                    "sections": self.sections
+                }, f)
+        except OSError as e:
+            # The backup is still complete - it just cannot be restored table by table
+            logging.warning(f"Failed to write the table index of {self.backup_file}: {e}")
+
+def index_path(backup_file):
+    """The table index sidecar file of a backup file"""
+    return backup_file + INDEX_SUFFIX
+
+def read_index(backup_file):
+    """The table index of a backup file, or None if it has none (or one that does not match the file)"""
+    try:
+        with open(index_path(backup_file), 'r') as f:
+            index = json.load(f)
+        if index.get("format") == INDEX_FORMAT and index.get("size") == os.path.getsize(backup_file):
+            return index
+    except (OSError, ValueError) as e:
+        if os.path.exists(index_path(backup_file)):
+            logging.warning(f"Failed to read the table index of {backup_file}: {e}")
+    return None
+
+def read_sections(backup_file, compression, sections, limit=None):
+    """
+    Yields the uncompressed SQL of sections of an indexed backup file,
+    seeking straight to each - at most limit bytes of each if given.
+    """
+    if compression == "zstd" and zstandard is None:
+        raise RuntimeError("zstandard is not installed - run 'pip install zstandard' to restore .sql.zst backups")
+    with open(backup_file, 'rb') as raw:
+        for section in sections:
+            raw.seek(section["raw_offset"])
+            if compression == "zstd":
+                reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
+            elif compression == "gzip":
+                reader = gzip.GzipFile(fileobj=raw, mode='rb')
+            else:
+                reader = raw
+            remaining = section["length"] if limit is None else min(limit, section["length"])
+            while remaining > 0:
+                chunk = reader.read(min(DUMP_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ValueError(f"{backup_file} does not match its table index")
+                remaining -= len(chunk)
+                yield chunk
+
+def is_backup_file(fname):
+    """True for database backup files (.sql, .sql.gz or .sql.zst)"""
+    return fname.endswith(tuple(BACKUP_EXTENSIONS.values()))
+
+def is_database_backup(path):
+    """True for a database backup file or per-table backup folder"""
+    return is_backup_file(os.path.basename(path)) or is_table_backup(path)
+
+def dump_server_version(path):
+    """MySQL server version from the header of a backup (mysqldump's '-- Server version' line), or None"""
+    try:
+        if os.path.isdir(path):
+            tables = read_manifest(path)["tables"]
+            if not tables:
+                return None
+            path = os.path.join(path, tables[0]["file"])
+        with open_backup_reader(path) as f:
+            match = re.search(rb"^-- Server version\s+(\S+)", f.read(4096), re.MULTILINE)
+        return match.group(1).decode('ascii', errors='replace') if match else None
+    except Exception:  # Unreadable or not a mysqldump header - the version is only informational
+        return None
+
+def read_stderr(process):
+    """
+    Collect a child's stderr on a thread while its stdout or stdin is being
+    streamed, so a full stderr pipe cannot stall it. Returns (thread, chunks).
+    """
+    chunks = []
+    thread = threading.Thread(target=lambda: chunks.append(process.stderr.read()), daemon=True)
+    thread.start()
+    return thread, chunks
+
+def connection_args():
+    """Host, user and password options shared by mysql and mysqldump"""
+    args = [f'--host={DB_HOST}', f'--user={DB_USER}']
+    if DB_PASSWORD:
+        args.append(f'--password={DB_PASSWORD}')
+    return args
+
+def kill_on_cancel(process, cancel_event, cancelled):
+    """Kill process from a watcher thread once cancel_event is set (a blocked pipe read or write cannot check it)"""
+    def watch():
+        while process.poll() is None:
+            if cancel_event.wait(0.5):
+                cancelled.set()
+                process.kill()
+                return
+    if cancel_event:
+        threading.Thread(target=watch, daemon=True).start()
+
+def forward_cancel(cancel_event, abort, finished):
+    """Set abort when cancel_event is set, until finished is set (stops every worker of a parallel dump or restore)"""
+    def watch():
+        while not finished.is_set():
+            if cancel_event.wait(0.5):
+                abort.set()
+                return
+    if cancel_event:
+        threading.Thread(target=watch, daemon=True).start()
+
+def stream_dump(command, backup_file, compression, cancel_event=None, on_chunk=None, open_writer=open_backup_writer):
+    """
+    Runs a mysqldump command and compresses its output into backup_file as it
+    streams (through open_writer(backup_file, compression), e.g.
+    IndexedDumpWriter). on_chunk(bytes dumped so far) is called after every chunk.
+    Returns tuple (cancelled, bytes dumped); raises CalledProcessError if
+    mysqldump fails.
+    """
+    cancelled = threading.Event()
+    dumped = 0
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr_thread, stderr = read_stderr(process)
+    # A stalled dump blocks the read below - kill it when the job is cancelled
+    kill_on_cancel(process, cancel_event, cancelled)
+    
+    try:
+        # Bytes straight from mysqldump into the compressor - no text decoding, no uncompressed copy
+        with open_writer(backup_file, compression) as f:
+            while True:
+                chunk = process.stdout.read(DUMP_CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                dumped += len(chunk)
+                if on_chunk:
+                    on_chunk(dumped)
+    except Exception:
+        # Writing failed (e.g. disk full) - stop mysqldump instead of leaving it blocked on a full pipe
+        process.kill()
+        raise
+    finally:
+        process.wait()
+        stderr_thread.join()
+    
+    if cancelled.is_set():
+        return True, dumped
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(
+            process.returncode, command, stderr=b"".join(stderr).decode('utf-8', errors='replace')
+        )
+    return False, dumped
+
+def create_backup(cancel_event=None, progress=None):
     """
     Connects to the database and performs a mysqldump.
-    The backup file is saved in the specified directory with a timestamp.
+    The dump is streamed from mysqldump and compressed on the fly (see
+    DB_BACKUP_COMPRESSION) into a timestamped file in the backup directory,
+    with a table index for restoring single tables (see IndexedDumpWriter),
+    or dumped table by table when DB_DUMP_MODE is 'parallel' (see
+    create_parallel_backup).
+    The dump is stopped if cancel_event is set; progress(bytes_done=...) is
+    called with the uncompressed size dumped so far.
     Returns tuple (success, message or filename)
     """
     # Ensure backup directory exists
@@ -38,37 +376,37 @@ def create_backup():
             logging.error(f"Failed to create backup directory {BACKUP_DIR}: {e}")
             return False, str(e)
 
+    if DB_DUMP_MODE == "parallel":
+        return create_parallel_backup(cancel_event, progress)
+    
     # Create a unique filename with a timestamp
+    compression = backup_compression()
     timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    backup_file = os.path.join(BACKUP_DIR, f"backup-{timestamp}.sql")
+    backup_file = os.path.join(BACKUP_DIR, f"backup-{timestamp}{BACKUP_EXTENSIONS[compression]}")
+    started = time.monotonic()
 
-    # Find mysqldump executable
-    mysqldump_exe = find_executable(MYSQLDUMP_PATH)
-    
     # Construct mysqldump command
-    command = [
-        mysqldump_exe,
-        f'--host={DB_HOST}',
-        f'--user={DB_USER}',
-    ]
-    if DB_PASSWORD:
-        command.append(f'--password={DB_PASSWORD}')
-    
-    command.append(DB_NAME)
+    command = [find_executable(MYSQLDUMP_PATH), *connection_args(), DB_NAME]
 
-    logging.info(f"Starting backup for database '{DB_NAME}'...")
+    logging.info(f"Starting backup for database '{DB_NAME}' ({compression})...")
 
     try:
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            process = subprocess.run(
-                command,
-                stdout=f,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=True
-            )
+        cancelled, dumped = stream_dump(
+            command, backup_file, compression, cancel_event,
+            on_chunk=(lambda dumped: progress(bytes_done=dumped)) if progress else None,
+            open_writer=IndexedDumpWriter
+        )
         
-        logging.info(f"Successfully created backup: {backup_file}")
+        if cancelled:
+            remove_backup_file(backup_file)
+            message = "Database backup cancelled"
+            logging.info(message)
+            return False, message
+        
+        logging.info(f"Successfully created backup: {backup_file} "
+                     f"({dumped / (1024 * 1024):.1f} MB dumped, {os.path.getsize(backup_file) / (1024 * 1024):.1f} MB on disk)")
+        get_catalog().add_backup(BACKUP_TYPE_DATABASE, backup_file, duration=round(time.monotonic() - started, 1),
+                                 source_version=dump_server_version(backup_file))
         return True, backup_file
 
     except FileNotFoundError:
@@ -78,47 +416,390 @@ def create_backup():
     except subprocess.CalledProcessError as e:
         error_message = f"Backup failed with error: {e.stderr}"
         logging.error(error_message)
-        if os.path.exists(backup_file):
-            os.remove(backup_file)
+        remove_backup_file(backup_file)
         return False, error_message
     except Exception as e:
         error_message = f"An unexpected error occurred: {e}"
         logging.error(error_message)
+        remove_backup_file(backup_file)
         return False, error_message
 
-def restore_backup(backup_file):
+def remove_backup_file(backup_file):
+    """Delete a backup file and its table index (if they exist)"""
+    for path in (backup_file, index_path(backup_file)):
+        if os.path.exists(path):
+            os.remove(path)
+
+def list_tables():
+    """
+    Tables and views of DB_NAME, from information_schema.
+    Returns tuple (tables, views): tables as [(name, estimated bytes)],
+    largest first, and views as [name]. Raises CalledProcessError if the
+    query fails.
+    """
+    query = (
+        "SELECT TABLE_NAME, TABLE_TYPE, COALESCE(DATA_LENGTH, 0) + COALESCE(INDEX_LENGTH, 0) "
+        "FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()"
+    )
+    command = [find_executable(MYSQL_PATH), *connection_args(), '--batch', '--raw', '--skip-column-names',
+               '-e', query, DB_NAME]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    
+    tables, views = [], []
+    for line in result.stdout.decode('utf-8').splitlines():
+        name, table_type, size = line.split('\t')
+        if table_type == 'VIEW':
+            views.append(name)
+        else:
+            tables.append((name, int(size)))
+    tables.sort(key=lambda table: table[1], reverse=True)
+    return tables, views
+
+class GlobalReadLock:
+    """
+    Holds FLUSH TABLES WITH READ LOCK in a mysql client session while the
+    per-table dumps run, so every table is dumped as of the same moment.
+    Writes wait until release(), as they wait for the table locks of a
+    single-stream mysqldump.
     """
-    Restores the database from the specified backup file.
+    
+    def __init__(self):
+        self.process = None
+        self.stderr_thread = None
+        self.stderr = []
+    
+    def acquire(self, timeout=LOCK_TIMEOUT):
+        """Take the lock. Returns tuple (success, message)"""
+        command = [find_executable(MYSQL_PATH), *connection_args(), '--batch', '--skip-column-names', '--unbuffered',
+                   DB_NAME]
+        try:
+            self.process = subprocess.Popen(
+                command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        except FileNotFoundError:
+            return False, "the 'mysql' executable was not found"
+        self.stderr_thread, self.stderr = read_stderr(self.process)
+        
+        # The session answers the SELECT only once the lock is held
+        reply = []
+        reader = threading.Thread(target=lambda: reply.append(self.process.stdout.readline()), daemon=True)
+        reader.start()
+        try:
+            self.process.stdin.write(b"FLUSH TABLES WITH READ LOCK;\nSELECT 'locked';\n")
+            self.process.stdin.flush()
+        except OSError:
+            pass
+        reader.join(timeout)
+        if reply and reply[0].strip() == b"locked":
+            return True, "Global read lock acquired"
+        
+        # A waiting FLUSH TABLES blocks other sessions too - give up on it at once
+        self.process.kill()
+        self.process.wait()
+        self.stderr_thread.join()
+        self.process = None
+        error = b"".join(self.stderr).decode('utf-8', errors='replace').strip()
+        return False, error or f"timed out after {timeout} seconds"
+    
+    def release(self):
+        """Release the lock by ending the session"""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.write(b"UNLOCK TABLES;\n")
+            self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.stderr_thread.join()
+        self.process = None
+
+def part_file_name(name, extension, used):
+    """File name for a table's dump: the table name made filesystem-safe and unique (case-insensitively)"""
+    base = "".join(c if c.isalnum() or c in "_-$" else "_" for c in name) or "_"
+    file_name = base + extension
+    counter = 2
+    while file_name.lower() in used:
+        file_name = f"{base}-{counter}{extension}"
+        counter += 1
+    used.add(file_name.lower())
+    return file_name
+
+def create_parallel_backup(cancel_event=None, progress=None):
+    """
+    Dumps each table with its own mysqldump, DB_DUMP_WORKERS at a time and
+    largest first, into a backup-<timestamp> folder of compressed per-table
+    files plus a manifest (MANIFEST_FILE). Views are dumped last, into one
+    file.
+    
+    With DB_DUMP_CONSISTENCY 'lock' a global read lock is held for the whole
+    dump so the tables match each other; with 'transaction' (or if the lock
+    cannot be taken) each table is dumped from its own consistent snapshot
+    and writes are not blocked.
+    
+    progress() gets bytes_done, files_done/files_total (tables) and parts,
+    the per-table progress ([{name, state, bytes_done, bytes_total}], where
+    bytes_total is the size estimate from information_schema).
+    Returns tuple (success, message or folder)
+    """
+    compression = backup_compression()
+    extension = BACKUP_EXTENSIONS[compression]
+    timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+    backup_dir = os.path.join(BACKUP_DIR, f"backup-{timestamp}")
+    partial_dir = backup_dir + PARTIAL_SUFFIX  # Renamed once complete, so it is never listed half-written
+    workers = max(1, int(DB_DUMP_WORKERS))
+    started = time.monotonic()
+    
+    try:
+        tables, views = list_tables()
+    except FileNotFoundError:
+        error_message = "Error: The 'mysql' executable was not found. Please install MySQL client tools or configure MYSQL_PATH in settings."
+        logging.error(error_message)
+        return False, error_message
+    except subprocess.CalledProcessError as e:
+        error_message = f"Could not list the tables of '{DB_NAME}': {e.stderr.decode('utf-8', errors='replace').strip()}"
+        logging.error(error_message)
+        return False, error_message
+    if not tables and not views:
+        return False, f"No tables found in database '{DB_NAME}'"
+    
+    # One part per table, largest first so a big table does not start last; views need the tables, so they go at the end
+    used = set()
+    parts = [
+        {"name": name, "kind": "table", "file": part_file_name(name, extension, used), "estimate": size}
+        for name, size in tables
+    ]
+    if views:
+        parts.append({"name": "(views)", "kind": "views", "file": part_file_name("_views", extension, used),
+                      "views": views, "estimate": 0})
+    for part in parts:
+        part.update(state="queued", bytes=0, seconds=None, error=None)
+    
+    state_lock = threading.Lock()
+    
+    def report(message=None):
+        """Pass the overall and per-table progress on (call with state_lock held)"""
+        if progress:
+            progress(
+                message=message,
+                bytes_done=sum(part["bytes"] for part in parts),
+                files_done=sum(1 for part in parts if part["state"] == "done"),
+                files_total=len(parts),
+                parts=[
+                    {"name": part["name"], "state": part["state"], "bytes_done": part["bytes"],
+                     "bytes_total": part["estimate"] or None}
+                    for part in parts
+                ]
+            )
+    
+    try:
+        os.makedirs(partial_dir)
+    except OSError as e:
+        logging.error(f"Failed to create backup folder {partial_dir}: {e}")
+        return False, str(e)
+    
+    consistency = DB_DUMP_CONSISTENCY
+    lock = None
+    if consistency == "lock":
+        lock = GlobalReadLock()
+        success, message = lock.acquire()
+        if not success:
+            logging.warning(f"Could not take a global read lock ({message}) - dumping each table from its own snapshot")
+            consistency = "transaction"
+            lock = None
+    dump_args = ['--skip-lock-tables'] if consistency == "lock" else ['--single-transaction']
+    mysqldump_exe = find_executable(MYSQLDUMP_PATH)
+    
+    # Set when the job is cancelled or a table fails - stops the other dumps
+    abort = threading.Event()
+    finished = threading.Event()
+    forward_cancel(cancel_event, abort, finished)
+    
+    def dump_part(part):
+        if abort.is_set():
+            return
+        command = [mysqldump_exe, *connection_args(), *dump_args, DB_NAME]
+        command += ['--no-data', *part["views"]] if part["kind"] == "views" else [part["name"]]
+        with state_lock:
+            part["state"] = "running"
+            report(f"Dumping {part['name']}...")
+        
+        def on_chunk(dumped):
+            with state_lock:
+                part["bytes"] = dumped
+                report()
+        
+        part_started = time.monotonic()
+        try:
+            cancelled, _ = stream_dump(command, os.path.join(partial_dir, part["file"]), compression, abort, on_chunk)
+        except FileNotFoundError:
+            cancelled, part["error"] = False, "The 'mysqldump' executable was not found. Please install MySQL client tools or configure MYSQLDUMP_PATH in settings."
+        except subprocess.CalledProcessError as e:
+            # A killed mysqldump (out of memory) exits without a message
+            cancelled, part["error"] = False, e.stderr.strip() or f"mysqldump exited with code {e.returncode}"
+        except Exception as e:
+            cancelled, part["error"] = False, str(e)
+        
+        with state_lock:
+            part["seconds"] = round(time.monotonic() - part_started, 2)
+            if part["error"]:
+                part["state"] = "failed"
+                abort.set()
+            else:
+                part["state"] = "cancelled" if cancelled else "done"
+            report()
+    
+    logging.info(f"Starting parallel backup of {len(tables)} table(s) from '{DB_NAME}' "
+                 f"({workers} workers, {consistency}, {compression})...")
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-dump") as pool:
+            list(pool.map(dump_part, parts))
+    finally:
+        finished.set()
+        if lock:
+            lock.release()
+    
+    failed = next((part for part in parts if part["error"]), None)
+    if failed or (cancel_event and cancel_event.is_set()):
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        if failed:
+            error_message = f"Backup of {failed['name']} failed with error: {failed['error']}"
+            logging.error(error_message)
+            return False, error_message
+        message = "Database backup cancelled"
+        logging.info(message)
+        return False, message
+    
+    elapsed = time.monotonic() - started
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "version": 1,
+        "database": DB_NAME,
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "compression": compression,
+        "consistency": consistency,
+        "workers": workers,
+        "seconds": round(elapsed, 1),
+        "tables": [
+            {"name": part["name"], "file": part["file"], "bytes": part["bytes"],
+             "size": os.path.getsize(os.path.join(partial_dir, part["file"])), "seconds": part["seconds"]}
+            for part in parts if part["kind"] == "table"
+        ],
+        "views": next(
+            ({"names": part["views"], "file": part["file"]} for part in parts if part["kind"] == "views"), None
+        ),
+    }
+    try:
+        with open(os.path.join(partial_dir, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.rename(partial_dir, backup_dir)
+    except OSError as e:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        error_message = f"An unexpected error occurred: {e}"
+        logging.error(error_message)
+        return False, error_message
+    
+    dumped = sum(part["bytes"] for part in parts)
+    size = sum(table["size"] for table in manifest["tables"])
+    logging.info(f"Successfully created backup: {backup_dir} ({len(tables)} tables in {elapsed:.1f}s, "
+                 f"{dumped / (1024 * 1024):.1f} MB dumped, {size / (1024 * 1024):.1f} MB on disk)")
+    get_catalog().add_backup(BACKUP_TYPE_DATABASE, backup_dir, duration=manifest["seconds"],
+                             source_version=dump_server_version(backup_dir))
+    return True, backup_dir
+
+def read_manifest(backup_dir):
+    """The manifest of a per-table backup folder"""
+    with open(os.path.join(backup_dir, MANIFEST_FILE), 'r') as f:
+        return json.load(f)
+
+def is_table_backup(path):
+    """True for a per-table backup folder (created by create_parallel_backup)"""
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+def read_backup_files(files, on_read=None):
+    """
+    Yields the uncompressed SQL of backup files, in order. on_read(size) is
+    called with the bytes of backup file read since the last call.
+    """
+    for path in files:
+        with open(path, 'rb') as raw, open_backup_reader(path, raw) as f:
+            position = 0
+            while True:
+                chunk = f.read(DUMP_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+                if on_read:
+                    on_read(raw.tell() - position)
+                    position = raw.tell()
+
+def pipe_into_mysql(command, chunks, cancel_event=None, setup=None):
+    """
+    Runs a mysql command with the setup statements (if given) and then the
+    SQL chunks (e.g. from read_backup_files) on its stdin.
+    Returns True if cancelled; raises CalledProcessError if mysql fails.
+    """
+    cancelled = threading.Event()
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr_thread, stderr = read_stderr(process)
+    kill_on_cancel(process, cancel_event, cancelled)
+    try:
+        if setup:
+            process.stdin.write(setup)
+        for chunk in chunks:
+            process.stdin.write(chunk)
+        process.stdin.close()
+    except BrokenPipeError:
+        # mysql stopped reading (or was killed on cancel) - its error is on stderr
+        pass
+    except Exception:
+        process.kill()
+        raise
+    finally:
+        process.wait()
+        stderr_thread.join()
+    if cancelled.is_set():
+        return True
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(
+            process.returncode, command, stderr=b"".join(stderr).decode('utf-8', errors='replace')
+        )
+    return False
+
+def restore_backup(backup_file, cancel_event=None, progress=None):
+    """
+    Restores the database from the specified backup file, or from a per-table
+    backup folder (see restore_table_backup).
+    The restore is stopped if cancel_event is set, leaving the database partly
+    restored; progress(bytes_done=..., bytes_total=...) is called with the
+    bytes of the backup read so far.
     Returns tuple (success, message)
     """
     if not os.path.exists(backup_file):
         return False, f"Backup file not found: {backup_file}"
     
-    # Find mysql executable
-    mysql_exe = find_executable(MYSQL_PATH)
-    
     # Construct mysql command to restore
-    command = [
-        mysql_exe,
-        f'--host={DB_HOST}',
-        f'--user={DB_USER}',
-    ]
-    if DB_PASSWORD:
-        command.append(f'--password={DB_PASSWORD}')
-    
-    command.append(DB_NAME)
+    command = [find_executable(MYSQL_PATH), *connection_args(), DB_NAME]
 
     logging.info(f"Starting restore from backup: {backup_file}")
 
     try:
-        with open(backup_file, 'r', encoding='utf-8') as f:
-            process = subprocess.run(
-                command,
-                stdin=f,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=True
-            )
+        if os.path.isdir(backup_file):
+            return restore_table_backup(backup_file, command, cancel_event, progress)
+        
+        total = os.path.getsize(backup_file)
+        done = 0
+        
+        def on_read(size):
+            nonlocal done
+            done += size
+            progress(bytes_done=done, bytes_total=total)
+        
+        if pipe_into_mysql(command, read_backup_files([backup_file], on_read if progress else None), cancel_event):
+            message = "Database restore cancelled - the database is only partly restored"
+            logging.warning(message)
+            return False, message
         
         success_message = f"Successfully restored from backup: {backup_file}"
         logging.info(success_message)
@@ -137,50 +818,380 @@ def restore_backup(backup_file):
         logging.error(error_message)
         return False, error_message
 
-def delete_old_backups(backup_dir=BACKUP_DIR, keep_count=100):
+def read_create_table(path):
+    """The CREATE TABLE statement at the start of a table's dump file ('' if there is none)"""
+    with open_backup_reader(path) as f:
+        return find_create_table(f.read(CREATE_TABLE_SCAN_SIZE))
+
+def find_create_table(head):
+    """The CREATE TABLE statement in the start of a table's SQL ('' if there is none)"""
+    head = head.decode('utf-8', errors='replace')
+    start = head.find("CREATE TABLE")
+    if start < 0:
+        return ""
+    end = head.find(";\n", start)
+    return head[start:end if end >= 0 else len(head)]
+
+def parse_foreign_keys(table, create_table):
+    """Foreign keys of a table as [(table, constraint, [columns], referenced table, [referenced columns])]"""
+    split_columns = lambda columns: [column.strip().strip('`').replace('``', '`') for column in columns.split(',')]
+    return [
+        (table, name.replace('``', '`'), split_columns(columns), parent.replace('``', '`'), split_columns(parent_columns))
+        for name, columns, schema, parent, parent_columns in FOREIGN_KEY_PATTERN.findall(create_table)
+        if not schema  # Keys into another database are not restored from this backup
+    ]
+
+def dependency_order(tables, foreign_keys):
+    """Tables ordered so the tables they reference come first (cycles and self-references are kept in input order)"""
+    parents = {table: set() for table in tables}
+    for table, _, _, parent, _ in foreign_keys:
+        if parent in parents and parent != table:
+            parents[table].add(parent)
+    ordered, placed = [], set()
+    while len(ordered) < len(tables):
+        ready = [table for table in tables if table not in placed and parents[table] <= placed]
+        if not ready:
+            # A reference cycle - take the next table anyway
+            ready = [next(table for table in tables if table not in placed)]
+        for table in ready:
+            ordered.append(table)
+            placed.add(table)
+    return ordered
+
+def verify_foreign_keys(command, foreign_keys):
+    """
+    Counts the rows that break each foreign key (rows loaded with
+    FOREIGN_KEY_CHECKS off are never re-checked by MySQL).
+    Returns [(table, constraint, referenced table, rows)] for the keys with violations.
+    """
+    if not foreign_keys:
+        return []
+    quote = lambda name: "`" + name.replace("`", "``") + "`"
+    queries = []
+    for table, _, columns, parent, parent_columns in foreign_keys:
+        not_null = " AND ".join(f"c.{quote(column)} IS NOT NULL" for column in columns)
+        matches = " AND ".join(f"p.{quote(p_column)} = c.{quote(column)}" for column, p_column in zip(columns, parent_columns))
+        queries.append(
+            f"SELECT COUNT(*) FROM {quote(table)} c WHERE {not_null} "
+            f"AND NOT EXISTS (SELECT 1 FROM {quote(parent)} p WHERE {matches});"
+        )
+    result = subprocess.run(
+        command[:-1] + ['--batch', '--skip-column-names', '-e', "\n".join(queries), command[-1]],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+    )
+    counts = [int(line) for line in result.stdout.decode('utf-8').split()]
+    return [
+        (table, constraint, parent, rows)
+        for (table, constraint, _, parent, _), rows in zip(foreign_keys, counts) if rows
+    ]
+
+def foreign_key_warning(command, create_tables, restored):
     """
-    Keeps the most recent 'keep_count' .sql backup files in the backup directory,
-    deleting older ones.
+    Checks the foreign keys from and to the restored tables, referenced
+    tables first, since MySQL does not re-check rows loaded with the checks
+    off. create_tables is {table: CREATE TABLE statement} for every table of
+    the backup. Returns a warning for the restore result ('' if every row
+    has its referenced row).
     """
-    # Get all .sql files with their paths
-    backup_files = []
-    for fname in os.listdir(backup_dir):
-        if fname.endswith('.sql'):
-            fpath = os.path.join(backup_dir, fname)
-            try:
-                backup_files.append((fpath, os.path.getmtime(fpath)))
-            except Exception as e:
-                logging.warning(f"Failed to access {fpath}: {e}")
+    foreign_keys = []
+    for table, create_table in create_tables.items():
+        foreign_keys += [key for key in parse_foreign_keys(table, create_table) if key[0] in restored or key[3] in restored]
+    order = {table: index for index, table in enumerate(dependency_order(list(create_tables), foreign_keys))}
+    foreign_keys.sort(key=lambda key: order[key[0]])
+    try:
+        violations = verify_foreign_keys(command, foreign_keys)
+    except subprocess.CalledProcessError as e:
+        return f" - WARNING: foreign keys could not be checked: {e.stderr.decode('utf-8', errors='replace').strip()}"
+    if not violations:
+        return ""
+    details = "; ".join(f"{table}.{constraint} -> {parent}: {rows} row(s)" for table, constraint, parent, rows in violations)
+    return f" - WARNING: rows without a matching referenced row: {details}"
+
+def restore_table_backup(backup_dir, command, cancel_event=None, progress=None, tables=None):
+    """
+    Restores a per-table backup folder (or only the given tables of it) with
+    DB_RESTORE_WORKERS mysql sessions at a time, largest tables first. Each
+    session turns foreign key and unique checks off, so tables load in any
+    order. Once every table is loaded the views are created (on a full
+    restore) and the foreign keys are checked (see foreign_key_warning).
     
-    # Sort files by modification time (newest first)
-    backup_files.sort(key=lambda x: x[1], reverse=True)
+    progress() gets bytes_done/bytes_total (backup bytes read), files_done/
+    files_total (tables) and parts, the per-table progress.
+    Returns tuple (success, message)
+    """
+    manifest = read_manifest(backup_dir)
+    workers = max(1, int(DB_RESTORE_WORKERS))
+    started = time.monotonic()
+    
+    parts = [
+        {"name": table["name"], "path": os.path.join(backup_dir, table["file"]), "state": "queued", "bytes": 0,
+         "size": table.get("size") or os.path.getsize(os.path.join(backup_dir, table["file"])), "error": None}
+        for table in sorted(manifest["tables"], key=lambda table: table.get("bytes", 0), reverse=True)
+        if tables is None or table["name"] in tables
+    ]
+    total = sum(part["size"] for part in parts)
+    state_lock = threading.Lock()
+    
+    def report(message=None):
+        """Pass the overall and per-table progress on (call with state_lock held)"""
+        if progress:
+            progress(
+                message=message,
+                bytes_done=sum(part["bytes"] for part in parts),
+                bytes_total=total,
+                files_done=sum(1 for part in parts if part["state"] == "done"),
+                files_total=len(parts),
+                parts=[
+                    {"name": part["name"], "state": part["state"], "bytes_done": part["bytes"], "bytes_total": part["size"]}
+                    for part in parts
+                ]
+            )
+    
+    # Set when the job is cancelled or a table fails - stops the other sessions
+    abort = threading.Event()
+    finished = threading.Event()
+    forward_cancel(cancel_event, abort, finished)
+    
+    def restore_part(part):
+        if abort.is_set():
+            return
+        with state_lock:
+            part["state"] = "running"
+            report(f"Restoring {part['name']}...")
+        
+        def on_read(size):
+            with state_lock:
+                part["bytes"] += size
+                report()
+        
+        try:
+            cancelled = pipe_into_mysql(command, read_backup_files([part["path"]], on_read), abort, setup=RESTORE_SESSION_SETUP)
+        except FileNotFoundError:
+            cancelled, part["error"] = False, "The 'mysql' executable was not found. Please install MySQL client tools or configure MYSQL_PATH in settings."
+        except subprocess.CalledProcessError as e:
+            # A killed mysql client exits without a message
+            cancelled, part["error"] = False, e.stderr.strip() or f"mysql exited with code {e.returncode}"
+        except Exception as e:
+            cancelled, part["error"] = False, str(e)
+        
+        with state_lock:
+            if part["error"]:
+                part["state"] = "failed"
+                abort.set()
+            else:
+                part["state"] = "cancelled" if cancelled else "done"
+            report()
+    
+    logging.info(f"Restoring {len(parts)} table(s) from {backup_dir} with {workers} workers...")
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-restore") as pool:
+            list(pool.map(restore_part, parts))
+    finally:
+        finished.set()
     
-    # Delete files beyond the keep_count
+    failed = next((part for part in parts if part["error"]), None)
+    if failed:
+        error_message = f"Restore of {failed['name']} failed with error: {failed['error']}"
+        logging.error(error_message)
+        return False, error_message
+    if cancel_event and cancel_event.is_set():
+        message = "Database restore cancelled - the database is only partly restored"
+        logging.warning(message)
+        return False, message
+    
+    # Views select from the tables, so they come once all tables exist
+    if manifest.get("views") and tables is None:
+        with state_lock:
+            report("Restoring views...")
+        if pipe_into_mysql(command, read_backup_files([os.path.join(backup_dir, manifest["views"]["file"])]), cancel_event):
+            message = "Database restore cancelled - the database is only partly restored"
+            logging.warning(message)
+            return False, message
+    
+    with state_lock:
+        report("Checking foreign keys...")
+    create_tables = {
+        table["name"]: read_create_table(os.path.join(backup_dir, table["file"])) for table in manifest["tables"]
+    }
+    warning = foreign_key_warning(command, create_tables, {part["name"] for part in parts})
+    
+    elapsed = time.monotonic() - started
+    message = f"Successfully restored {len(parts)} tables from backup: {backup_dir} in {elapsed:.1f}s{warning}"
+    if warning:
+        logging.warning(message)
+    else:
+        logging.info(message)
+    return True, message
+
+def restore_indexed_tables(backup_file, command, tables, cancel_event=None, progress=None):
+    """
+    Restores tables from their sections of an indexed backup file, after the
+    dump's header (character set, checks off) and before its footer, in one
+    mysql session. progress() gets bytes_done/bytes_total (bytes of SQL) and
+    files_done/files_total (tables).
+    Returns tuple (success, message)
+    """
+    index = read_index(backup_file)
+    compression = index["compression"]
+    started = time.monotonic()
+    table_sections = {section["name"]: section for section in index["sections"] if section["kind"] == "table"}
+    selected = [table_sections[table] for table in tables]
+    total = sum(section["length"] for section in selected)
+    
+    def chunks():
+        yield from read_sections(backup_file, compression, [section for section in index["sections"] if section["kind"] == "header"])
+        done = 0
+        for number, section in enumerate(selected):
+            if progress:
+                progress(f"Restoring {section['name']}...", bytes_done=done, bytes_total=total, files_done=number, files_total=len(selected))
+            for chunk in read_sections(backup_file, compression, [section]):
+                yield chunk
+                done += len(chunk)
+                if progress:
+                    progress(bytes_done=done)
+        yield from read_sections(backup_file, compression, [section for section in index["sections"] if section["kind"] == "footer"])
+    
+    logging.info(f"Restoring {len(selected)} table(s) from {backup_file}...")
+    if pipe_into_mysql(command, chunks(), cancel_event):
+        message = "Table restore cancelled - the tables may be only partly restored"
+        logging.warning(message)
+        return False, message
+    
+    if progress:
+        progress("Checking foreign keys...", files_done=len(selected))
+    create_tables = {
+        name: find_create_table(b"".join(read_sections(backup_file, compression, [section], limit=CREATE_TABLE_SCAN_SIZE)))
+        for name, section in table_sections.items()
+    }
+    warning = foreign_key_warning(command, create_tables, set(tables))
+    
+    elapsed = time.monotonic() - started
+    message = f"Successfully restored {', '.join(tables)} from backup: {backup_file} in {elapsed:.1f}s{warning}"
+    if warning:
+        logging.warning(message)
+    else:
+        logging.info(message)
+    return True, message
+
+def restore_tables(backup_file, tables, cancel_event=None, progress=None):
+    """
+    Restores only the given tables from a backup, leaving the rest of the
+    database as it is: from a per-table backup folder (see
+    restore_table_backup), or from a backup file's table index (see
+    restore_indexed_tables), reading only those tables' part of the file.
+    Returns tuple (success, message)
+    """
+    if not os.path.exists(backup_file):
+        return False, f"Backup file not found: {backup_file}"
+    if not tables:
+        return False, "No tables selected"
+    
+    success, available = get_backup_tables(backup_file)
+    if not success:
+        return False, available
+    missing = [table for table in tables if table not in {entry["name"] for entry in available}]
+    if missing:
+        return False, f"Not in this backup: {', '.join(missing)}"
+    
+    command = [find_executable(MYSQL_PATH), *connection_args(), DB_NAME]
+    
+    try:
+        if os.path.isdir(backup_file):
+            return restore_table_backup(backup_file, command, cancel_event, progress, tables=set(tables))
+        return restore_indexed_tables(backup_file, command, tables, cancel_event, progress)
+    
+    except FileNotFoundError:
+        error_message = f"Error: The 'mysql' executable was not found. Please install MySQL client tools or configure MYSQL_PATH in settings."
+        logging.error(error_message)
+        return False, error_message
+    except subprocess.CalledProcessError as e:
+        error_message = f"Restore failed with error: {e.stderr}"
+        logging.error(error_message)
+        return False, error_message
+    except Exception as e:
+        error_message = f"An unexpected error occurred: {e}"
+        logging.error(error_message)
+        return False, error_message
+
+def get_backup_tables(backup_file):
+    """
+    The tables of a backup that can be restored on their own, as
+    [{"name", "bytes"}] (bytes of SQL) sorted by name.
+    Returns tuple (success, tables or message)
+    """
+    try:
+        if os.path.isdir(backup_file):
+            tables = [{"name": table["name"], "bytes": table.get("bytes", 0)} for table in read_manifest(backup_file)["tables"]]
+        else:
+            index = read_index(backup_file)
+            if index is None:
+                return False, f"{os.path.basename(backup_file)} has no table index (made by an older version) - restore the whole backup instead"
+            tables = [{"name": section["name"], "bytes": section["length"]} for section in index["sections"] if section["kind"] == "table"]
+    except Exception as e:
+        return False, f"Failed to read the tables of {backup_file}: {e}"
+    return True, sorted(tables, key=lambda table: table["name"])
+
+def preview_backup_table(backup_file, table, size=PREVIEW_SIZE):
+    """
+    The start of a table's SQL in a backup (its CREATE TABLE and first rows)
+    without restoring it, with long lines cut.
+    Returns tuple (success, text or message)
+    """
+    try:
+        if os.path.isdir(backup_file):
+            entry = next((entry for entry in read_manifest(backup_file)["tables"] if entry["name"] == table), None)
+            if entry is None:
+                return False, f"Not in this backup: {table}"
+            with open_backup_reader(os.path.join(backup_file, entry["file"])) as f:
+                head = f.read(size)
+        else:
+            index = read_index(backup_file)
+            if index is None:
+                return False, f"{os.path.basename(backup_file)} has no table index (made by an older version)"
+            section = next((section for section in index["sections"] if section["kind"] == "table" and section["name"] == table), None)
+            if section is None:
+                return False, f"Not in this backup: {table}"
+            head = b"".join(read_sections(backup_file, index["compression"], [section], limit=size))
+    except Exception as e:
+        return False, f"Failed to read {table} from {backup_file}: {e}"
+    
+    lines = head.decode('utf-8', errors='replace').split("\n")
+    return True, "\n".join(line if len(line) <= PREVIEW_LINE_LENGTH else line[:PREVIEW_LINE_LENGTH] + " ..." for line in lines)
+
+def delete_old_backups(backup_dir=BACKUP_DIR, keep_count=100):
+    """
+    Keeps the most recent 'keep_count' backups (.sql, .sql.gz and .sql.zst
+    files and per-table backup folders) in the backup directory, deleting
+    older ones.
+    """
+    # Backups beyond keep_count, from the catalog (newest first)
+    catalog = get_catalog()
+    old_backups = catalog.list_backups(BACKUP_TYPE_DATABASE, backup_dir, is_database_backup, offset=keep_count)
+    
+    # Delete them, then drop them from the catalog in one go
     deleted = 0
-    for fpath, _ in backup_files[keep_count:]:
+    removed = []
+    for fpath, _, _ in old_backups:
         try:
-            os.remove(fpath)
+            if os.path.isdir(fpath):
+                shutil.rmtree(fpath)
+            else:
+                remove_backup_file(fpath)
             deleted += 1
             logging.info(f"Deleted old backup: {fpath}")
+        except FileNotFoundError:
+            pass  # Already deleted outside the application
         except Exception as e:
             logging.warning(f"Failed to delete {fpath}: {e}")
+            continue
+        removed.append(fpath)
+    catalog.remove_backups(removed)
     
     return deleted
 
-def get_backup_files():
+def get_backup_files(offset=0, limit=None):
     """
-    Returns a list of backup files sorted by date (newest first)
+    Returns a list of backups (files and per-table backup folders) sorted by date (newest first),
+    from the backup catalog - optionally only 'limit' of them starting at 'offset'
     """
-    backup_files = []
-    if os.path.exists(BACKUP_DIR):
-        for fname in os.listdir(BACKUP_DIR):
-            if fname.endswith('.sql'):
-                fpath = os.path.join(BACKUP_DIR, fname)
-                try:
-                    backup_files.append((fpath, os.path.getmtime(fpath), fname))
-                except Exception as e:
-                    logging.warning(f"Failed to access {fpath}: {e}")
-    
-    # Sort files by modification time (newest first)
-    backup_files.sort(key=lambda x: x[1], reverse=True)
-    return backup_files
+    return get_catalog().list_backups(BACKUP_TYPE_DATABASE, BACKUP_DIR, is_database_backup, offset, limit)
@@ -0,0 +1,345 @@
+import time
+import logging
+import itertools
+import threading
+from collections import OrderedDict, deque
+
+JOB_WORKERS = 3  # Worker threads - what actually runs together is limited per resource class
+JOB_HISTORY = 50  # Finished jobs kept for JOB_LIST / JOB_STATUS
+JOB_UPDATE_INTERVAL = 0.5  # Minimum seconds between progress notifications for one job
+WAIT_SAMPLES = 50  # Recent queue wait times kept for queue_stats()
+
+# Resource classes a job occupies while it runs
+RESOURCE_DISK_WRITE = "disk_write"
+RESOURCE_NETWORK = "network"
+RESOURCE_CPU = "cpu"
+
+# Jobs that may use a resource class at the same time
+RESOURCE_LIMITS = {
+    RESOURCE_DISK_WRITE: 1,  # Zips, dumps and restores compete for the same disk
+    RESOURCE_NETWORK: 2,
+    RESOURCE_CPU: 2,
+}
+
+# Priorities - lower runs first when jobs wait for the same resource
+PRIORITY_RESTORE = 0
+PRIORITY_BACKUP = 1
+PRIORITY_UPDATE = 2
+
+# Job types
+JOB_DATABASE_BACKUP = "database_backup"
+JOB_SERVER_BACKUP = "server_backup"
+JOB_TXADMIN_UPDATE = "txadmin_update"
+JOB_DATABASE_RESTORE = "database_restore"
+JOB_SERVER_RESTORE = "server_restore"
+JOB_TXADMIN_RESTORE = "txadmin_restore"
+
+# {job type: (label, priority, resource classes)}
+JOB_TYPES = {
+    JOB_DATABASE_RESTORE: ("Database restore", PRIORITY_RESTORE, (RESOURCE_DISK_WRITE,)),
+    JOB_SERVER_RESTORE: ("Server restore", PRIORITY_RESTORE, (RESOURCE_DISK_WRITE,)),
+    JOB_TXADMIN_RESTORE: ("TxAdmin restore", PRIORITY_RESTORE, (RESOURCE_DISK_WRITE,)),
+    JOB_DATABASE_BACKUP: ("Database backup", PRIORITY_BACKUP, (RESOURCE_DISK_WRITE,)),
+    JOB_SERVER_BACKUP: ("Server backup", PRIORITY_BACKUP, (RESOURCE_DISK_WRITE, RESOURCE_CPU)),
+    JOB_TXADMIN_UPDATE: ("TxAdmin update", PRIORITY_UPDATE, (RESOURCE_NETWORK, RESOURCE_DISK_WRITE)),
+}
+
+# Job states
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_SUCCEEDED = "succeeded"
+STATE_FAILED = "failed"
+STATE_CANCELLED = "cancelled"
+ACTIVE_STATES = (STATE_QUEUED, STATE_RUNNING)
+
+class Job:
+    """
+    One long operation. The job function receives the Job and returns
+    (success, message). It reports progress through update() and should
+    check cancel_event at safe points.
+    """
+    
+    def __init__(self, job_id, job_type, func, description=None):
+        label, priority, resources = JOB_TYPES.get(job_type, (job_type, PRIORITY_BACKUP, ()))
+        self.id = job_id
+        self.type = job_type
+        self.func = func
+        self.description = description or label
+        self.priority = priority
+        self.resources = resources
+        self.state = STATE_QUEUED
+        self.message = ""  # Latest progress line, or the result once finished
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.bytes_done = 0
+        self.bytes_total = None  # None when the size is not known in advance
+        self.files_done = 0
+        self.files_total = None
+        self.parts = None  # [{name, state, bytes_done, bytes_total}] for jobs made of parallel parts (e.g. one per table)
+        self.cancel_event = threading.Event()
+        self.on_change = None  # Set by JobManager
+        self.last_notified = 0
+    
+    @property
+    def active(self):
+        return self.state in ACTIVE_STATES
+    
+    def update(self, message=None, **fields):
+        """Record progress (message, bytes_done, bytes_total, files_done, files_total, parts)"""
+        if message is not None:
+            self.message = message
+        for key, value in fields.items():
+            if key in ("bytes_done", "bytes_total", "files_done", "files_total", "parts"):
+                setattr(self, key, value)
+        
+        # Progress can be reported per file or per chunk - notify at most every JOB_UPDATE_INTERVAL
+        now = time.monotonic()
+        if now - self.last_notified >= JOB_UPDATE_INTERVAL:
+            self.last_notified = now
+            self._notify()
+    
+    def fraction(self):
+        """Completed fraction (0-1) from bytes or files, or None when the total is unknown"""
+        if self.state == STATE_SUCCEEDED:
+            return 1.0
+        if self.bytes_total:
+            return min(1.0, self.bytes_done / self.bytes_total)
+        if self.files_total:
+            return min(1.0, self.files_done / self.files_total)
+        return None
+    
+    def eta(self):
+        """Estimated seconds until the job finishes, or None if it cannot be estimated yet"""
+        fraction = self.fraction()
+        if self.state != STATE_RUNNING or not fraction or not self.started_at:
+            return None
+        elapsed = time.time() - self.started_at
+        return elapsed * (1 - fraction) / fraction
+    
+    def wait_time(self):
+        """Seconds spent (or so far) waiting in the queue"""
+        return (self.started_at or self.finished_at or time.time()) - self.created_at
+    
+    def as_dict(self):
+        """Serializable job status for remote clients"""
+        fraction = self.fraction()
+        eta = self.eta()
+        return {
+            "job_id": self.id,
+            "type": self.type,
+            "description": self.description,
+            "state": self.state,
+            "priority": self.priority,
+            "resources": list(self.resources),
+            "message": self.message,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "bytes_done": self.bytes_done,
+            "bytes_total": self.bytes_total,
+            "files_done": self.files_done,
+            "files_total": self.files_total,
+            "parts": self.parts,
+            "percent": round(fraction * 100, 1) if fraction is not None else None,
+            "eta": round(eta) if eta is not None else None,
+            "wait": round(self.wait_time(), 1),
+        }
+    
+    def _notify(self):
+        if self.on_change:
+            try:
+                self.on_change(self)
+            except Exception as e:
+                logging.error(f"Error reporting job {self.id} progress: {e}")
+
+class JobManager:
+    """
+    Runs long operations on a small pool of worker threads. Each job gets
+    an ID that can be polled and cancelled, and only one job of each type
+    can be queued or running at a time.
+    
+    Jobs occupy resource classes while they run, and no more than
+    RESOURCE_LIMITS of them share a class - so a manual server backup
+    waits for the scheduled one instead of competing for the disk. A free
+    worker takes the highest priority queued job whose classes are all
+    available (restores before backups before updates, oldest first).
+    """
+    
+    def __init__(self, workers=JOB_WORKERS, on_change=None, limits=None):
+        self.workers = workers
+        self.on_change = on_change  # Called with a Job when its state or progress changes
+        self.limits = dict(RESOURCE_LIMITS, **(limits or {}))
+        for resource, limit in self.limits.items():
+            # From settings.json - a limit below 1 would leave jobs of that class queued forever
+            if not isinstance(limit, int) or limit < 1:
+                fallback = RESOURCE_LIMITS.get(resource, 1)
+                logging.warning(f"Invalid resource limit {limit!r} for {resource}, using {fallback}")
+                self.limits[resource] = fallback
+        self.in_use = {resource: 0 for resource in self.limits}
+        self.jobs = OrderedDict()  # {job_id: Job}, oldest first
+        self.pending = []  # Queued jobs in submission order
+        self.waits = deque(maxlen=WAIT_SAMPLES)  # Recent queue wait times in seconds
+        self.condition = threading.Condition()
+        self.ids = itertools.count(1)
+        self.threads = []
+        self.running = False
+    
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{i + 1}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+    
+    def stop(self):
+        """Cancel every queued and running job and stop the workers"""
+        with self.condition:
+            self.running = False
+            for job in self.jobs.values():
+                if job.active:
+                    job.cancel_event.set()
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join(timeout=2)
+        self.threads = []
+    
+    def submit(self, job_type, func, description=None):
+        """
+        Queue func(job) -> (success, message) as a new job.
+        Returns (True, job), or (False, message) if a job of the same type is already queued or running.
+        """
+        with self.condition:
+            for job in self.jobs.values():
+                if job.type == job_type and job.active:
+                    return False, f"{job.description} is already {job.state} (job {job.id})"
+            
+            job = Job(next(self.ids), job_type, func, description)
+            job.on_change = self.on_change
+            self.jobs[job.id] = job
+            self.pending.append(job)
+            self.condition.notify()
+        
+        logging.info(f"Queued job {job.id}: {job.description}")
+        job._notify()
+        return True, job
+    
+    def get(self, job_id):
+        with self.condition:
+            return self.jobs.get(job_id)
+    
+    def latest(self, job_type):
+        """The most recent job of this type, or None"""
+        with self.condition:
+            return next((job for job in reversed(self.jobs.values()) if job.type == job_type), None)
+    
+    def list_jobs(self):
+        """All known jobs, newest first"""
+        with self.condition:
+            return list(reversed(self.jobs.values()))
+    
+    def queue_stats(self):
+        """Queue depth, resource class usage and recent wait times (for remote clients)"""
+        with self.condition:
+            now = time.time()
+            waits = list(self.waits)
+            return {
+                "depth": len(self.pending),
+                "longest_wait": round(max((now - job.created_at for job in self.pending), default=0), 1),
+                "average_wait": round(sum(waits) / len(waits), 1) if waits else 0,
+                "max_recent_wait": round(max(waits, default=0), 1),
+                "resources": {
+                    resource: {
+                        "running": self.in_use[resource],
+                        "limit": limit,
+                        "queued": sum(1 for job in self.pending if resource in job.resources)
+                    }
+                    for resource, limit in self.limits.items()
+                }
+            }
+    
+    def cancel(self, job_id):
+        """
+        Cancel a job. Queued jobs are removed at once; running jobs stop at
+        their next cancellation point.
+        Returns tuple (success, message)
+        """
+        with self.condition:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return False, f"Unknown job: {job_id}"
+            if not job.active:
+                return False, f"Job {job_id} already {job.state}"
+            
+            job.cancel_event.set()
+            if job.state == STATE_QUEUED:
+                self.pending.remove(job)
+                self._finish(job, STATE_CANCELLED, "Cancelled before it started")
+                message = f"Job {job_id} cancelled"
+            else:
+                message = f"Cancelling job {job_id}"
+        
+        job._notify()
+        logging.info(message)
+        return True, message
+    
+    def _next_runnable(self):
+        """Highest priority queued job whose resource classes are free (call with the condition held)"""
+        for job in sorted(self.pending, key=lambda job: job.priority):
+            if all(self.in_use.get(resource, 0) < self.limits.get(resource, 1) for resource in job.resources):
+                return job
+        return None
+    
+    def _worker(self):
+        while True:
+            with self.condition:
+                job = None
+                while self.running:
+                    job = self._next_runnable()
+                    if job:
+                        break
+                    self.condition.wait()
+                if not self.running:
+                    return
+                self.pending.remove(job)
+                for resource in job.resources:
+                    self.in_use[resource] = self.in_use.get(resource, 0) + 1
+                job.state = STATE_RUNNING
+                job.started_at = time.time()
+                self.waits.append(job.started_at - job.created_at)
+            
+            logging.info(f"Started job {job.id}: {job.description}")
+            job._notify()
+            
+            try:
+                success, message = job.func(job)
+            except Exception as e:
+                logging.error(f"Job {job.id} ({job.description}) crashed: {e}", exc_info=True)
+                success, message = False, str(e)
+            
+            if job.cancel_event.is_set() and not success:
+                state = STATE_CANCELLED
+            else:
+                state = STATE_SUCCEEDED if success else STATE_FAILED
+            
+            with self.condition:
+                for resource in job.resources:
+                    self.in_use[resource] -= 1
+                self._finish(job, state, message)
+                # Freed resource classes may let a waiting job start
+                self.condition.notify_all()
+            logging.info(f"Job {job.id} ({job.description}) {state}: {message}")
+            job._notify()
+    
+    def _finish(self, job, state, message):
+        """Mark a job finished and forget the oldest finished jobs (call with the condition held)"""
+        job.state = state
+        job.message = message
+        job.finished_at = time.time()
+        
+        finished = [job_id for job_id, known in self.jobs.items() if not known.active]
+        for job_id in finished[:max(0, len(finished) - JOB_HISTORY)]:
+            del self.jobs[job_id]
@@ -17,7 +17,7 @@ from remote_app.remote_tabs import (
     RemoteTxAdminUpdateTab
 )
 from remote_app.resource_monitor_tab import ResourceMonitorTab
-from remote_protocol import RemoteClient, RemoteMessage, STATUS_OK, STATUS_ERROR
+from remote_protocol import RemoteClient, RemoteMessage, STATUS_OK, STATUS_ERROR, decompress_payload
 from remote_settings import load_settings, save_settings
 from update import check_for_updates, CURRENT_VERSION
 
@@ -35,6 +35,7 @@ class RemoteBackupApp:
         self.client = None
         self.connected = False
         self.running = True
+        self.session_tickets = {}  # {(ip, port, auth_key): ticket} so reconnects skip the key check
         
         # Load settings
         self.settings = load_settings()
@@ -139,6 +140,8 @@ class RemoteBackupApp:
         self.tabs['connection'].connect_btn.config(state=tk.DISABLED)
         self.log_message(f"Connecting to {ip}:{port}...")
         
+        server_key = (ip, port, auth_key)
+        
         # Connect in separate thread
         def do_connect():
             try:
@@ -147,9 +150,11 @@ class RemoteBackupApp:
                     ip, 
                     port, 
                     auth_key, 
-                    message_handler=self.handle_broadcast_message
+                    message_handler=self.handle_broadcast_message,
+                    session_ticket=self.session_tickets.get(server_key)
                 )
                 if self.client.connect():
+                    self.session_tickets[server_key] = self.client.session_ticket
                     self.connected = True
                     self.root.after(0, self.on_connected)
                 else:
@@ -236,30 +241,26 @@ class RemoteBackupApp:
         """Request initial data from server"""
         def fetch_data():
             try:
-                # Get server status
-                response = self.client.send_command("GET_SERVER_STATUS")
-                if response:
-                    self.root.after(0, lambda r=response: self.handle_response(r))
-                
-                # Get database backups
-                response = self.client.send_command("GET_DATABASE_BACKUPS")
-                if response:
+                # One round trip for the whole dashboard on servers that support it
+                response = self.client.send_command("GET_SNAPSHOT")
+                if response and response.status == STATUS_OK:
                     self.root.after(0, lambda r=response: self.handle_response(r))
+                    return
                 
-                # Get server backups
-                response = self.client.send_command("GET_SERVER_BACKUPS")
-                if response:
-                    self.root.after(0, lambda r=response: self.handle_response(r))
-                
-                # Get TxAdmin backups
-                response = self.client.send_command("GET_TXADMIN_BACKUPS")
-                if response:
-                    self.root.after(0, lambda r=response: self.handle_response(r))
+                # Older servers: pipeline the individual requests, then collect the replies
+                commands = [
+                    "GET_SERVER_STATUS",
+                    "GET_DATABASE_BACKUPS",
+                    "GET_SERVER_BACKUPS",
+                    "GET_TXADMIN_BACKUPS",
+                    "GET_NEXT_BACKUP_TIME",
+                ]
+                pending = [(command, self.client.send_command_async(command)) for command in commands]
                 
-                # Get next backup time
-                response = self.client.send_command("GET_NEXT_BACKUP_TIME")
-                if response:
-                    self.root.after(0, lambda r=response: self.handle_response(r))
+                for command, future in pending:
+                    response = self.client.wait_for_reply(future, command)
+                    if response:
+                        self.root.after(0, lambda r=response: self.handle_response(r))
                     
             except Exception as e:
                 self.log_message(f"Error fetching initial data: {e}")
@@ -314,13 +315,20 @@ class RemoteBackupApp:
         if message.command == "PING":
             return
         
-        if message.command == "LOG_MESSAGE":
+        if message.command == "SNAPSHOT":
+            self.apply_snapshot(decompress_payload(message.data))
+        
+        elif message.command == "LOG_MESSAGE":
             # Remote log message - DO NOT add [Remote] prefix since it's already in the message
             msg = message.data.get('message', '')
             # Only log to activity log, not to connection log
             from app.common import log_message
             log_message(self.log_text, msg)
         
+        elif message.command == "LOG_BATCH":
+            # Many server log lines at once - one widget update for the whole batch
+            self.show_log_lines(message.data.get('lines', []))
+        
         elif message.command == "SERVER_STATUS":
             # Update server status
             status = message.data.get('status', 'UNKNOWN')
@@ -396,11 +404,45 @@ class RemoteBackupApp:
         
         elif message.command == "RESOURCE_STATS":
             # Update resource monitor with new stats
-            stats = message.data
-            if hasattr(self.tabs.get('resource_monitor'), 'update_stats'):
-                self.tabs['resource_monitor'].update_stats(stats)
+            if hasattr(self.tabs.get('resource_monitor'), 'apply_stats_message'):
+                self.tabs['resource_monitor'].apply_stats_message(message.data, message.timestamp)
             logging.debug("Updated resource stats")
     
+    def apply_snapshot(self, snapshot):
+        """Populate every tab from a GET_SNAPSHOT reply"""
+        # Replay the state through the same handlers used for individual updates
+        sections = [
+            ("server_status", "SERVER_STATUS", lambda d: d),
+            ("database_backups", "DATABASE_BACKUPS", lambda d: {"backups": d}),
+            ("server_backups", "SERVER_BACKUPS", lambda d: {"backups": d}),
+            ("txadmin_backups", "TXADMIN_BACKUPS", lambda d: {"backups": d}),
+            ("next_backup_time", "NEXT_BACKUP_TIME", lambda d: d),
+        ]
+        for key, command, wrap in sections:
+            if snapshot.get(key) is not None:
+                self.handle_response(RemoteMessage(command=command, status=STATUS_OK, data=wrap(snapshot[key])))
+        
+        if snapshot.get("resource_history") and 'resource_monitor' in self.tabs:
+            self.tabs['resource_monitor'].load_history(snapshot["resource_history"])
+        
+        self.show_log_lines(snapshot.get("recent_logs") or [])
+        
+        logging.info("Applied server snapshot")
+    
+    def show_log_lines(self, lines):
+        """Add server log lines ({"message", "timestamp"} dicts) to the activity log in one update"""
+        if not lines:
+            return
+        from app.common import log_messages
+        entries = []
+        for line in lines:
+            try:
+                timestamp = datetime.fromisoformat(line["timestamp"]).strftime('%H:%M:%S')
+            except (KeyError, TypeError, ValueError):
+                timestamp = "--:--:--"
+            entries.append((timestamp, line.get("message", "")))
+        log_messages(self.log_text, entries)
+    
     def log_message(self, message):
         """Add a message to the log display"""
         from app.common import log_message
@@ -4,6 +4,7 @@ from datetime import datetime
 from collections import deque
 
 from config import COLORS
+from remote_protocol import StatsReconstructor
 
 class ResourceMonitorTab:
     """Remote resource monitoring tab with live graphs"""
@@ -24,6 +25,7 @@ class ResourceMonitorTab:
         
         # Current stats
         self.current_stats = None
+        self.stats_stream = StatsReconstructor()  # Rebuilds full stats from keyframes and deltas
         self.worst_status = '⚫'
         
         # Create tab contents
@@ -149,19 +151,48 @@ class ResourceMonitorTab:
         self.network_canvas = tk.Canvas(network_frame, bg='#1e293b', height=150, highlightthickness=0)
         self.network_canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
     
+    def apply_stats_message(self, data, timestamp=None):
+        """Handle a RESOURCE_STATS payload: full stats, or a keyframe/delta to rebuild them from"""
+        stats = self.stats_stream.apply(data, timestamp)
+        if stats:
+            self.update_stats(stats)
+    
     def update_stats(self, stats):
         """Update display with new stats"""
         if not stats:
             return
         
-        self.current_stats = stats
-        
         # Update history
         self.cpu_history.append(stats['cpu_percent'])
         self.ram_history.append(stats['ram_percent'])
         self.disk_history.append(stats['disk_percent'])
         self.network_history.append(stats['network_rate_mbps'])
         
+        self.show_stats(stats)
+    
+    def load_history(self, history):
+        """Replace graph history with the server's recorded samples (from a snapshot)"""
+        if not history:
+            return
+        
+        self.cpu_history.clear()
+        self.cpu_history.extend(history.get('cpu_percent', []))
+        self.ram_history.clear()
+        self.ram_history.extend(history.get('ram_percent', []))
+        self.disk_history.clear()
+        self.disk_history.extend(history.get('disk_percent', []))
+        self.network_history.clear()
+        self.network_history.extend(history.get('network_rate_mbps', []))
+        
+        if history.get('latest'):
+            self.show_stats(history['latest'])
+        else:
+            self.draw_graphs()
+    
+    def show_stats(self, stats):
+        """Update labels, indicators and graphs for the given stats"""
+        self.current_stats = stats
+        
         # Update labels
         self.cpu_label.config(text=f"{stats['cpu_percent']}%")
         self.ram_label.config(text=f"{stats['ram_percent']}% ({stats['ram_used_gb']:.1f} / {stats['ram_total_gb']:.1f} GB)")
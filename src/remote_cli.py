@@ -0,0 +1,595 @@
+"""
+Command-line remote client for the FIVEM & REDM Server Controller.
+
+Drives the controller's remote control server without the GUI, for cron
+jobs, CI and scripts. Connection settings come from the options, then the
+CONTROLLER_HOST / CONTROLLER_PORT / CONTROLLER_AUTH_KEY environment
+variables, then the Remote Client's saved connection (remote_config.json).
+
+Commands:
+    status                     server status, next backup and job queue
+    backup-db [--wait]         queue a database backup
+    backup-server [--wait]     queue a server backup
+    tables BACKUP              tables that can be restored on their own from a database backup
+    preview BACKUP TABLE       the start of a table's SQL in a database backup
+    restore-tables BACKUP TABLE... [--wait]
+                               restore only these tables from a database backup
+    restart                    restart FXServer
+    jobs                       list recent jobs
+    cancel JOB_ID              cancel a queued or running job
+    tail-logs [-n N] [-f]      recent activity log lines (-f keeps following)
+    stats [-f]                 CPU, RAM, disk and network usage (-f keeps following)
+    batch [FILE]               run one command per line from FILE (or stdin)
+                               over a single connection, pipelined
+
+Usage (from the src folder):
+    python -m remote_cli [--host HOST] [--port PORT] [--json] COMMAND [options]
+    (the connection and output options can also follow the command)
+
+Exit status: 0 success, 1 a command or job failed, 2 usage error,
+3 could not connect or authenticate.
+"""
+import os
+import sys
+import json
+import time
+import shlex
+import logging
+import argparse
+import threading
+from collections import deque
+
+from remote_protocol import (
+    RemoteClient, StatsReconstructor, decompress_payload, DEFAULT_PORT, COMMAND_TIMEOUT, STATUS_OK,
+    TOPIC_LOGS, TOPIC_RESOURCES, TOPIC_PROGRESS, CMD_SUBSCRIBE, CMD_UNSUBSCRIBE, CMD_LOG_MESSAGE,
+    CMD_LOG_BATCH, CMD_RESOURCE_STATS, CMD_JOB_LIST, CMD_JOB_STATUS, CMD_JOB_CANCEL, CMD_JOB_UPDATE,
+    CMD_GET_DB_BACKUP_TABLES, CMD_PREVIEW_DB_TABLE, CMD_RESTORE_DB_TABLES
+)
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_CONNECTION = 3
+
+JOB_POLL_INTERVAL = 10  # Seconds between JOB_STATUS polls while waiting (JOB_UPDATE broadcasts may be dropped)
+EVENT_BACKLOG = 1000  # Broadcasts kept per command until a command reads them
+FINISHED_JOB_STATES = ("succeeded", "failed", "cancelled")
+
+class UsageError(Exception):
+    """A command line (or batch line) that cannot be run"""
+
+class CommandParser(argparse.ArgumentParser):
+    """Raise instead of exiting, so one bad batch line does not end the batch"""
+    
+    def error(self, message):
+        raise UsageError(f"{self.prog}: {message}")
+
+class RemoteSession:
+    """
+    One authenticated connection shared by every command of an invocation.
+    Broadcasts the commands need (log lines, stats, job updates) are kept
+    per command until read with next_event().
+    """
+    
+    def __init__(self, host, port, auth_key, timeout=COMMAND_TIMEOUT):
+        self.timeout = timeout
+        self.client = RemoteClient(host, port, auth_key, message_handler=self._on_broadcast)
+        self.events = {}  # {command: deque of RemoteMessage}
+        self.condition = threading.Condition()
+        self.disconnected = None  # Reason, once the connection is gone
+    
+    def connect(self):
+        """Connect and stop all broadcasts until a command subscribes. Returns tuple (success, message)"""
+        if not self.client.connect():
+            return False, f"Could not connect to {self.client.host}:{self.client.port} (see log for details)"
+        # Nothing to wait for - the reply is routed to a future nobody reads
+        self.client.send_command_async(CMD_UNSUBSCRIBE, {"topics": ["*"]})
+        return True, f"Connected to {self.client.host}:{self.client.port}"
+    
+    def close(self):
+        self.client.disconnect()
+    
+    def send(self, command, data=None):
+        """Send a command without waiting (pipelined). Returns a Future for the reply."""
+        return self.client.send_command_async(command, data)
+    
+    def reply(self, future, command):
+        """Wait for a reply sent with send(); None on timeout or lost connection"""
+        return self.client.wait_for_reply(future, command, self.timeout)
+    
+    def _on_broadcast(self, message):
+        with self.condition:
+            if message.command == "DISCONNECT":
+                self.disconnected = message.message or "Connection lost"
+            else:
+                self.events.setdefault(message.command, deque(maxlen=EVENT_BACKLOG)).append(message)
+            self.condition.notify_all()
+    
+    def next_event(self, commands, timeout=None):
+        """Next broadcast of one of these commands, or None on timeout or disconnect"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while True:
+                for command in commands:
+                    if self.events.get(command):
+                        return self.events[command].popleft()
+                if self.disconnected:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+
+class Output:
+    """Prints results as text, or as one JSON object per line with --json"""
+    
+    def __init__(self, as_json):
+        self.as_json = as_json
+    
+    def result(self, command, ok, data, text):
+        if self.as_json:
+            print(json.dumps({"command": command, "ok": ok, **data}, default=str), flush=True)
+        elif text:
+            print(text, flush=True)
+    
+    def event(self, data, text):
+        """A streamed line (log line, stats sample or job progress)"""
+        if self.as_json:
+            print(json.dumps(data, default=str), flush=True)
+        else:
+            print(text, flush=True)
+
+def format_job(job):
+    """One line describing a job from JOB_LIST / JOB_STATUS / JOB_UPDATE"""
+    progress = ""
+    if job.get("percent") is not None:
+        progress = f" {job['percent']:.0f}%"
+    if job.get("eta") is not None:
+        progress += f" (ETA {job['eta']}s)"
+    message = f" - {job['message']}" if job.get("message") else ""
+    return f"#{job.get('job_id')} {job.get('description')}: {job.get('state')}{progress}{message}"
+
+def format_stats(stats):
+    return (
+        f"{stats.get('timestamp', '')} CPU {stats.get('cpu_percent', 0):.1f}% | "
+        f"RAM {stats.get('ram_percent', 0):.1f}% ({stats.get('ram_used_gb', 0):.1f}/{stats.get('ram_total_gb', 0):.1f} GB) | "
+        f"Disk {stats.get('disk_percent', 0):.1f}% | Net {stats.get('network_rate_mbps', 0):.2f} Mbps"
+    )
+
+def reply_error(reply, command):
+    """Error text for a missing or failed reply, or None if it succeeded"""
+    if reply is None:
+        return f"No reply to {command} (timed out or connection lost)"
+    if reply.status != STATUS_OK:
+        return reply.message or f"{command} failed"
+    return None
+
+class CliCommand:
+    """
+    One command line. requests() lists the protocol commands to send (all
+    commands of a batch are sent before any reply is read); finish() gets
+    their replies in the same order, prints the result and returns success.
+    """
+    
+    name = None
+    follows = False  # Streams until interrupted - cannot be followed by more batch lines
+    
+    def __init__(self, args):
+        self.args = args
+    
+    def requests(self):
+        return []
+    
+    def finish(self, session, replies, output):
+        raise NotImplementedError
+
+class StatusCommand(CliCommand):
+    name = "status"
+    
+    def requests(self):
+        return [("GET_SERVER_STATUS", None), ("GET_NEXT_BACKUP_TIME", None), (CMD_JOB_LIST, None)]
+    
+    def finish(self, session, replies, output):
+        server, next_backup, jobs = replies
+        error = reply_error(server, "GET_SERVER_STATUS") or reply_error(next_backup, "GET_NEXT_BACKUP_TIME")
+        if error:
+            output.result(self.name, False, {"error": error}, f"Error: {error}")
+            return False
+        
+        # Servers from before the job queue answer JOB_LIST with an error - leave it out
+        job_data = jobs.data if jobs is not None and jobs.status == STATUS_OK else {}
+        active = [job for job in job_data.get("jobs", []) if job.get("state") not in FINISHED_JOB_STATES]
+        data = {
+            "server": server.data,
+            "next_backup": next_backup.data,
+            "jobs": active,
+            "queue": job_data.get("queue")
+        }
+        
+        lines = [f"Server: {server.data.get('status', 'UNKNOWN')}"
+                 + (f" (pid {server.data['pid']})" if server.data.get("pid") else "")]
+        if next_backup.data.get("next_backup_time"):
+            lines.append(f"Next backup: {next_backup.data.get('backup_type')} at {next_backup.data['next_backup_time']}")
+        else:
+            lines.append("Next backup: none scheduled")
+        lines.append(f"Active jobs: {len(active)}")
+        lines.extend(f"  {format_job(job)}" for job in active)
+        output.result(self.name, True, data, "\n".join(lines))
+        return True
+
+class JobCommand(CliCommand):
+    """Queue a backup job; with --wait, follow it until it finishes"""
+    
+    protocol_command = None
+    
+    def data(self):
+        return None
+    
+    def requests(self):
+        requests = [(self.protocol_command, self.data())]
+        if self.args.wait:
+            # Subscribe first so no update is missed (the reply is not needed)
+            requests.insert(0, (CMD_SUBSCRIBE, {"topics": [TOPIC_PROGRESS]}))
+        return requests
+    
+    def finish(self, session, replies, output):
+        reply = replies[-1]
+        error = reply_error(reply, self.protocol_command)
+        if error:
+            output.result(self.name, False, {"error": error}, f"Error: {error}")
+            return False
+        
+        job_id = (reply.data or {}).get("job_id")
+        if not self.args.wait or job_id is None:
+            # Servers from before the job queue reply once the backup has finished
+            output.result(self.name, True, {"job_id": job_id, "message": reply.message}, reply.message)
+            return True
+        
+        output.event({"job_id": job_id, "state": "queued", "message": reply.message}, reply.message)
+        job = self.wait_for_job(session, job_id, output)
+        if job is None:
+            error = f"Lost track of job {job_id}"
+            output.result(self.name, False, {"job_id": job_id, "error": error}, f"Error: {error}")
+            return False
+        
+        ok = job.get("state") == "succeeded"
+        output.result(self.name, ok, {"job": job}, format_job(job))
+        return ok
+    
+    def wait_for_job(self, session, job_id, output):
+        """Print the job's progress until it finishes. Returns its final state, or None if the connection is lost."""
+        last_line = None
+        next_poll = time.monotonic() + JOB_POLL_INTERVAL
+        while True:
+            message = session.next_event([CMD_JOB_UPDATE], timeout=max(0, next_poll - time.monotonic()))
+            if message is None:
+                if session.disconnected:
+                    return None
+                # No broadcast for a while - ask directly
+                next_poll = time.monotonic() + JOB_POLL_INTERVAL
+                reply = session.reply(session.send(CMD_JOB_STATUS, {"job_id": job_id}), CMD_JOB_STATUS)
+                if reply is None or reply.status != STATUS_OK:
+                    return None
+                job = reply.data
+            else:
+                job = message.data
+                if job.get("job_id") != job_id:
+                    continue
+            
+            line = format_job(job)
+            if line != last_line and job.get("state") not in FINISHED_JOB_STATES:
+                output.event(job, line)
+                last_line = line
+            if job.get("state") in FINISHED_JOB_STATES:
+                return job
+
+class BackupDatabaseCommand(JobCommand):
+    name = "backup-db"
+    protocol_command = "BACKUP_DATABASE"
+
+class BackupServerCommand(JobCommand):
+    name = "backup-server"
+    protocol_command = "BACKUP_SERVER"
+
+class RestoreTablesCommand(JobCommand):
+    name = "restore-tables"
+    protocol_command = CMD_RESTORE_DB_TABLES
+    
+    def data(self):
+        return {"backup": self.args.backup, "tables": self.args.tables}
+
+class SimpleCommand(CliCommand):
+    """A command whose reply message is the whole result"""
+    
+    protocol_command = None
+    
+    def data(self):
+        return None
+    
+    def requests(self):
+        return [(self.protocol_command, self.data())]
+    
+    def finish(self, session, replies, output):
+        reply = replies[0]
+        error = reply_error(reply, self.protocol_command)
+        if error:
+            output.result(self.name, False, {"error": error}, f"Error: {error}")
+            return False
+        output.result(self.name, True, {"message": reply.message, **(reply.data or {})}, reply.message)
+        return True
+
+class RestartCommand(SimpleCommand):
+    name = "restart"
+    protocol_command = "RESTART_SERVER"
+
+class CancelCommand(SimpleCommand):
+    name = "cancel"
+    protocol_command = CMD_JOB_CANCEL
+    
+    def data(self):
+        return {"job_id": self.args.job_id}
+
+class TablesCommand(CliCommand):
+    name = "tables"
+    
+    def requests(self):
+        return [(CMD_GET_DB_BACKUP_TABLES, {"backup": self.args.backup})]
+    
+    def finish(self, session, replies, output):
+        reply = replies[0]
+        error = reply_error(reply, CMD_GET_DB_BACKUP_TABLES)
+        if error:
+            output.result(self.name, False, {"error": error}, f"Error: {error}")
+            return False
+        tables = reply.data.get("tables", [])
+        text = "\n".join(f"{table['name']:<40} {table['bytes'] / (1024 * 1024):>10.1f} MB" for table in tables)
+        output.result(self.name, True, reply.data, text or "No tables")
+        return True
+
+class PreviewCommand(CliCommand):
+    name = "preview"
+    
+    def requests(self):
+        return [(CMD_PREVIEW_DB_TABLE, {"backup": self.args.backup, "table": self.args.table})]
+    
+    def finish(self, session, replies, output):
+        reply = replies[0]
+        error = reply_error(reply, CMD_PREVIEW_DB_TABLE)
+        if error:
+            output.result(self.name, False, {"error": error}, f"Error: {error}")
+            return False
+        output.result(self.name, True, reply.data, reply.data.get("text", ""))
+        return True
+
+class JobsCommand(CliCommand):
+    name = "jobs"
+    
+    def requests(self):
+        return [(CMD_JOB_LIST, None)]
+    
+    def finish(self, session, replies, output):
+        reply = replies[0]
+        error = reply_error(reply, CMD_JOB_LIST)
+        if error:
+            output.result(self.name, False, {"error": error}, f"Error: {error}")
+            return False
+        jobs = reply.data.get("jobs", [])
+        text = "\n".join(format_job(job) for job in jobs) or "No jobs"
+        output.result(self.name, True, reply.data, text)
+        return True
+
+class TailLogsCommand(CliCommand):
+    name = "tail-logs"
+    
+    @property
+    def follows(self):
+        return self.args.follow
+    
+    def requests(self):
+        requests = [("GET_SNAPSHOT", None)]
+        if self.args.follow:
+            requests.insert(0, (CMD_SUBSCRIBE, {"topics": [TOPIC_LOGS]}))
+        return requests
+    
+    def finish(self, session, replies, output):
+        reply = replies[-1]
+        error = reply_error(reply, "GET_SNAPSHOT")
+        if error:
+            output.result(self.name, False, {"error": error}, f"Error: {error}")
+            return False
+        
+        lines = decompress_payload(reply.data).get("recent_logs", [])[-self.args.lines:] if self.args.lines else []
+        if not self.args.follow:
+            text = "\n".join(f"[{line['timestamp']}] {line['message']}" for line in lines)
+            output.result(self.name, True, {"lines": lines}, text)
+            return True
+        
+        for line in lines:
+            output.event(line, f"[{line['timestamp']}] {line['message']}")
+        # The subscription went out before the snapshot - skip broadcasts the history already showed
+        seen_until = lines[-1]["timestamp"] if lines else ""
+        while True:
+            message = session.next_event([CMD_LOG_MESSAGE, CMD_LOG_BATCH])
+            if message is None:
+                output.result(self.name, False, {"error": session.disconnected}, f"Error: {session.disconnected}")
+                return False
+            batch = message.data.get("lines", []) if message.command == CMD_LOG_BATCH else [message.data]
+            for line in batch:
+                timestamp = line.get("timestamp", message.timestamp)
+                if timestamp <= seen_until:
+                    continue
+                output.event(line, f"[{timestamp}] {line.get('message', '')}")
+
+class StatsCommand(CliCommand):
+    name = "stats"
+    
+    @property
+    def follows(self):
+        return self.args.follow
+    
+    def requests(self):
+        return [(CMD_SUBSCRIBE, {"topics": [TOPIC_RESOURCES]})]
+    
+    def finish(self, session, replies, output):
+        error = reply_error(replies[0], CMD_SUBSCRIBE)
+        if error:
+            output.result(self.name, False, {"error": error}, f"Error: {error}")
+            return False
+        
+        # Stats arrive every second as keyframes and deltas - rebuild full samples
+        stream = StatsReconstructor()
+        while True:
+            message = session.next_event([CMD_RESOURCE_STATS], timeout=None if self.args.follow else session.timeout)
+            if message is None:
+                error = session.disconnected or "No resource stats received"
+                output.result(self.name, False, {"error": error}, f"Error: {error}")
+                return False
+            stats = stream.apply(message.data, message.timestamp)
+            if not stats:
+                continue
+            if not self.args.follow:
+                # One sample is enough - stop the stream for the rest of a batch
+                session.send(CMD_UNSUBSCRIBE, {"topics": [TOPIC_RESOURCES]})
+                output.result(self.name, True, {"stats": stats}, format_stats(stats))
+                return True
+            output.event(stats, format_stats(stats))
+
+COMMANDS = {
+    command.name: command for command in (
+        StatusCommand, BackupDatabaseCommand, BackupServerCommand, RestartCommand,
+        JobsCommand, CancelCommand, TailLogsCommand, StatsCommand,
+        TablesCommand, PreviewCommand, RestoreTablesCommand
+    )
+}
+
+def build_command_parser(prog="remote_cli"):
+    """Parser for one command and its options (used for the command line and every batch line)"""
+    parser = CommandParser(prog=prog, add_help=False)
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", parser_class=CommandParser)
+    commands.required = True
+    
+    commands.add_parser("status", help="server status, next backup and job queue")
+    for name, what in (("backup-db", "database"), ("backup-server", "server")):
+        command = commands.add_parser(name, help=f"queue a {what} backup")
+        command.add_argument("--wait", action="store_true", help="follow the job until it finishes")
+    command = commands.add_parser("tables", help="tables that can be restored on their own from a database backup")
+    command.add_argument("backup", help="backup file or folder name")
+    command = commands.add_parser("preview", help="the start of a table's SQL in a database backup")
+    command.add_argument("backup", help="backup file or folder name")
+    command.add_argument("table")
+    command = commands.add_parser("restore-tables", help="restore only these tables from a database backup")
+    command.add_argument("backup", help="backup file or folder name")
+    command.add_argument("tables", nargs="+", metavar="table")
+    command.add_argument("--wait", action="store_true", help="follow the job until it finishes")
+    commands.add_parser("restart", help="restart FXServer")
+    commands.add_parser("jobs", help="list recent jobs")
+    command = commands.add_parser("cancel", help="cancel a queued or running job")
+    command.add_argument("job_id", type=int)
+    command = commands.add_parser("tail-logs", help="recent activity log lines")
+    command.add_argument("-n", "--lines", type=int, default=20, help="lines of history to show (default 20)")
+    command.add_argument("-f", "--follow", action="store_true", help="keep printing new lines")
+    command = commands.add_parser("stats", help="resource usage")
+    command.add_argument("-f", "--follow", action="store_true", help="keep printing a sample every second")
+    command = commands.add_parser("batch", help="run commands from a file or stdin over one connection")
+    command.add_argument("file", nargs="?", default="-", help="one command per line, '#' comments (default: stdin)")
+    return parser
+
+def parse_batch(lines, parser):
+    """Parse batch lines into CliCommands. Raises UsageError with the line number."""
+    commands = []
+    for number, line in enumerate(lines, 1):
+        try:
+            words = shlex.split(line, comments=True)
+        except ValueError as e:  # Unbalanced quotes
+            raise UsageError(f"line {number}: {e}")
+        if not words:
+            continue
+        try:
+            args = parser.parse_args(words)
+        except UsageError as e:
+            raise UsageError(f"line {number}: {e}")
+        if args.command == "batch":
+            raise UsageError(f"line {number}: batches cannot be nested")
+        if commands and commands[-1].follows:
+            raise UsageError(f"line {number}: nothing can follow '{commands[-1].name} --follow'")
+        commands.append(COMMANDS[args.command](args))
+    return commands
+
+def run_commands(session, commands, output):
+    """Send every command's requests at once, then finish the commands in order. Returns the exit status."""
+    futures = [[(command, session.send(command, data)) for command, data in cli.requests()] for cli in commands]
+    status = EXIT_OK
+    for cli, sent in zip(commands, futures):
+        replies = [session.reply(future, command) for command, future in sent]
+        if not cli.finish(session, replies, output):
+            status = EXIT_FAILED
+    return status
+
+def connection_settings(args):
+    """(host, port, auth_key) from the options, the environment and the saved Remote Client connection"""
+    from remote_settings import load_settings
+    saved = load_settings().get("connection", {})
+    host = args.host or os.environ.get("CONTROLLER_HOST") or saved.get("server_ip")
+    port = args.port or os.environ.get("CONTROLLER_PORT") or saved.get("port") or DEFAULT_PORT
+    auth_key = args.key or os.environ.get("CONTROLLER_AUTH_KEY") or saved.get("auth_key")
+    return host, int(port), auth_key
+
+def main(argv=None):
+    # Connection and output options may come before or after the command ("stats --json");
+    # everything this parser does not know is the command and its options
+    parser = argparse.ArgumentParser(
+        prog="remote_cli", usage="%(prog)s [options] COMMAND [command options]", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter, allow_abbrev=False
+    )
+    parser.add_argument("--host", help="controller address (default: CONTROLLER_HOST or the saved connection)")
+    parser.add_argument("--port", type=int, help=f"remote control port (default: CONTROLLER_PORT, saved or {DEFAULT_PORT})")
+    parser.add_argument("--key", help="authentication key (prefer CONTROLLER_AUTH_KEY - options are visible to other users)")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result or event line")
+    parser.add_argument("--timeout", type=float, default=COMMAND_TIMEOUT, help="seconds to wait for each reply")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log connection details to stderr")
+    args, command = parser.parse_known_args(argv)
+    
+    # Results go to stdout; the protocol's own logging stays on stderr and quiet by default
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+    
+    command_parser = build_command_parser()
+    try:
+        command_args = command_parser.parse_args(command)
+        if command_args.command == "batch":
+            if command_args.file == "-":
+                lines = sys.stdin.read().splitlines()
+            else:
+                with open(command_args.file, 'r') as f:
+                    lines = f.read().splitlines()
+            commands = parse_batch(lines, command_parser)
+        else:
+            commands = [COMMANDS[command_args.command](command_args)]
+    except (UsageError, OSError) as e:
+        print(f"{e}\nRun 'python -m remote_cli --help' for the list of commands.", file=sys.stderr)
+        return EXIT_USAGE
+    
+    host, port, auth_key = connection_settings(args)
+    if not host or not auth_key:
+        print("No controller address or authentication key - use --host/--key or CONTROLLER_HOST/CONTROLLER_AUTH_KEY",
+              file=sys.stderr)
+        return EXIT_USAGE
+    
+    session = RemoteSession(host, port, auth_key, timeout=args.timeout)
+    success, message = session.connect()
+    if not success:
+        print(message, file=sys.stderr)
+        return EXIT_CONNECTION
+    
+    try:
+        return run_commands(session, commands, Output(args.json))
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,14 +3,29 @@ import socket
 import secrets
 import logging
 import hashlib
+import hmac
 import time
 import base64
+import zlib
 import threading
+import asyncio
 import os
+import itertools
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
 from datetime import datetime
-from collections import defaultdict
+from collections import deque, OrderedDict
 from config_manager import get_logs_dir
 
+try:
+    import msgpack
+except ImportError:  # Optional - without it every client uses the JSON codec
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # Optional - without it compressed frames use zlib
+    zstandard = None
+
 # Set up specific logger for remote operations
 remote_logger = logging.getLogger('remote_control')
 remote_logger.setLevel(logging.DEBUG)
@@ -29,6 +44,58 @@ DEFAULT_PORT = 40100
 BUFFER_SIZE = 4096
 TIMEOUT = 10  # socket timeout in seconds
 HEARTBEAT_INTERVAL = 5  # seconds between heartbeat messages
+HEARTBEAT_TIMEOUT = 3 * HEARTBEAT_INTERVAL  # silence after which a peer is considered dead
+MAX_MESSAGE_SIZE = 10 * 1024 * 1024  # Max 10MB message
+
+# Server engines (selected with settings.json -> remote_control -> engine)
+ENGINE_THREADED = "threaded"  # One thread per connected client
+ENGINE_ASYNCIO = "asyncio"  # Single event loop for all clients
+DEFAULT_EXECUTOR_WORKERS = 4  # Worker threads for blocking command handlers
+MAX_COMMANDS_IN_FLIGHT = 16  # Pipelined commands executed at once per client (asyncio engine)
+COMMAND_TIMEOUT = 30  # seconds to wait for a command reply
+
+# Authentication
+TICKET_LIFETIME = 12 * 60 * 60  # Seconds a session ticket lets a client skip the key check
+AUTH_WORKERS = 2  # Threads running the slow PBKDF2 key check
+AUTH_MAX_PENDING = 8  # Key checks queued or running before new attempts are refused
+
+# Connection admission
+LISTEN_BACKLOG = 64
+MAX_CONNECTIONS = 64  # Open connections, authenticated or not
+MAX_CONNECTIONS_PER_IP = 4  # Open connections from one address
+PRE_AUTH_TIMEOUT = 5  # Seconds a new connection has to finish AUTH
+MAX_AUTH_MESSAGE_SIZE = 64 * 1024  # Largest frame accepted before authentication
+MAX_TRACKED_IPS = 4096  # Addresses with failed attempts remembered at once (least recent forgotten)
+ATTEMPT_BUCKETS = 10  # Resolution of the failed-attempt sliding window
+BAN_SWEEP_INTERVAL = 60  # Seconds between sweeps of expired bans
+
+# Delta-encoded RESOURCE_STATS (see RemoteServer.broadcast_resource_stats)
+STATS_KEYFRAME_INTERVAL = 30  # Seconds between full keyframes
+# Decimal places kept per field - what the dashboards display. Fields not
+# listed (the sample timestamp) are not streamed; receivers use the frame time.
+STATS_PRECISION = {
+    "cpu_percent": 1,
+    "ram_percent": 1,
+    "ram_used_gb": 1,
+    "ram_total_gb": 1,
+    "disk_percent": 1,
+    "disk_used_gb": 1,
+    "disk_total_gb": 1,
+    "network_sent_mb": 0,
+    "network_recv_mb": 0,
+    "network_rate_mbps": 2,
+}
+
+# Log batching (see LogBatcher)
+LOG_BATCH_INTERVAL = 0.1  # Seconds log lines are gathered before being sent
+LOG_BATCH_MAX_LINES = 200  # Lines that trigger an immediate send
+
+# Outbound queue drop policies
+POLICY_KEEP = "keep"  # Never dropped (command replies and state updates)
+POLICY_LATEST = "latest"  # Only the most recent queued frame of this command is kept
+POLICY_DROP_OLDEST = "drop_oldest"  # Oldest frames are dropped first when the queue is full
+OUTBOUND_QUEUE_SIZE = 256  # Frames queued per client before droppable frames are discarded
+OUTBOUND_QUEUE_HARD_LIMIT = 1024  # Frames queued per client before it is disconnected as stalled
 
 # Command types
 CMD_AUTH = "AUTH"
@@ -47,7 +114,18 @@ CMD_UPDATE_TXADMIN = "UPDATE_TXADMIN"
 CMD_RESTORE_TXADMIN = "RESTORE_TXADMIN"
 CMD_GET_TXADMIN_BACKUPS = "GET_TXADMIN_BACKUPS"
 CMD_LOG_MESSAGE = "LOG_MESSAGE"
+CMD_LOG_BATCH = "LOG_BATCH"  # Several log lines in one frame: data["lines"] = [{"message", "timestamp"}]
 CMD_RESOURCE_STATS = "RESOURCE_STATS"  # New command
+CMD_PROGRESS_UPDATE = "PROGRESS_UPDATE"
+CMD_SUBSCRIBE = "SUBSCRIBE"
+CMD_UNSUBSCRIBE = "UNSUBSCRIBE"
+CMD_JOB_LIST = "JOB_LIST"
+CMD_JOB_STATUS = "JOB_STATUS"  # data["job_id"]
+CMD_JOB_CANCEL = "JOB_CANCEL"  # data["job_id"]
+CMD_JOB_UPDATE = "JOB_UPDATE"  # Broadcast when a job is queued, makes progress or finishes
+CMD_GET_DB_BACKUP_TABLES = "GET_DB_BACKUP_TABLES"  # data["backup"] (file name) -> data["tables"] = [{"name", "bytes"}]
+CMD_PREVIEW_DB_TABLE = "PREVIEW_DB_TABLE"  # data["backup"], data["table"] -> data["text"], the start of its SQL
+CMD_RESTORE_DB_TABLES = "RESTORE_DB_TABLES"  # data["backup"], data["tables"] -> job restoring only those tables
 
 # Response status codes
 STATUS_OK = "OK"
@@ -56,25 +134,99 @@ STATUS_AUTH_REQUIRED = "AUTH_REQUIRED"
 STATUS_INVALID_AUTH = "INVALID_AUTH"
 STATUS_AUTH_FAILED = "AUTH_FAILED"
 
+# Encoding marker for zlib-compressed data payloads sent by older servers (see decompress_payload)
+PAYLOAD_ENCODING_ZLIB = "zlib+base64"
+
+# Wire codecs, negotiated during AUTH. Handshake frames are always JSON.
+CODEC_JSON = "json"
+CODEC_MSGPACK = "msgpack"
+CODEC_PREFERENCE = [CODEC_MSGPACK, CODEC_JSON]
+
+# Data keys the msgpack codec sends as their index in this list.
+# Append only - reordering or removing entries breaks older peers.
+MSGPACK_KEYS = [
+    "timestamp", "cpu_percent", "ram_percent", "ram_used_gb", "ram_total_gb",
+    "disk_percent", "disk_used_gb", "disk_total_gb", "network_sent_mb",
+    "network_recv_mb", "network_rate_mbps", "message", "status", "pid",
+    "backups", "filename", "path", "progress", "backup_type",
+    "next_backup_time", "next_backup_timestamp", "server_time",
+    "encoding", "payload", "auth_key", "request_ids", "codec", "codecs",
+]
+
+# Frame compression, negotiated during AUTH. A compressed frame has the top
+# bit of its length header set; the remaining 31 bits are the wire length.
+FRAME_FLAG_COMPRESSED = 0x80000000
+FRAME_LENGTH_MASK = 0x7FFFFFFF
+COMPRESSION_ZSTD = "zstd"
+COMPRESSION_ZLIB = "zlib"
+COMPRESSION_PREFERENCE = [COMPRESSION_ZSTD, COMPRESSION_ZLIB]
+COMPRESSION_THRESHOLD = 4096  # Payloads smaller than this are sent as-is
+
+# Broadcast topics a client can SUBSCRIBE to or UNSUBSCRIBE from.
+# New connections are subscribed to every topic.
+TOPIC_STATUS = "status"  # Server status and next backup time
+TOPIC_LOGS = "logs"
+TOPIC_RESOURCES = "resources"
+TOPIC_PROGRESS = "progress"
+TOPIC_BACKUPS = "backups"  # Database, server and TxAdmin backup lists
+ALL_TOPICS = frozenset([TOPIC_STATUS, TOPIC_LOGS, TOPIC_RESOURCES, TOPIC_PROGRESS, TOPIC_BACKUPS])
+BROADCAST_TOPICS = {
+    CMD_SERVER_STATUS: TOPIC_STATUS,
+    "NEXT_BACKUP_TIME": TOPIC_STATUS,
+    CMD_LOG_MESSAGE: TOPIC_LOGS,
+    CMD_LOG_BATCH: TOPIC_LOGS,
+    CMD_RESOURCE_STATS: TOPIC_RESOURCES,
+    CMD_PROGRESS_UPDATE: TOPIC_PROGRESS,
+    CMD_JOB_UPDATE: TOPIC_PROGRESS,
+    "DATABASE_BACKUPS": TOPIC_BACKUPS,
+    "SERVER_BACKUPS": TOPIC_BACKUPS,
+    "TXADMIN_BACKUPS": TOPIC_BACKUPS,
+}
+
+# Drop policy for broadcast streams - anything not listed is never dropped
+BROADCAST_DROP_POLICIES = {
+    CMD_HEARTBEAT: POLICY_LATEST,
+    CMD_RESOURCE_STATS: POLICY_LATEST,
+    CMD_LOG_MESSAGE: POLICY_DROP_OLDEST,
+    CMD_LOG_BATCH: POLICY_DROP_OLDEST,
+    CMD_PROGRESS_UPDATE: POLICY_DROP_OLDEST,
+}
+
 class RemoteMessage:
     """Class to represent remote control messages"""
     
-    def __init__(self, command, data=None, status=None, message=None):
+    def __init__(self, command, data=None, status=None, message=None, request_id=None):
         self.command = command
         self.data = data or {}
         self.status = status
         self.message = message
-        self.timestamp = datetime.now().isoformat()
+        self.request_id = request_id  # Set on commands and echoed on their replies
+        self.created = time.time()  # Epoch seconds; binary codecs send this as-is
+        self._timestamp = None
+    
+    @property
+    def timestamp(self):
+        """ISO formatted creation time (what the JSON codec puts on the wire)"""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self.created).isoformat()
+        return self._timestamp
+    
+    @timestamp.setter
+    def timestamp(self, value):
+        self._timestamp = value
     
     def to_json(self):
         """Convert message to JSON string"""
-        return json.dumps({
+        fields = {
             "command": self.command,
             "data": self.data,
             "status": self.status,
             "message": self.message,
             "timestamp": self.timestamp
-        })
+        }
+        if self.request_id is not None:
+            fields["request_id"] = self.request_id
+        return json.dumps(fields)
     
     @classmethod
     def from_json(cls, json_str):
@@ -85,13 +237,379 @@ class RemoteMessage:
                 command=data.get("command"),
                 data=data.get("data", {}),
                 status=data.get("status"),
-                message=data.get("message")
+                message=data.get("message"),
+                request_id=data.get("request_id")
             )
             msg.timestamp = data.get("timestamp", datetime.now().isoformat())
             return msg
         except json.JSONDecodeError as e:
             remote_logger.error(f"Failed to decode message: {e}")
             return None
+    
+    def encode(self, codec=None):
+        """Serialize the message with a wire codec (JSON by default)"""
+        return (codec or JSON_CODEC).encode(self)
+    
+    @classmethod
+    def decode(cls, payload, codec=None):
+        """Parse a frame payload with a wire codec (JSON by default)"""
+        return (codec or JSON_CODEC).decode(payload)
+
+class JsonCodec:
+    """Original wire format: one UTF-8 JSON object per frame"""
+    
+    name = CODEC_JSON
+    
+    def encode(self, message):
+        return message.to_json().encode('utf-8')
+    
+    def decode(self, payload):
+        try:
+            return RemoteMessage.from_json(str(payload, 'utf-8'))
+        except UnicodeDecodeError as e:
+            remote_logger.error(f"Failed to decode message as UTF-8: {e}")
+            remote_logger.error(f"First 100 bytes: {bytes(payload[:100])}")
+            return None
+
+class MsgpackCodec:
+    """
+    Compact binary format: a MessagePack map keyed by small integers.
+    The timestamp travels as epoch seconds, and data keys listed in
+    MSGPACK_KEYS are replaced by their index so repeated names such as
+    the resource stats fields cost one byte each.
+    """
+    
+    name = CODEC_MSGPACK
+    
+    # Top-level field tags
+    FIELD_COMMAND = 0
+    FIELD_DATA = 1
+    FIELD_STATUS = 2
+    FIELD_MESSAGE = 3
+    FIELD_TIMESTAMP = 4
+    FIELD_REQUEST_ID = 5
+    
+    def __init__(self):
+        self.key_tags = {key: index for index, key in enumerate(MSGPACK_KEYS)}
+    
+    def encode(self, message):
+        fields = {
+            self.FIELD_COMMAND: message.command,
+            self.FIELD_TIMESTAMP: message.created
+        }
+        if message.data:
+            fields[self.FIELD_DATA] = self._pack_keys(message.data)
+        if message.status is not None:
+            fields[self.FIELD_STATUS] = message.status
+        if message.message is not None:
+            fields[self.FIELD_MESSAGE] = message.message
+        if message.request_id is not None:
+            fields[self.FIELD_REQUEST_ID] = message.request_id
+        return msgpack.packb(fields, use_bin_type=True)
+    
+    def decode(self, payload):
+        try:
+            fields = msgpack.unpackb(payload, raw=False, strict_map_key=False)
+            msg = RemoteMessage(
+                command=fields.get(self.FIELD_COMMAND),
+                data=self._unpack_keys(fields.get(self.FIELD_DATA, {})),
+                status=fields.get(self.FIELD_STATUS),
+                message=fields.get(self.FIELD_MESSAGE),
+                request_id=fields.get(self.FIELD_REQUEST_ID)
+            )
+            msg.created = fields.get(self.FIELD_TIMESTAMP, msg.created)
+            return msg
+        except Exception as e:
+            remote_logger.error(f"Failed to decode msgpack message: {e}")
+            return None
+    
+    def _pack_keys(self, value):
+        """Replace known dict keys with their integer tag (recursively)"""
+        if isinstance(value, dict):
+            # Untagged keys are sent as strings (as JSON would) so they never clash with a tag
+            tags = self.key_tags
+            return {
+                tags[key] if key in tags else str(key): self._pack_keys(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [self._pack_keys(item) for item in value]
+        return value
+    
+    def _unpack_keys(self, value):
+        """Restore integer tags to their key names (recursively)"""
+        if isinstance(value, dict):
+            return {
+                (MSGPACK_KEYS[key] if isinstance(key, int) and key < len(MSGPACK_KEYS) else key):
+                    self._unpack_keys(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self._unpack_keys(item) for item in value]
+        return value
+
+JSON_CODEC = JsonCodec()
+CODECS = {CODEC_JSON: JSON_CODEC}
+if msgpack is not None:
+    CODECS[CODEC_MSGPACK] = MsgpackCodec()
+
+def available_codecs():
+    """Codec names this install supports, most preferred first"""
+    return [name for name in CODEC_PREFERENCE if name in CODECS]
+
+def get_codec(name):
+    """Look up a codec by name, falling back to JSON"""
+    return CODECS.get(name, JSON_CODEC)
+
+def negotiate_codec(offered):
+    """Pick the preferred codec that both sides support (JSON for old clients)"""
+    for name in available_codecs():
+        if name in (offered or ()):
+            return CODECS[name]
+    return JSON_CODEC
+
+class CompressionStats:
+    """Counters for compressed frames: bytes saved and CPU time spent"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.frames_compressed = 0
+        self.raw_bytes = 0  # Payload size before compression
+        self.wire_bytes = 0  # Payload size actually sent
+        self.compress_seconds = 0.0
+        self.frames_decompressed = 0
+        self.decompress_seconds = 0.0
+    
+    def record_compress(self, raw_size, wire_size, seconds):
+        with self.lock:
+            self.frames_compressed += 1
+            self.raw_bytes += raw_size
+            self.wire_bytes += wire_size
+            self.compress_seconds += seconds
+    
+    def record_decompress(self, seconds):
+        with self.lock:
+            self.frames_decompressed += 1
+            self.decompress_seconds += seconds
+    
+    @property
+    def ratio(self):
+        """Raw bytes per wire byte over all compressed frames (1.0 when none)"""
+        return self.raw_bytes / self.wire_bytes if self.wire_bytes else 1.0
+    
+    def as_dict(self):
+        with self.lock:
+            return {
+                "frames_compressed": self.frames_compressed,
+                "raw_bytes": self.raw_bytes,
+                "wire_bytes": self.wire_bytes,
+                "ratio": round(self.ratio, 2),
+                "compress_ms_per_frame": round(
+                    self.compress_seconds * 1000 / self.frames_compressed, 3) if self.frames_compressed else 0.0,
+                "frames_decompressed": self.frames_decompressed,
+                "decompress_ms_per_frame": round(
+                    self.decompress_seconds * 1000 / self.frames_decompressed, 3) if self.frames_decompressed else 0.0,
+            }
+
+class ZlibCompressor:
+    """Frame compression with the standard library zlib"""
+    
+    name = COMPRESSION_ZLIB
+    
+    def compress(self, data):
+        return zlib.compress(data, 6)
+    
+    def decompress(self, data):
+        decompressor = zlib.decompressobj()
+        result = decompressor.decompress(data, MAX_MESSAGE_SIZE)
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Decompressed frame exceeds {MAX_MESSAGE_SIZE} bytes")
+        return result
+
+class ZstdCompressor:
+    """Frame compression with zstandard (faster than zlib at a similar ratio)"""
+    
+    name = COMPRESSION_ZSTD
+    
+    def __init__(self):
+        self.level = 3
+    
+    def compress(self, data):
+        # Compressor objects are not thread safe, so each call makes its own
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+    
+    def decompress(self, data):
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=MAX_MESSAGE_SIZE)
+
+COMPRESSORS = {COMPRESSION_ZLIB: ZlibCompressor()}
+if zstandard is not None:
+    COMPRESSORS[COMPRESSION_ZSTD] = ZstdCompressor()
+
+def available_compressors():
+    """Compression names this install supports, most preferred first"""
+    return [name for name in COMPRESSION_PREFERENCE if name in COMPRESSORS]
+
+def negotiate_compressor(offered):
+    """Pick the preferred compression both sides support (None for old clients)"""
+    for name in available_compressors():
+        if name in (offered or ()):
+            return COMPRESSORS[name]
+    return None
+
+def parse_frame_header(header):
+    """Split a 4-byte frame header into (payload_length, compressed)"""
+    value = int.from_bytes(header, byteorder='big')
+    return value & FRAME_LENGTH_MASK, bool(value & FRAME_FLAG_COMPRESSED)
+
+def encode_frame(message, codec=None, compressor=None, threshold=COMPRESSION_THRESHOLD, stats=None):
+    """
+    Serialize a message into a length-prefixed frame ready to be sent.
+    With a compressor, payloads of at least threshold bytes are compressed
+    and flagged in the header (only when that actually makes them smaller).
+    """
+    data = message.encode(codec)
+    header = len(data)
+    if compressor and len(data) >= threshold:
+        start = time.thread_time()
+        compressed = compressor.compress(data)
+        if len(compressed) < len(data):
+            if stats:
+                stats.record_compress(len(data), len(compressed), time.thread_time() - start)
+            data = compressed
+            header = len(data) | FRAME_FLAG_COMPRESSED
+    return header.to_bytes(4, byteorder='big') + data
+
+def decode_frame_payload(data, codec=None, compressor=None, compressed=False, stats=None):
+    """Parse the payload of a frame (without the length header) into a RemoteMessage"""
+    if compressed:
+        if not compressor:
+            remote_logger.error("Received a compressed frame but no compression was negotiated")
+            return None
+        try:
+            start = time.thread_time()
+            data = compressor.decompress(data)
+            if stats:
+                stats.record_decompress(time.thread_time() - start)
+        except Exception as e:
+            remote_logger.error(f"Failed to decompress frame: {e}")
+            return None
+    return RemoteMessage.decode(data, codec)
+
+class FrameReader:
+    """
+    Reads length-prefixed frames from a blocking socket into one reusable,
+    growable buffer. recv_into() fills as much of the buffer as the kernel
+    has ready, so several small frames are parsed from a single read and a
+    large frame is assembled without intermediate copies.
+    """
+    
+    INITIAL_SIZE = 64 * 1024
+    SHRINK_SIZE = 1024 * 1024  # Give back memory after a frame larger than this
+    
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = bytearray(self.INITIAL_SIZE)
+        self.start = 0  # First byte not yet returned as a frame
+        self.end = 0  # End of received data
+        self.payload = None  # View handed out by the last read_frame()
+        self.max_size = MAX_MESSAGE_SIZE  # Lowered before authentication
+    
+    def read_frame(self):
+        """
+        Return (payload, compressed) for the next frame, or None if the peer
+        closed the connection or sent an invalid length. The payload is a
+        memoryview into the buffer and is only valid until the next call.
+        """
+        self._release_payload()
+        while True:
+            available = self.end - self.start
+            needed = 4
+            if available >= 4:
+                length, compressed = parse_frame_header(self.buffer[self.start:self.start + 4])
+                if length <= 0 or length > self.max_size:
+                    remote_logger.error(f"Invalid message length: {length}")
+                    return None
+                needed = 4 + length
+                if available >= needed:
+                    self.payload = memoryview(self.buffer)[self.start + 4:self.start + needed]
+                    self.start += needed
+                    return self.payload, compressed
+            
+            if not self._fill(needed):
+                if available:
+                    remote_logger.error(f"Connection closed while receiving message. Got {available}/{needed} bytes")
+                return None
+    
+    def _fill(self, needed):
+        """Receive more data, making room for at least `needed` bytes from start"""
+        if self.start == self.end:
+            self.start = self.end = 0
+            if len(self.buffer) > self.SHRINK_SIZE:
+                self.buffer = bytearray(self.INITIAL_SIZE)
+        
+        if len(self.buffer) - self.start < needed:
+            # Move the partial frame to the front, then grow if it still does not fit
+            pending = self.end - self.start
+            self.buffer[:pending] = self.buffer[self.start:self.end]
+            self.start, self.end = 0, pending
+            if len(self.buffer) < needed:
+                self.buffer.extend(bytes(max(needed, 2 * len(self.buffer)) - len(self.buffer)))
+        
+        with memoryview(self.buffer) as view:
+            received = self.sock.recv_into(view[self.end:])
+        if not received:
+            return False
+        self.end += received
+        return True
+    
+    def _release_payload(self):
+        # The buffer cannot be resized while a view of it is alive
+        if self.payload is not None:
+            self.payload.release()
+            self.payload = None
+
+def decompress_payload(data):
+    """
+    Unpack a data dict that an older server sent as base64 zlib-compressed JSON.
+    Data that was not compressed is returned unchanged; current servers rely
+    on frame compression instead.
+    """
+    if not data or data.get("encoding") != PAYLOAD_ENCODING_ZLIB:
+        return data
+    return json.loads(zlib.decompress(base64.b64decode(data["payload"])).decode('utf-8'))
+
+def quantize_stats(stats):
+    """Round resource stats to display precision (see STATS_PRECISION)"""
+    sample = {}
+    for key, places in STATS_PRECISION.items():
+        value = stats.get(key)
+        if isinstance(value, (int, float)):
+            sample[key] = round(value, places) if places else int(round(value))
+    return sample
+
+class StatsReconstructor:
+    """
+    Client side of the RESOURCE_STATS stream: turns keyframes and deltas back
+    into full stats dicts. Full stats from older servers pass straight through.
+    """
+    
+    def __init__(self):
+        self.keyframe = None
+    
+    def apply(self, data, timestamp=None):
+        """Return the full stats for one RESOURCE_STATS payload, or None before the first keyframe"""
+        if data.get("keyframe"):
+            self.keyframe = {key: value for key, value in data.items() if key != "keyframe"}
+            stats = dict(self.keyframe)
+        elif data.get("delta"):
+            if self.keyframe is None:
+                return None
+            stats = dict(self.keyframe)
+            stats.update((key, value) for key, value in data.items() if key != "delta")
+        else:
+            return data
+        stats["timestamp"] = timestamp or datetime.now().isoformat()
+        return stats
 
 def generate_auth_key():
     """Generate a random authentication key"""
@@ -123,26 +641,337 @@ def verify_auth_key(input_key, stored_salt, stored_hash):
     _, input_hash = hash_auth_key(input_key, stored_salt)
     return input_hash == stored_hash
 
+class OutboundQueue:
+    """
+    Bounded, thread-safe queue of encoded frames waiting to be written to one client.
+    Frames are dropped according to their policy when the client falls behind;
+    POLICY_KEEP frames are never dropped.
+    """
+    
+    def __init__(self, max_size=OUTBOUND_QUEUE_SIZE, hard_limit=OUTBOUND_QUEUE_HARD_LIMIT, on_put=None):
+        self.max_size = max_size
+        self.hard_limit = hard_limit
+        self.on_put = on_put  # Optional wakeup hook for event-loop writers
+        self.entries = deque()  # (command, policy, frame)
+        self.condition = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+    
+    def put(self, frame, command=None, policy=POLICY_KEEP):
+        """Queue a frame. Returns False if the client is stalled and should be dropped."""
+        with self.condition:
+            if self.closed:
+                return False
+            
+            if policy == POLICY_LATEST:
+                for entry in self.entries:
+                    if entry[0] == command and entry[1] == POLICY_LATEST:
+                        self.entries.remove(entry)
+                        self.dropped += 1
+                        break
+            
+            if policy != POLICY_KEEP and len(self.entries) >= self.max_size:
+                if not self._drop_oldest_droppable():
+                    # Nothing older can go, so the new frame is the one dropped
+                    self.dropped += 1
+                    return True
+            
+            if len(self.entries) >= self.hard_limit:
+                return False
+            
+            self.entries.append((command, policy, frame))
+            self.condition.notify()
+        
+        if self.on_put:
+            self.on_put()
+        return True
+    
+    def _drop_oldest_droppable(self):
+        """Remove the oldest frame that is allowed to be dropped (lock held)"""
+        for entry in self.entries:
+            if entry[1] != POLICY_KEEP:
+                self.entries.remove(entry)
+                self.dropped += 1
+                return True
+        return False
+    
+    def get(self, timeout=None):
+        """Block until a frame is available. Returns None on timeout or when closed."""
+        with self.condition:
+            if not self.entries and not self.closed:
+                self.condition.wait(timeout)
+            if self.entries:
+                return self.entries.popleft()[2]
+            return None
+    
+    def get_all_nowait(self):
+        """Take every queued frame without blocking"""
+        with self.condition:
+            frames = [entry[2] for entry in self.entries]
+            self.entries.clear()
+            return frames
+    
+    def close(self):
+        """Wake up the writer and refuse new frames"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.on_put:
+            self.on_put()
+    
+    def __len__(self):
+        return len(self.entries)
+
+class LogBatcher:
+    """
+    Gathers log lines and hands them to flush_callback as one list, after
+    `interval` seconds or as soon as `max_lines` are waiting. Turns bursts
+    of log lines into a few LOG_BATCH frames instead of one frame per line.
+    """
+    
+    def __init__(self, flush_callback, interval=LOG_BATCH_INTERVAL, max_lines=LOG_BATCH_MAX_LINES):
+        self.flush_callback = flush_callback
+        self.interval = interval
+        self.max_lines = max_lines
+        self.lines = []
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+    
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Send whatever is waiting and stop the flusher thread"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread and threading.current_thread() != self.thread:
+            self.thread.join(timeout=2)
+    
+    def add(self, message, timestamp=None):
+        with self.condition:
+            self.lines.append({"message": message, "timestamp": timestamp or datetime.now().isoformat()})
+            if len(self.lines) == 1 or len(self.lines) >= self.max_lines:
+                self.condition.notify()
+    
+    def _run(self):
+        """Flusher thread: wait for a first line, let the window fill, then send"""
+        while True:
+            with self.condition:
+                while self.running and not self.lines:
+                    self.condition.wait()
+                
+                deadline = time.monotonic() + self.interval
+                while self.running and len(self.lines) < self.max_lines:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                
+                batch = self.lines[:self.max_lines]
+                del self.lines[:self.max_lines]
+                stopping = not self.running and not self.lines
+            
+            if batch:
+                try:
+                    self.flush_callback(batch)
+                except Exception as e:
+                    remote_logger.error(f"Error sending log batch: {e}")
+            if stopping:
+                break
+
+class ClientConnection:
+    """State for one connected remote client"""
+    
+    def __init__(self, transport, address):
+        self.transport = transport  # socket.socket (threaded) or asyncio.StreamWriter (asyncio)
+        self.address = address
+        self.authenticated = False
+        self.connected_at = time.time()
+        self.queue = OutboundQueue()
+        self.writer = None  # Writer thread or task draining the queue
+        self.reader = None  # FrameReader (threaded engine only)
+        self.codec = JSON_CODEC  # Switched to the negotiated codec after AUTH
+        self.compressor = None  # Negotiated frame compression, None if the client has none
+        self.admitted = False  # Holds a slot in the AdmissionController
+        self.heartbeat = False  # Client answers HEARTBEAT (negotiated during AUTH)
+        self.last_seen = self.connected_at  # Last time any frame arrived from the client
+        self.busy = False  # Threaded engine: a command is running on the reader thread, so nothing is read meanwhile
+        self.last_ping = 0  # Last time the server sent this client a HEARTBEAT
+        self.rtt = None  # Round-trip time of the last answered HEARTBEAT, in seconds
+        self.topics = ALL_TOPICS  # Broadcast topics; replaced (never mutated) on SUBSCRIBE/UNSUBSCRIBE
+        self.log_batch = False  # Client understands LOG_BATCH (negotiated during AUTH)
+        self.stats_delta = False  # Client rebuilds RESOURCE_STATS from keyframes and deltas (negotiated during AUTH)
+        self.stats_synced = False  # Client holds the server's current stats keyframe
+
+class SlidingWindowCounter:
+    """
+    Events in the last `window` seconds, counted in a fixed number of buckets.
+    Updates and totals cost the same no matter how many events were recorded.
+    """
+    
+    __slots__ = ("bucket_width", "counts", "bucket_ids")
+    
+    def __init__(self, window, buckets=ATTEMPT_BUCKETS):
+        self.bucket_width = window / buckets
+        self.counts = [0] * buckets
+        self.bucket_ids = [-1] * buckets
+    
+    def add(self, now):
+        bucket_id = int(now / self.bucket_width)
+        slot = bucket_id % len(self.counts)
+        if self.bucket_ids[slot] != bucket_id:
+            self.bucket_ids[slot] = bucket_id
+            self.counts[slot] = 0
+        self.counts[slot] += 1
+    
+    def total(self, now):
+        oldest = int(now / self.bucket_width) - len(self.counts)
+        return sum(count for count, bucket_id in zip(self.counts, self.bucket_ids) if bucket_id > oldest)
+
+class AdmissionController:
+    """
+    Decides which connections the remote server accepts: a global cap, a
+    per-IP cap on concurrent connections, and temporary bans for addresses
+    with too many failed authentications. Memory stays bounded however many
+    addresses connect.
+    """
+    
+    def __init__(self, max_connections=MAX_CONNECTIONS, max_per_ip=MAX_CONNECTIONS_PER_IP,
+                 max_attempts=5, attempt_window=300, ban_duration=600, max_tracked_ips=MAX_TRACKED_IPS):
+        self.max_connections = max_connections
+        self.max_per_ip = max_per_ip
+        self.max_attempts = max_attempts  # Failed attempts within attempt_window before a ban
+        self.attempt_window = attempt_window
+        self.ban_duration = ban_duration
+        self.max_tracked_ips = max_tracked_ips
+        
+        self.lock = threading.Lock()
+        self.active = 0
+        self.active_per_ip = {}  # {ip: open connections}
+        self.attempts = OrderedDict()  # {ip: SlidingWindowCounter}, least recently failed first
+        self.banned = {}  # {ip: ban_expiry_timestamp}
+        self.rejected = 0  # Connections refused by caps or bans
+    
+    def admit(self, conn):
+        """Reserve a slot for a new connection. Returns the reason it is refused, or None."""
+        ip_address = conn.address[0]
+        with self.lock:
+            if self._is_banned(ip_address, time.time()):
+                reason = "IP temporarily banned due to too many failed attempts"
+            elif self.active >= self.max_connections:
+                reason = "Server connection limit reached"
+            elif self.active_per_ip.get(ip_address, 0) >= self.max_per_ip:
+                reason = "Too many connections from this IP"
+            else:
+                self.active += 1
+                self.active_per_ip[ip_address] = self.active_per_ip.get(ip_address, 0) + 1
+                conn.admitted = True
+                return None
+            self.rejected += 1
+            return reason
+    
+    def release(self, conn):
+        """Give back a connection's slot (safe to call more than once)"""
+        ip_address = conn.address[0]
+        with self.lock:
+            if not conn.admitted:
+                return
+            conn.admitted = False
+            self.active -= 1
+            remaining = self.active_per_ip.get(ip_address, 1) - 1
+            if remaining:
+                self.active_per_ip[ip_address] = remaining
+            else:
+                self.active_per_ip.pop(ip_address, None)
+    
+    def is_banned(self, ip_address):
+        with self.lock:
+            return self._is_banned(ip_address, time.time())
+    
+    def _is_banned(self, ip_address, now):
+        expiry = self.banned.get(ip_address)
+        if expiry is None:
+            return False
+        if now < expiry:
+            return True
+        del self.banned[ip_address]
+        return False
+    
+    def record_failure(self, ip_address):
+        """Count a failed authentication. Returns True if the IP is now banned."""
+        now = time.time()
+        with self.lock:
+            counter = self.attempts.get(ip_address)
+            if counter is None:
+                counter = self.attempts[ip_address] = SlidingWindowCounter(self.attempt_window)
+                if len(self.attempts) > self.max_tracked_ips:
+                    self.attempts.popitem(last=False)
+            else:
+                self.attempts.move_to_end(ip_address)
+            counter.add(now)
+            
+            if counter.total(now) >= self.max_attempts:
+                self.banned[ip_address] = now + self.ban_duration
+                del self.attempts[ip_address]
+                return True
+            return False
+    
+    def clear_failures(self, ip_address):
+        with self.lock:
+            self.attempts.pop(ip_address, None)
+    
+    def sweep(self):
+        """Forget expired bans and attempt counters that have left the window"""
+        now = time.time()
+        with self.lock:
+            for ip_address in [ip for ip, expiry in self.banned.items() if expiry <= now]:
+                del self.banned[ip_address]
+            for ip_address in [ip for ip, counter in self.attempts.items() if not counter.total(now)]:
+                del self.attempts[ip_address]
+    
+    def stats(self):
+        with self.lock:
+            return {
+                "active": self.active,
+                "banned": len(self.banned),
+                "tracked_ips": len(self.attempts),
+                "rejected": self.rejected,
+            }
+
 class RemoteServer:
     """TCP server to handle remote connections to the main app"""
     
-    def __init__(self, port=DEFAULT_PORT, command_handler=None):
+    def __init__(self, port=DEFAULT_PORT, command_handler=None, compression_threshold=COMPRESSION_THRESHOLD):
         self.port = port
         self.command_handler = command_handler
+        self.compression_threshold = compression_threshold
+        self.compression_stats = CompressionStats()
+        self.stats_keyframe = None  # Last RESOURCE_STATS keyframe (quantized)
+        self.stats_keyframe_at = 0
         self.server_socket = None
         self.running = False
-        self.client_sockets = {}  # {socket: (address, auth_status)}
+        self.client_sockets = {}  # {socket: ClientConnection}
         self.auth_key = generate_auth_key()
         self.auth_salt, self.auth_hash = hash_auth_key(self.auth_key)
         self.debug_mode = True
         
+        # Session tickets are signed with a per-process secret, so they expire on restart
+        self.ticket_secret = secrets.token_bytes(32)
+        # PBKDF2 is expensive - a small pool with a cap keeps auth floods off the CPU
+        self.auth_pool = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="remote-auth")
+        self.auth_slots = threading.BoundedSemaphore(AUTH_MAX_PENDING)
+        
         # Security enhancements
         self.whitelisted_ips = set()  # Set of allowed IP addresses
-        self.ip_attempts = defaultdict(list)  # Track authentication attempts per IP
-        self.max_attempts = 5  # Max failed attempts before temporary ban
-        self.attempt_window = 300  # 5 minute window for attempts
-        self.ban_duration = 600  # 10 minute ban after max attempts
-        self.banned_ips = {}  # {ip: ban_expiry_timestamp}
+        self.admission = AdmissionController()  # Connection caps, failed attempts and bans
+        self.housekeeping_stop = threading.Event()
         
         remote_logger.info(f"Generated authentication key: {self.auth_key}")
     
@@ -156,13 +985,7 @@ class RemoteServer:
             return False
         
         try:
-            # Check if port is already in use
-            test_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            test_socket.settimeout(1)
-            result = test_socket.connect_ex(('localhost', self.port))
-            test_socket.close()
-            
-            if result == 0:
+            if self._port_in_use():
                 logging.error(f"Port {self.port} is already in use")
                 return False
             
@@ -172,12 +995,13 @@ class RemoteServer:
             
             # Critical fix: Bind to all network interfaces instead of just localhost
             self.server_socket.bind(('0.0.0.0', self.port))
-            self.server_socket.listen(5)
+            self.server_socket.listen(LISTEN_BACKLOG)
             self.running = True
             
             # Start thread to listen for connections
             self.listen_thread = threading.Thread(target=self._listen_for_connections, daemon=True)
             self.listen_thread.start()
+            self._start_housekeeping()
             
             logging.info(f"Remote control server started on port {self.port}")
             logging.info(f"Make sure Windows Firewall allows connections on port {self.port}")
@@ -188,17 +1012,126 @@ class RemoteServer:
             self.server_socket = None
             return False
     
+    def _port_in_use(self):
+        """Check whether something is already listening on our port"""
+        test_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        test_socket.settimeout(1)
+        result = test_socket.connect_ex(('localhost', self.port))
+        test_socket.close()
+        return result == 0
+    
+    def _start_housekeeping(self):
+        """Start the background thread that expires bans and slow handshakes"""
+        self.housekeeping_stop.clear()
+        threading.Thread(target=self._housekeeping, daemon=True).start()
+    
+    def _housekeeping(self):
+        """Thread function: periodic cleanup that must not wait for a client to come back"""
+        last_sweep = time.time()
+        while not self.housekeeping_stop.wait(1):
+            now = time.time()
+            
+            for conn in list(self.client_sockets.values()):
+                if not conn.authenticated:
+                    # Enforce the pre-auth deadline even on clients trickling bytes
+                    if now - conn.connected_at > PRE_AUTH_TIMEOUT:
+                        logging.warning(f"Authentication timed out for {conn.address[0]}:{conn.address[1]}")
+                        self._close_client(conn)
+                elif conn.heartbeat:
+                    self._check_heartbeat(conn, now)
+            
+            if now - last_sweep >= BAN_SWEEP_INTERVAL:
+                self.admission.sweep()
+                last_sweep = now
+    
+    def _check_heartbeat(self, conn, now):
+        """Reap a client that has gone silent, otherwise ping it when due"""
+        # A client waiting on a long command (RESTART_SERVER) is not silent - its frames are not being read
+        if now - conn.last_seen > HEARTBEAT_TIMEOUT and not conn.busy:
+            logging.warning(
+                f"No heartbeat from {conn.address[0]}:{conn.address[1]} "
+                f"for {int(now - conn.last_seen)}s, disconnecting"
+            )
+            self._close_client(conn)
+        elif now - conn.last_ping >= HEARTBEAT_INTERVAL:
+            conn.last_ping = now
+            ping = RemoteMessage(command=CMD_HEARTBEAT, data={"sent": time.monotonic()})
+            self._enqueue_frame(conn, self._encode_for(conn, ping), CMD_HEARTBEAT, POLICY_LATEST)
+    
+    def _handle_heartbeat(self, conn, message):
+        """
+        Answer a client's HEARTBEAT or record the RTT of our own.
+        Returns True if the message was a heartbeat and needs no further handling.
+        """
+        if message.command != CMD_HEARTBEAT:
+            return False
+        if message.status == STATUS_OK:
+            # Reply to our ping: data["sent"] is the server's own monotonic clock
+            sent = message.data.get("sent")
+            if isinstance(sent, (int, float)):
+                conn.rtt = time.monotonic() - sent
+        else:
+            self.send_to_client(conn, RemoteMessage(
+                command=CMD_HEARTBEAT,
+                status=STATUS_OK,
+                data=message.data,
+                request_id=message.request_id
+            ))
+        return True
+    
+    def _handle_subscription(self, conn, message):
+        """
+        Apply a SUBSCRIBE or UNSUBSCRIBE command to the connection's topics.
+        Returns True if the message was one of them and needs no further handling.
+        """
+        if message.command not in (CMD_SUBSCRIBE, CMD_UNSUBSCRIBE):
+            return False
+        
+        topics = message.data.get("topics") or []
+        if isinstance(topics, str):
+            topics = [topics]
+        requested = ALL_TOPICS if "*" in topics else set(topics)
+        unknown = requested - ALL_TOPICS
+        if unknown:
+            self.send_to_client(conn, RemoteMessage(
+                command=message.command,
+                status=STATUS_ERROR,
+                message=f"Unknown topics: {', '.join(sorted(map(str, unknown)))}",
+                data={"topics": sorted(conn.topics), "available": sorted(ALL_TOPICS)},
+                request_id=message.request_id
+            ))
+            return True
+        
+        if message.command == CMD_SUBSCRIBE:
+            conn.topics = frozenset(conn.topics | requested)
+        else:
+            conn.topics = frozenset(conn.topics - requested)
+        
+        self.send_to_client(conn, RemoteMessage(
+            command=message.command,
+            status=STATUS_OK,
+            data={"topics": sorted(conn.topics)},
+            request_id=message.request_id
+        ))
+        return True
+    
+    def has_subscribers(self, topic):
+        """True if any authenticated client wants broadcasts for this topic"""
+        return any(
+            conn.authenticated and topic in conn.topics
+            for conn in list(self.client_sockets.values())
+        )
+    
     def stop(self):
         """Stop the server"""
         self.running = False
+        self.housekeeping_stop.set()
         
         # Close all client connections
-        for sock in list(self.client_sockets.keys()):
-            try:
-                sock.close()
-            except:
-                pass
+        for conn in list(self.client_sockets.values()):
+            self._close_client(conn)
         self.client_sockets.clear()
+        self.auth_pool.shutdown(wait=False)
         
         # Close server socket
         if self.server_socket:
@@ -220,13 +1153,29 @@ class RemoteServer:
                 logging.info(f"New connection from {address[0]}:{address[1]}")
                 
                 # Set up client socket
-                client_socket.settimeout(30)  # 30 seconds timeout for client operations
-                self.client_sockets[client_socket] = (address, False)  # Not authenticated yet
+                client_socket.settimeout(PRE_AUTH_TIMEOUT)
+                client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                conn = ClientConnection(client_socket, address)  # Not authenticated yet
+                
+                # Refuse over-limit and banned clients here, before they cost a thread
+                rejection = self._admit(conn)
+                if rejection:
+                    self._send_message(client_socket, RemoteMessage(
+                        command="AUTH",
+                        status=STATUS_ERROR,
+                        message=rejection
+                    ))
+                    self._close_client(conn)
+                    continue
+                
+                conn.reader = FrameReader(client_socket)
+                conn.reader.max_size = MAX_AUTH_MESSAGE_SIZE
+                self.client_sockets[client_socket] = conn
                 
                 # Start thread to handle this client
                 client_thread = threading.Thread(
                     target=self._handle_client,
-                    args=(client_socket, address),
+                    args=(conn,),
                     daemon=True
                 )
                 client_thread.start()
@@ -251,79 +1200,140 @@ class RemoteServer:
     
     def is_ip_banned(self, ip_address):
         """Check if an IP is currently banned"""
-        if ip_address in self.banned_ips:
-            if time.time() < self.banned_ips[ip_address]:
-                return True
-            else:
-                # Ban expired, remove it
-                del self.banned_ips[ip_address]
-                return False
-        return False
+        return self.admission.is_banned(ip_address)
     
     def record_failed_attempt(self, ip_address):
-        """Record a failed authentication attempt"""
-        current_time = time.time()
+        """Record a failed authentication attempt. Returns True if the IP got banned."""
+        banned = self.admission.record_failure(ip_address)
+        if banned:
+            remote_logger.warning(
+                f"IP {ip_address} banned for {self.admission.ban_duration}s "
+                f"after {self.admission.max_attempts} failed attempts"
+            )
+        return banned
+    
+    def clear_failed_attempts(self, ip_address):
+        """Clear failed attempts for an IP (after successful auth)"""
+        self.admission.clear_failures(ip_address)
+    
+    def _admit(self, conn):
+        """Return the reason a new connection must be refused, or None once it holds a slot"""
+        ip_address = conn.address[0]
+        if self.whitelisted_ips and ip_address not in self.whitelisted_ips:
+            remote_logger.warning(f"Rejected connection from non-whitelisted IP: {ip_address}")
+            return "IP not whitelisted"
         
-        # Clean old attempts outside the window
-        self.ip_attempts[ip_address] = [
-            t for t in self.ip_attempts[ip_address]
-            if current_time - t < self.attempt_window
-        ]
+        rejection = self.admission.admit(conn)
+        if rejection:
+            remote_logger.warning(f"Rejected connection from {ip_address}: {rejection}")
+        return rejection
+    
+    def _on_auth_success(self, address):
+        """Bookkeeping after a client authenticated successfully"""
+        ip_address = address[0]
+        logging.info(f"Client authenticated: {ip_address}:{address[1]}")
         
-        # Add new attempt
-        self.ip_attempts[ip_address].append(current_time)
+        # Clear any failed attempts
+        self.clear_failed_attempts(ip_address)
         
-        # Check if should be banned
-        if len(self.ip_attempts[ip_address]) >= self.max_attempts:
-            self.banned_ips[ip_address] = current_time + self.ban_duration
-            remote_logger.warning(f"IP {ip_address} banned for {self.ban_duration}s after {self.max_attempts} failed attempts")
+        # Auto-whitelist successful connections
+        if ip_address not in self.whitelisted_ips:
+            self.add_whitelisted_ip(ip_address)
+    
+    def issue_ticket(self):
+        """Create a signed session ticket that is valid for TICKET_LIFETIME seconds"""
+        body = f"{int(time.time()) + TICKET_LIFETIME}.{secrets.token_hex(8)}"
+        return f"{body}.{self._sign_ticket(body)}"
+    
+    def _sign_ticket(self, body):
+        # The key hash is part of the signature so changing the key revokes every ticket
+        return hmac.new(self.ticket_secret, body.encode('utf-8') + self.auth_hash, hashlib.sha256).hexdigest()
+    
+    def verify_ticket(self, ticket):
+        """Check a session ticket's signature and expiry (cheap - no PBKDF2)"""
+        try:
+            body, signature = ticket.rsplit('.', 1)
+            expiry = int(body.split('.', 1)[0])
+        except (AttributeError, ValueError):
+            return False
+        if expiry < time.time():
+            return False
+        try:
+            # Bytes - compare_digest raises TypeError on non-ASCII str
+            return hmac.compare_digest(signature.encode('utf-8'), self._sign_ticket(body).encode('ascii'))
+        except UnicodeEncodeError:  # Lone surrogates from a crafted JSON ticket
+            return False
+    
+    def _fast_auth(self, data):
+        """Credentials that can be checked without PBKDF2: a valid ticket or the exact key"""
+        ticket = data.get("ticket")
+        if ticket and self.verify_ticket(ticket):
             return True
-        
-        return False
+        provided_key = data.get("auth_key", "")
+        return bool(provided_key) and hmac.compare_digest(
+            str(provided_key).encode('utf-8'), self.auth_key.encode('utf-8')
+        )
     
-    def clear_failed_attempts(self, ip_address):
-        """Clear failed attempts for an IP (after successful auth)"""
-        if ip_address in self.ip_attempts:
-            del self.ip_attempts[ip_address]
+    def _authenticate_client(self, data):
+        """
+        Check the credentials in an AUTH reply. Returns True or False, or None
+        if too many slow key checks are already running.
+        """
+        if self._fast_auth(data):
+            return True
+        if not self.auth_slots.acquire(blocking=False):
+            return None
+        try:
+            return self.auth_pool.submit(self.verify_auth_key, data.get("auth_key", "")).result()
+        finally:
+            self.auth_slots.release()
+    
+    def _session_features(self, conn, auth_response):
+        """
+        Protocol features announced to a client in the AUTH success reply.
+        Picks the wire codec and frame compression from the ones the client
+        offered; clients that offer nothing keep uncompressed JSON.
+        """
+        conn.codec = negotiate_codec(auth_response.data.get("codecs"))
+        conn.compressor = negotiate_compressor(auth_response.data.get("compression"))
+        conn.heartbeat = bool(auth_response.data.get("heartbeat"))
+        conn.log_batch = bool(auth_response.data.get("log_batch"))
+        conn.stats_delta = bool(auth_response.data.get("stats_delta"))
+        return {
+            "request_ids": True,
+            "codec": conn.codec.name,
+            "compression": conn.compressor.name if conn.compressor else None,
+            "ticket": self.issue_ticket(),
+            "heartbeat": True,
+        }
     
-    def _handle_client(self, client_socket, address):
+    def _dispatch_command(self, message, address):
+        """Run the registered command handler and return the response to send"""
+        logging.info(f"Received command {message.command} from {address[0]}:{address[1]}")
+        
+        if self.command_handler:
+            response = self.command_handler(message)
+        else:
+            response = RemoteMessage(
+                command=message.command,
+                status=STATUS_ERROR,
+                message="No command handler registered"
+            )
+        
+        # Echo the request ID so the client can match the reply to its command
+        if response and response.request_id is None:
+            response.request_id = message.request_id
+        return response
+    
+    def _handle_client(self, conn):
         """Handle communication with a client"""
+        client_socket = conn.transport
+        address = conn.address
         ip_address = address[0]
         logging.info(f"Handling connection from {ip_address}:{address[1]}")
         
         try:
-            # Check if IP is banned
-            if self.is_ip_banned(ip_address):
-                remote_logger.warning(f"Rejected connection from banned IP: {ip_address}")
-                ban_msg = RemoteMessage(
-                    command="AUTH",
-                    status=STATUS_ERROR,
-                    message="IP temporarily banned due to too many failed attempts"
-                )
-                self._send_message(client_socket, ban_msg)
-                client_socket.close()
-                if client_socket in self.client_sockets:
-                    del self.client_sockets[client_socket]
-                return
-            
-            # Check whitelist if enabled
-            if self.whitelisted_ips and ip_address not in self.whitelisted_ips:
-                remote_logger.warning(f"Rejected connection from non-whitelisted IP: {ip_address}")
-                whitelist_msg = RemoteMessage(
-                    command="AUTH",
-                    status=STATUS_ERROR,
-                    message="IP not whitelisted"
-                )
-                self._send_message(client_socket, whitelist_msg)
-                client_socket.close()
-                if client_socket in self.client_sockets:
-                    del self.client_sockets[client_socket]
-                return
-            
-            # Set a longer timeout during authentication
-            client_socket.settimeout(30)
-            
-            # Exchange authentication
+            # Exchange authentication (the socket still has the short pre-auth timeout)
             auth_required = RemoteMessage(
                 command="AUTH",
                 status=STATUS_AUTH_REQUIRED,
@@ -334,42 +1344,49 @@ class RemoteServer:
             
             # Wait for auth response
             logging.info(f"Waiting for auth response from {ip_address}:{address[1]}")
-            auth_response = self._receive_message(client_socket)
+            auth_response = self._receive_message(conn)
             if not auth_response or auth_response.command != "AUTH":
                 logging.warning(f"Invalid authentication response from {ip_address}:{address[1]}")
                 self.record_failed_attempt(ip_address)
-                client_socket.close()
-                if client_socket in self.client_sockets:
-                    del self.client_sockets[client_socket]
+                self._close_client(conn)
                 return
             
-            # Verify auth key
+            # Verify session ticket or auth key
             logging.info(f"Received auth response from {ip_address}:{address[1]}")
-            provided_key = auth_response.data.get("auth_key", "")
-            if self.verify_auth_key(provided_key):
-                logging.info(f"Client authenticated: {ip_address}:{address[1]}")
-                self.client_sockets[client_socket] = (address, True)  # Mark as authenticated
-                
-                # Clear any failed attempts
-                self.clear_failed_attempts(ip_address)
-                
-                # Auto-whitelist successful connections
-                if ip_address not in self.whitelisted_ips:
-                    self.add_whitelisted_ip(ip_address)
+            authenticated = self._authenticate_client(auth_response.data)
+            if authenticated is None:
+                logging.warning(f"Too many pending authentications, refusing {ip_address}:{address[1]}")
+                self._send_message(client_socket, RemoteMessage(
+                    command="AUTH",
+                    status=STATUS_ERROR,
+                    message="Server busy - try again shortly"
+                ))
+                self._close_client(conn)
+                return
+            
+            if authenticated:
+                self._on_auth_success(address)
                 
                 auth_success = RemoteMessage(
                     command="AUTH",
                     status=STATUS_OK,
-                    message="Authentication successful"
+                    message="Authentication successful",
+                    data=self._session_features(conn, auth_response)
                 )
                 self._send_message(client_socket, auth_success)
                 
+                # From here on every outgoing frame goes through the client's queue
+                conn.writer = threading.Thread(target=self._write_client_frames, args=(conn,), daemon=True)
+                conn.writer.start()
+                conn.authenticated = True
+                conn.reader.max_size = MAX_MESSAGE_SIZE
+                
                 # Set socket to blocking mode for command processing
                 client_socket.settimeout(None)
                 logging.info(f"Entering command loop for {ip_address}:{address[1]} (blocking mode)")
                 
                 # Process commands from this client
-                self._process_client_commands(client_socket, address)
+                self._process_client_commands(conn)
             else:
                 logging.warning(f"Authentication failed for {ip_address}:{address[1]}")
                 
@@ -382,18 +1399,11 @@ class RemoteServer:
                     message="Authentication failed" + (" - IP temporarily banned" if banned else "")
                 )
                 self._send_message(client_socket, auth_failed)
-                client_socket.close()
-                if client_socket in self.client_sockets:
-                    del self.client_sockets[client_socket]
+                self._close_client(conn)
         
         except Exception as e:
             logging.error(f"Error handling client {ip_address}:{address[1]}: {str(e)}")
-            try:
-                client_socket.close()
-            except:
-                pass
-            if client_socket in self.client_sockets:
-                del self.client_sockets[client_socket]
+            self._close_client(conn)
     
     def verify_auth_key(self, provided_key):
         """Verify the authentication key provided by a client"""
@@ -414,29 +1424,29 @@ class RemoteServer:
             logging.error(f"Auth verification error: {str(e)}")
             return False
             
-    def _process_client_commands(self, client_socket, address):
+    def _process_client_commands(self, conn):
         """Process commands from an authenticated client"""
+        address = conn.address
         logging.info(f"Started command loop for {address[0]}:{address[1]}")
         while self.running:
             try:
-                message = self._receive_message(client_socket)
+                message = self._receive_message(conn)
                 if not message:
                     logging.info(f"Client {address[0]}:{address[1]} connection closed or no message received")
                     break
                 
-                logging.info(f"Received command {message.command} from {address[0]}:{address[1]}")
+                conn.last_seen = time.time()
+                if self._handle_heartbeat(conn, message) or self._handle_subscription(conn, message):
+                    continue
                 
-                if self.command_handler:
-                    response = self.command_handler(message)
-                    if response:
-                        self._send_message(client_socket, response)
-                else:
-                    response = RemoteMessage(
-                        command=message.command,
-                        status=STATUS_ERROR,
-                        message="No command handler registered"
-                    )
-                    self._send_message(client_socket, response)
+                conn.busy = True
+                try:
+                    response = self._dispatch_command(message, address)
+                finally:
+                    conn.busy = False
+                    conn.last_seen = time.time()
+                if response:
+                    self.send_to_client(conn, response)
             
             except socket.timeout:
                 # Timeout is fine - just means no message received
@@ -449,26 +1459,65 @@ class RemoteServer:
                 break
         
         # Clean up when done
+        self._close_client(conn)
+        logging.info(f"Client disconnected: {address[0]}:{address[1]}")
+    
+    def _write_client_frames(self, conn):
+        """Writer thread: drain one client's outbound queue onto its socket"""
+        while True:
+            frame = conn.queue.get(timeout=1)
+            if frame is None:
+                if conn.queue.closed:
+                    break
+                continue
+            try:
+                conn.transport.sendall(frame)
+            except Exception as e:
+                if self.running and self.debug_mode:
+                    logging.error(f"Error sending to {conn.address[0]}:{conn.address[1]}: {str(e)}")
+                self._close_client(conn)
+                break
+    
+    def _close_client(self, conn):
+        """Close a client connection and forget it"""
+        conn.queue.close()
+        self.admission.release(conn)
         try:
-            client_socket.close()
+            # shutdown() wakes up a reader blocked in recv() on another thread
+            conn.transport.shutdown(socket.SHUT_RDWR)
         except:
             pass
-        if client_socket in self.client_sockets:
-            del self.client_sockets[client_socket]
-        logging.info(f"Client disconnected: {address[0]}:{address[1]}")
+        try:
+            conn.transport.close()
+        except:
+            pass
+        self.client_sockets.pop(conn.transport, None)
+    
+    def _enqueue_frame(self, conn, frame, command=None, policy=POLICY_KEEP):
+        """Queue an encoded frame for a client, dropping the client if it has stalled"""
+        if not conn.queue.put(frame, command, policy):
+            if not conn.queue.closed:
+                remote_logger.warning(
+                    f"Disconnecting stalled client {conn.address[0]}:{conn.address[1]} "
+                    f"({len(conn.queue)} frames queued)"
+                )
+                self._close_client(conn)
+            return False
+        return True
+    
+    def send_to_client(self, conn, message):
+        """Queue a message for one client. Direct replies are never dropped."""
+        return self._enqueue_frame(conn, self._encode_for(conn, message), message.command, POLICY_KEEP)
+    
+    def _encode_for(self, conn, message):
+        """Encode a frame with a client's negotiated codec and compression"""
+        return encode_frame(message, conn.codec, conn.compressor, self.compression_threshold, self.compression_stats)
     
     def _send_message(self, client_socket, message):
-        """Send a message to a client"""
+        """Send a message directly on a socket (only used before the writer starts)"""
         try:
-            json_str = message.to_json()
-            data = json_str.encode('utf-8')
-            
-            # Send message length as 4 bytes
-            length = len(data)
-            client_socket.sendall(length.to_bytes(4, byteorder='big'))
-            
-            # Send the actual message
-            client_socket.sendall(data)
+            # Length header and payload go out in a single call
+            client_socket.sendall(encode_frame(message))
             return True
         
         except Exception as e:
@@ -476,68 +1525,406 @@ class RemoteServer:
                 logging.error(f"Error sending message: {str(e)}")
             return False
     
-    def _receive_message(self, client_socket):
-        """Receive a message from a client"""
+    def _receive_message(self, conn):
+        """Receive a message from a client with its negotiated wire format"""
         try:
-            # Get message length (4 bytes)
-            length_bytes = client_socket.recv(4)
-            if not length_bytes:
+            frame = conn.reader.read_frame()
+            if not frame:
                 return None
             
-            if len(length_bytes) != 4:
-                remote_logger.error(f"Incomplete length header received: {len(length_bytes)} bytes")
-                return None
+            # Decode straight from the reader's buffer
+            payload, compressed = frame
+            return decode_frame_payload(payload, conn.codec, conn.compressor, compressed, self.compression_stats)
+        
+        except Exception as e:
+            if self.debug_mode:
+                logging.error(f"Error receiving message: {str(e)}")
+            return None
+    
+    def broadcast_message(self, message, topic=None):
+        """
+        Broadcast a message to all authenticated clients subscribed to its topic
+        (looked up in BROADCAST_TOPICS unless given; messages without a topic
+        go to everyone). The message is serialized once per wire format in use
+        and queued for every client, so the calling thread never waits on a
+        slow connection.
+        """
+        self._queue_broadcast(self._subscribers(topic or BROADCAST_TOPICS.get(message.command)), message)
+    
+    def broadcast_log_lines(self, lines):
+        """
+        Broadcast log lines ({"message", "timestamp"} dicts) to clients subscribed
+        to logs: one LOG_BATCH frame for clients that support it, one
+        LOG_MESSAGE frame per line for older clients.
+        """
+        subscribers = self._subscribers(TOPIC_LOGS)
+        batched = [conn for conn in subscribers if conn.log_batch]
+        legacy = [conn for conn in subscribers if not conn.log_batch]
+        
+        if batched:
+            self._queue_broadcast(batched, RemoteMessage(command=CMD_LOG_BATCH, data={"lines": lines}))
+        if legacy:
+            for line in lines:
+                self._queue_broadcast(legacy, RemoteMessage(command=CMD_LOG_MESSAGE, data=line))
+    
+    def broadcast_resource_stats(self, stats):
+        """
+        Broadcast a resource stats sample. Clients that negotiated stats_delta
+        get a keyframe when they connect and every STATS_KEYFRAME_INTERVAL
+        seconds, and otherwise only the fields that differ from that keyframe,
+        rounded to display precision. Because deltas are relative to the
+        keyframe (which is never dropped), a client that misses deltas on a
+        slow link still rebuilds the right values. Older clients get the full
+        stats dict every time.
+        """
+        subscribers = self._subscribers(TOPIC_RESOURCES)
+        streaming = [conn for conn in subscribers if conn.stats_delta]
+        legacy = [conn for conn in subscribers if not conn.stats_delta]
+        
+        if legacy:
+            self._queue_broadcast(legacy, RemoteMessage(command=CMD_RESOURCE_STATS, status=STATUS_OK, data=stats))
+        if not streaming:
+            return
+        
+        sample = quantize_stats(stats)
+        now = time.time()
+        if self.stats_keyframe is None or now - self.stats_keyframe_at >= STATS_KEYFRAME_INTERVAL:
+            self.stats_keyframe = sample
+            self.stats_keyframe_at = now
+            for conn in streaming:
+                conn.stats_synced = False
+        
+        unsynced = [conn for conn in streaming if not conn.stats_synced]
+        if unsynced:
+            keyframe = dict(self.stats_keyframe, keyframe=True)
+            self._queue_broadcast(unsynced, RemoteMessage(command=CMD_RESOURCE_STATS, data=keyframe), POLICY_KEEP)
+            for conn in unsynced:
+                conn.stats_synced = True
+        
+        if sample is not self.stats_keyframe:
+            delta = {key: value for key, value in sample.items() if self.stats_keyframe.get(key) != value}
+            delta["delta"] = True
+            self._queue_broadcast(streaming, RemoteMessage(command=CMD_RESOURCE_STATS, data=delta))
+    
+    def _subscribers(self, topic):
+        """Authenticated clients that receive broadcasts for a topic (None means everyone)"""
+        return [
+            conn for conn in list(self.client_sockets.values())
+            if conn.authenticated and (topic is None or topic in conn.topics)
+        ]
+    
+    def _queue_broadcast(self, conns, message, policy=None):
+        """Encode a message once per wire format and queue it for each client"""
+        frames = {}
+        policy = policy or BROADCAST_DROP_POLICIES.get(message.command, POLICY_KEEP)
+        for conn in conns:
+            wire_format = (conn.codec.name, conn.compressor.name if conn.compressor else None)
+            frame = frames.get(wire_format)
+            if frame is None:
+                frame = frames[wire_format] = self._encode_for(conn, message)
+            self._enqueue_frame(conn, frame, message.command, policy)
+
+class AsyncRemoteServer(RemoteServer):
+    """
+    Remote control server that serves every connection from a single asyncio
+    event loop. Uses the same length-prefixed framing and authentication as
+    RemoteServer; blocking command handlers and key verification run in a
+    bounded thread pool so they never stall the loop.
+    """
+    
+    def __init__(self, port=DEFAULT_PORT, command_handler=None, max_workers=DEFAULT_EXECUTOR_WORKERS,
+                 compression_threshold=COMPRESSION_THRESHOLD):
+        super().__init__(port=port, command_handler=command_handler, compression_threshold=compression_threshold)
+        self.max_workers = max_workers
+        self.executor = None
+        self.loop = None
+        self.loop_thread = None
+        self.aio_server = None
+        # client_sockets is keyed by asyncio.StreamWriter: {writer: ClientConnection}
+    
+    def start(self):
+        """Start the event loop in a background thread"""
+        if self.running:
+            return False
+        
+        try:
+            if self._port_in_use():
+                logging.error(f"Port {self.port} is already in use")
+                return False
             
-            length = int.from_bytes(length_bytes, byteorder='big')
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="remote-cmd"
+            )
+            self.loop = asyncio.new_event_loop()
             
-            # Sanity check on message length
-            if length <= 0 or length > 10 * 1024 * 1024:  # Max 10MB message
-                remote_logger.error(f"Invalid message length: {length}")
-                return None
+            # Bind in the calling thread so start() can report failures
+            self.aio_server = self.loop.run_until_complete(asyncio.start_server(
+                self._handle_connection,
+                host='0.0.0.0',
+                port=self.port,
+                reuse_address=True,
+                backlog=LISTEN_BACKLOG,
+                limit=MAX_MESSAGE_SIZE + 4
+            ))
+            self.running = True
             
-            # Get the message data
-            data = b''
-            while len(data) < length:
-                remaining = length - len(data)
-                chunk = client_socket.recv(min(4096, remaining))
-                if not chunk:
-                    remote_logger.error(f"Connection closed while receiving message. Got {len(data)}/{length} bytes")
-                    return None
-                data += chunk
+            self.loop_thread = threading.Thread(target=self._run_loop, daemon=True)
+            self.loop_thread.start()
+            self._start_housekeeping()
             
-            # Parse the message
+            logging.info(f"Remote control server (asyncio) started on port {self.port}")
+            logging.info(f"Make sure Windows Firewall allows connections on port {self.port}")
+            return True
+            
+        except Exception as e:
+            logging.error(f"Failed to start remote server: {str(e)}")
+            self._shutdown_loop()
+            return False
+    
+    def _run_loop(self):
+        """Thread function that runs the event loop until stop() is called"""
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self._shutdown_loop()
+    
+    def _shutdown_loop(self):
+        """Close the listening socket, the loop and the executor"""
+        if self.loop and not self.loop.is_closed():
             try:
-                json_str = data.decode('utf-8')
-                return RemoteMessage.from_json(json_str)
-            except UnicodeDecodeError as e:
-                remote_logger.error(f"Failed to decode message as UTF-8: {e}")
-                remote_logger.error(f"First 100 bytes: {data[:100]}")
-                return None
+                if self.aio_server:
+                    self.aio_server.close()
+                    self.loop.run_until_complete(self.aio_server.wait_closed())
+                pending = asyncio.all_tasks(self.loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                self.loop.close()
+            except Exception as e:
+                logging.error(f"Error shutting down remote server loop: {str(e)}")
+        self.aio_server = None
         
-        except Exception as e:
-            if self.debug_mode:
-                logging.error(f"Error receiving message: {str(e)}")
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        self.auth_pool.shutdown(wait=False)
+    
+    def stop(self):
+        """Stop the server"""
+        self.running = False
+        self.housekeeping_stop.set()
+        
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._close_all_clients)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            if self.loop_thread and threading.current_thread() != self.loop_thread:
+                self.loop_thread.join(timeout=5)
+        else:
+            self._shutdown_loop()
+        
+        self.client_sockets.clear()
+        logging.info("Remote control server stopped")
+    
+    def _close_all_clients(self):
+        """Close every client transport (runs on the loop)"""
+        for conn in list(self.client_sockets.values()):
+            conn.queue.close()
+            self.admission.release(conn)
+            conn.transport.close()
+        self.client_sockets.clear()
+    
+    def _close_client(self, conn):
+        """Close a client connection and forget it (safe from any thread)"""
+        conn.queue.close()
+        self.admission.release(conn)
+        self.client_sockets.pop(conn.transport, None)
+        self._call_in_loop(conn.transport.close)
+    
+    def _call_in_loop(self, callback):
+        """Schedule a callback on the event loop from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            # Loop already closed
+            pass
+    
+    async def _authenticate_client_async(self, data):
+        """Same as RemoteServer._authenticate_client, without blocking the loop"""
+        if self._fast_auth(data):
+            return True
+        if not self.auth_slots.acquire(blocking=False):
             return None
+        try:
+            # PBKDF2 is CPU bound - keep it off the event loop
+            return await self.loop.run_in_executor(
+                self.auth_pool, self.verify_auth_key, data.get("auth_key", "")
+            )
+        finally:
+            self.auth_slots.release()
     
-    def broadcast_message(self, message):
-        """Broadcast a message to all authenticated clients"""
-        for client_socket, (address, is_authenticated) in list(self.client_sockets.items()):
-            if is_authenticated:
-                try:
-                    self._send_message(client_socket, message)
-                except:
-                    # Client probably disconnected
-                    try:
-                        client_socket.close()
-                    except:
-                        pass
-                    if client_socket in self.client_sockets:
-                        del self.client_sockets[client_socket]
+    async def _read_message(self, reader, conn=None, max_size=MAX_MESSAGE_SIZE):
+        """Read one length-prefixed message from a stream (conn supplies the negotiated wire format)"""
+        length_bytes = await reader.readexactly(4)
+        length, compressed = parse_frame_header(length_bytes)
+        
+        if length <= 0 or length > max_size:
+            remote_logger.error(f"Invalid message length: {length}")
+            return None
+        
+        data = await reader.readexactly(length)
+        if conn:
+            return decode_frame_payload(data, conn.codec, conn.compressor, compressed, self.compression_stats)
+        return decode_frame_payload(data, compressed=compressed)
+    
+    async def _write_message(self, writer, message):
+        """Write one message to a stream and wait for the buffer to drain"""
+        writer.write(encode_frame(message))
+        await writer.drain()
+    
+    async def _write_client_frames(self, conn, wakeup):
+        """Writer task: drain one client's outbound queue onto its transport"""
+        writer = conn.transport
+        try:
+            while not conn.queue.closed:
+                await wakeup.wait()
+                wakeup.clear()
+                frames = conn.queue.get_all_nowait()
+                if frames:
+                    writer.writelines(frames)
+                    # Only this client's task waits here if its link is slow
+                    await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            if self.running and self.debug_mode:
+                logging.error(f"Error sending to {conn.address[0]}:{conn.address[1]}: {str(e)}")
+        finally:
+            self._close_client(conn)
+    
+    async def _run_command(self, conn, message, in_flight):
+        """Run one command in the executor and queue its reply"""
+        try:
+            response = await self.loop.run_in_executor(
+                self.executor, self._dispatch_command, message, conn.address
+            )
+            if response:
+                self.send_to_client(conn, response)
+        except Exception as e:
+            logging.error(f"Error running command {message.command}: {str(e)}")
+        finally:
+            in_flight.release()
+    
+    async def _handle_connection(self, reader, writer):
+        """Coroutine serving a single client from accept to disconnect"""
+        address = writer.get_extra_info('peername')[:2]
+        ip_address = address[0]
+        logging.info(f"New connection from {ip_address}:{address[1]}")
+        conn = ClientConnection(writer, address)  # Not authenticated yet
+        
+        try:
+            rejection = self._admit(conn)
+            if rejection:
+                await self._write_message(writer, RemoteMessage(
+                    command="AUTH",
+                    status=STATUS_ERROR,
+                    message=rejection
+                ))
+                return
+            self.client_sockets[writer] = conn
+            
+            await self._write_message(writer, RemoteMessage(
+                command="AUTH",
+                status=STATUS_AUTH_REQUIRED,
+                message="Authentication required"
+            ))
+            
+            auth_response = await asyncio.wait_for(
+                self._read_message(reader, max_size=MAX_AUTH_MESSAGE_SIZE), timeout=PRE_AUTH_TIMEOUT
+            )
+            if not auth_response or auth_response.command != "AUTH":
+                logging.warning(f"Invalid authentication response from {ip_address}:{address[1]}")
+                self.record_failed_attempt(ip_address)
+                return
+            
+            authenticated = await self._authenticate_client_async(auth_response.data)
+            if authenticated is None:
+                logging.warning(f"Too many pending authentications, refusing {ip_address}:{address[1]}")
+                await self._write_message(writer, RemoteMessage(
+                    command="AUTH",
+                    status=STATUS_ERROR,
+                    message="Server busy - try again shortly"
+                ))
+                return
+            if not authenticated:
+                logging.warning(f"Authentication failed for {ip_address}:{address[1]}")
+                banned = self.record_failed_attempt(ip_address)
+                await self._write_message(writer, RemoteMessage(
+                    command="AUTH",
+                    status=STATUS_AUTH_FAILED,
+                    message="Authentication failed" + (" - IP temporarily banned" if banned else "")
+                ))
+                return
+            
+            self._on_auth_success(address)
+            await self._write_message(writer, RemoteMessage(
+                command="AUTH",
+                status=STATUS_OK,
+                message="Authentication successful",
+                data=self._session_features(conn, auth_response)
+            ))
+            
+            # From here on every outgoing frame goes through the client's queue
+            wakeup = asyncio.Event()
+            conn.queue.on_put = lambda: self._call_in_loop(wakeup.set)
+            conn.writer = self.loop.create_task(self._write_client_frames(conn, wakeup))
+            conn.authenticated = True
+            
+            # Command loop - handlers are blocking, so they run in the executor.
+            # Pipelined commands run concurrently; replies carry the request ID.
+            in_flight = asyncio.Semaphore(MAX_COMMANDS_IN_FLIGHT)
+            while self.running and not conn.queue.closed:
+                message = await self._read_message(reader, conn)
+                if not message:
+                    break
+                
+                conn.last_seen = time.time()
+                if self._handle_heartbeat(conn, message) or self._handle_subscription(conn, message):
+                    continue
+                
+                await in_flight.acquire()
+                self.loop.create_task(self._run_command(conn, message, in_flight))
+        
+        except asyncio.TimeoutError:
+            logging.warning(f"Authentication timed out for {ip_address}:{address[1]}")
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Client went away or the server is shutting down
+            pass
+        except Exception as e:
+            if self.running:
+                logging.error(f"Error handling client {ip_address}:{address[1]}: {str(e)}")
+        finally:
+            self._close_client(conn)
+            logging.info(f"Client disconnected: {ip_address}:{address[1]}")
+
+def create_remote_server(port=DEFAULT_PORT, command_handler=None, engine=ENGINE_THREADED,
+                         max_workers=DEFAULT_EXECUTOR_WORKERS, compression_threshold=COMPRESSION_THRESHOLD):
+    """Create a remote server using the configured engine"""
+    if engine == ENGINE_ASYNCIO:
+        return AsyncRemoteServer(port=port, command_handler=command_handler, max_workers=max_workers,
+                                 compression_threshold=compression_threshold)
+    
+    if engine != ENGINE_THREADED:
+        logging.warning(f"Unknown remote server engine '{engine}', using {ENGINE_THREADED}")
+    return RemoteServer(port=port, command_handler=command_handler, compression_threshold=compression_threshold)
 
 class RemoteClient:
     """Client for connecting to the remote control server"""
     
-    def __init__(self, host=None, port=40100, auth_key=None, message_handler=None, server_ip=None):
+    def __init__(self, host=None, port=40100, auth_key=None, message_handler=None, server_ip=None,
+                 session_ticket=None):
         # Support both 'host' and 'server_ip' parameter names for backward compatibility
         self.host = host if host is not None else server_ip
         if not self.host:
@@ -547,14 +1934,33 @@ class RemoteClient:
         self.message_handler = message_handler
         
         self.client_socket = None
+        self.frame_reader = None
         self.connected = False
         self.authenticated = False
         self.listener_thread = None
         self.running = False
         
-        # Add a lock for socket operations to prevent concurrent access
+        # Only sends need a lock - a single reader thread owns all receives
         self.socket_lock = threading.Lock()
         
+        # Replies waiting to be routed: {request_id: Future}
+        self.pending_requests = OrderedDict()
+        self.pending_lock = threading.Lock()
+        self.request_ids = itertools.count(1)
+        self.server_supports_request_ids = False
+        self.codec = JSON_CODEC  # Negotiated during AUTH
+        self.compressor = None  # Negotiated during AUTH
+        self.session_ticket = session_ticket  # Lets a reconnect skip the server's key check
+        
+        # Heartbeats (only when the server announces support during AUTH)
+        self.server_supports_heartbeat = False
+        self.heartbeat_thread = None
+        self.heartbeat_stop = threading.Event()
+        self.last_seen = 0  # Last time any frame arrived from the server
+        self.rtt = None  # Round-trip time of the last answered HEARTBEAT, in seconds
+        self.compression_threshold = COMPRESSION_THRESHOLD
+        self.compression_stats = CompressionStats()
+        
         # Setup logging
         logging.basicConfig(
             level=logging.INFO,
@@ -577,25 +1983,36 @@ class RemoteClient:
             # Create socket
             self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # Commands and heartbeats are small frames that must not wait for Nagle
+            self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.client_socket.settimeout(30)
             
             # Connect to server
             self.client_socket.connect((self.host, self.port))
+            self.frame_reader = FrameReader(self.client_socket)
             self.connected = True
             
-            # Authenticate
+            # Authenticate (the handshake is always uncompressed JSON)
+            self.codec = JSON_CODEC
+            self.compressor = None
             if not self._authenticate():
                 self.disconnect()
                 return False
             
-            # Set socket to non-blocking mode for listener
-            self.client_socket.setblocking(False)
+            # The reader thread blocks in recv() until data arrives or the socket closes
+            self.client_socket.settimeout(None)
             
-            # Start listener thread for broadcast messages
+            # Start the single reader that routes replies and broadcasts
             self.running = True
-            self.listener_thread = threading.Thread(target=self._listen_for_broadcasts, daemon=True)
+            self.last_seen = time.time()
+            self.listener_thread = threading.Thread(target=self._read_messages, daemon=True)
             self.listener_thread.start()
             
+            if self.server_supports_heartbeat:
+                self.heartbeat_stop.clear()
+                self.heartbeat_thread = threading.Thread(target=self._send_heartbeats, daemon=True)
+                self.heartbeat_thread.start()
+            
             logging.info("Successfully connected and authenticated")
             return True
             
@@ -620,7 +2037,15 @@ class RemoteClient:
             # Send auth response
             auth_response = RemoteMessage(
                 command="AUTH",
-                data={"auth_key": self.auth_key}
+                data={
+                    "auth_key": self.auth_key,
+                    "ticket": self.session_ticket,
+                    "codecs": available_codecs(),
+                    "compression": available_compressors(),
+                    "heartbeat": True,
+                    "log_batch": True,
+                    "stats_delta": True
+                }
             )
             self._send_message_blocking(auth_response)
             
@@ -630,6 +2055,19 @@ class RemoteClient:
                 logging.error("Authentication failed")
                 return False
             
+            # Keep the new ticket for the next connection (older servers send none)
+            self.session_ticket = auth_result.data.get("ticket") or self.session_ticket
+            self.server_supports_heartbeat = bool(auth_result.data.get("heartbeat"))
+            
+            # Older servers do not echo request IDs; fall back to in-order replies
+            self.server_supports_request_ids = bool(auth_result.data.get("request_ids"))
+            
+            # Every frame after the AUTH reply uses the codec the server picked
+            self.codec = get_codec(auth_result.data.get("codec", CODEC_JSON))
+            self.compressor = COMPRESSORS.get(auth_result.data.get("compression"))
+            logging.info(f"Using {self.codec.name} wire codec, "
+                         f"{self.compressor.name if self.compressor else 'no'} compression")
+            
             self.authenticated = True
             return True
             
@@ -637,67 +2075,142 @@ class RemoteClient:
             logging.error(f"Authentication error: {str(e)}")
             return False
     
-    def _listen_for_broadcasts(self):
-        """Background thread that listens for broadcast messages from server"""
-        logging.info("Started listening for broadcast messages")
+    def _read_messages(self):
+        """Reader thread: route replies to waiting commands and everything else to message_handler"""
+        logging.info("Started listening for server messages")
         
         while self.running and self.connected:
-            try:
-                # Use select to check if data is available (non-blocking)
-                import select
-                ready_to_read, _, _ = select.select([self.client_socket], [], [], 1.0)
-                
-                if ready_to_read:
-                    with self.socket_lock:
-                        message = self._receive_message_nonblocking()
-                        if message:
-                            # Handle the broadcast message
-                            if self.message_handler:
-                                self.message_handler(message)
-                            else:
-                                logging.info(f"Received broadcast: {message.command}")
-                        else:
-                            # No message could mean connection closed
-                            if not self.connected:
-                                break
-                        
-            except Exception as e:
+            message = self._receive_message_blocking()
+            if not message:
                 if self.running:
-                    logging.error(f"Error in listener thread: {str(e)}")
-                    self.disconnect()
+                    self._connection_lost("Connection to server lost")
                 break
+            
+            self.last_seen = time.time()
+            if message.command == CMD_HEARTBEAT and message.request_id is None:
+                # Server ping - echo it back so the server can measure RTT
+                with self.socket_lock:
+                    self._send_message_blocking(RemoteMessage(
+                        command=CMD_HEARTBEAT, status=STATUS_OK, data=message.data
+                    ))
+                continue
+            
+            future = self._pop_pending(message)
+            if future:
+                future.set_result(message)
+            elif self.message_handler:
+                try:
+                    self.message_handler(message)
+                except Exception as e:
+                    logging.error(f"Error in message handler for {message.command}: {str(e)}")
+            else:
+                logging.info(f"Received broadcast: {message.command}")
         
-        logging.info("Stopped listening for broadcast messages")
+        logging.info("Stopped listening for server messages")
     
-    def send_command(self, command, data=None):
-        """Send a command and wait for response"""
+    def _send_heartbeats(self):
+        """Heartbeat thread: ping the server and drop the connection if it goes silent"""
+        while not self.heartbeat_stop.wait(HEARTBEAT_INTERVAL):
+            if not self.running:
+                break
+            if time.time() - self.last_seen > HEARTBEAT_TIMEOUT:
+                self._connection_lost(f"No heartbeat from server for {HEARTBEAT_TIMEOUT}s")
+                break
+            
+            sent = time.monotonic()
+            future = self.send_command_async(CMD_HEARTBEAT, {"sent": sent})
+            future.add_done_callback(lambda f, sent=sent: self._record_rtt(f, sent))
+    
+    def _record_rtt(self, future, sent):
+        if future.result() is not None:
+            self.rtt = time.monotonic() - sent
+    
+    def _connection_lost(self, reason):
+        """Tear down a connection that failed on its own and tell the message handler"""
+        logging.info(reason)
+        self.disconnect()
+        if self.message_handler:
+            try:
+                self.message_handler(RemoteMessage(command="DISCONNECT", message=reason))
+            except Exception as e:
+                logging.error(f"Error in message handler for DISCONNECT: {str(e)}")
+    
+    def _pop_pending(self, message):
+        """Find the pending command a received message answers, if any"""
+        with self.pending_lock:
+            if message.request_id is not None:
+                return self.pending_requests.pop(message.request_id, None)
+            if not self.server_supports_request_ids and self.pending_requests:
+                # Legacy server: the next message is the reply to the oldest command
+                return self.pending_requests.popitem(last=False)[1]
+        return None
+    
+    def send_command_async(self, command, data=None):
+        """
+        Send a command without waiting for its reply.
+        Returns a Future that resolves to the reply RemoteMessage, or None if the
+        connection is lost. Any number of commands can be in flight at once.
+        """
+        future = Future()
         if not self.connected or not self.authenticated:
             logging.error("Not connected or authenticated")
-            return None
+            future.set_result(None)
+            return future
         
+        request_id = next(self.request_ids)
+        with self.pending_lock:
+            self.pending_requests[request_id] = future
+        
+        message = RemoteMessage(command=command, data=data or {}, request_id=request_id)
         with self.socket_lock:
-            try:
-                # Send command
-                message = RemoteMessage(command=command, data=data or {})
-                self._send_message_blocking(message)
-                
-                # Wait for response with timeout
-                self.client_socket.settimeout(30)
-                response = self._receive_message_blocking()
-                
-                # Restore non-blocking mode
-                self.client_socket.setblocking(False)
-                
-                return response
-                
-            except socket.timeout:
-                logging.error(f"Timeout waiting for response to {command}")
-                self.client_socket.setblocking(False)
-                return None
-            except Exception as e:
-                logging.error(f"Error in send_command: {str(e)}")
-                self.disconnect()
-                return None
+            sent = self._send_message_blocking(message)
+        
+        if not sent:
+            self._cancel_pending(request_id)
+            future.set_result(None)
+            self.disconnect()
+        return future
+    
+    def send_command(self, command, data=None, timeout=COMMAND_TIMEOUT):
+        """Send a command and wait for response"""
+        future = self.send_command_async(command, data)
+        return self.wait_for_reply(future, command, timeout)
+    
+    def subscribe(self, topics):
+        """Receive broadcasts for these topics (or "*" for all). Returns the reply."""
+        topics = [topics] if isinstance(topics, str) else list(topics)
+        return self.send_command(CMD_SUBSCRIBE, {"topics": topics})
+    
+    def unsubscribe(self, topics):
+        """Stop receiving broadcasts for these topics (or "*" for all). Returns the reply."""
+        topics = [topics] if isinstance(topics, str) else list(topics)
+        return self.send_command(CMD_UNSUBSCRIBE, {"topics": topics})
+    
+    def wait_for_reply(self, future, command=None, timeout=COMMAND_TIMEOUT):
+        """Wait for a Future returned by send_command_async; None on timeout"""
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            logging.error(f"Timeout waiting for response to {command}")
+            with self.pending_lock:
+                for request_id, pending in list(self.pending_requests.items()):
+                    if pending is future:
+                        del self.pending_requests[request_id]
+            return None
+    
+    def _cancel_pending(self, request_id):
+        """Forget a pending command"""
+        with self.pending_lock:
+            self.pending_requests.pop(request_id, None)
+    
+    def _fail_pending(self):
+        """Resolve every waiting command with None after the connection is lost"""
+        with self.pending_lock:
+            pending = list(self.pending_requests.values())
+            self.pending_requests.clear()
+        for future in pending:
+            if not future.done():
+                future.set_result(None)
     
     def _send_message_blocking(self, message):
         """Send a message (blocking mode - use with lock)"""
@@ -705,15 +2218,9 @@ class RemoteClient:
             return False
             
         try:
-            json_str = message.to_json()
-            data = json_str.encode('utf-8')
-            
-            # Send message length as 4 bytes
-            length = len(data)
-            self.client_socket.sendall(length.to_bytes(4, byteorder='big'))
-            
-            # Send the actual message
-            self.client_socket.sendall(data)
+            self.client_socket.sendall(encode_frame(
+                message, self.codec, self.compressor, self.compression_threshold, self.compression_stats
+            ))
             return True
             
         except Exception as e:
@@ -721,115 +2228,45 @@ class RemoteClient:
             return False
     
     def _receive_message_blocking(self):
-        """Receive a message (blocking mode - use during auth)"""
-        if not self.client_socket:
-            return None
-            
-        try:
-            # Get message length (4 bytes)
-            length_bytes = self._recv_exact(4)
-            if not length_bytes or len(length_bytes) != 4:
-                return None
-            
-            length = int.from_bytes(length_bytes, byteorder='big')
-            
-            # Sanity check
-            if length <= 0 or length > 10 * 1024 * 1024:
-                logging.error(f"Invalid message length: {length}")
-                return None
-            
-            # Get the message data
-            data = self._recv_exact(length)
-            if not data or len(data) != length:
-                return None
-            
-            # Parse the message
-            json_str = data.decode('utf-8')
-            return RemoteMessage.from_json(json_str)
-            
-        except Exception as e:
-            logging.error(f"Error receiving message: {str(e)}")
-            return None
-    
-    def _receive_message_nonblocking(self):
-        """Receive a message (non-blocking mode - for listener)"""
+        """Receive a message (blocking mode)"""
         if not self.client_socket:
             return None
             
         try:
-            # Get message length (4 bytes)
-            length_bytes = self._recv_exact_nonblocking(4)
-            if not length_bytes or len(length_bytes) != 4:
+            frame = self.frame_reader.read_frame()
+            if not frame:
                 return None
             
-            length = int.from_bytes(length_bytes, byteorder='big')
-            
-            # Sanity check
-            if length <= 0 or length > 10 * 1024 * 1024:
-                logging.error(f"Invalid message length: {length}")
-                return None
-            
-            # Get the message data
-            data = self._recv_exact_nonblocking(length)
-            if not data or len(data) != length:
-                return None
-            
-            # Parse the message
-            json_str = data.decode('utf-8')
-            return RemoteMessage.from_json(json_str)
+            # Decode straight from the reader's buffer
+            payload, compressed = frame
+            return decode_frame_payload(payload, self.codec, self.compressor, compressed, self.compression_stats)
             
         except Exception as e:
-            logging.error(f"Error receiving message: {str(e)}")
+            if self.running or not self.authenticated:
+                logging.error(f"Error receiving message: {str(e)}")
             return None
     
-    def _recv_exact(self, num_bytes):
-        """Receive exactly num_bytes (blocking)"""
-        data = b''
-        while len(data) < num_bytes:
-            chunk = self.client_socket.recv(num_bytes - len(data))
-            if not chunk:
-                return None
-            data += chunk
-        return data
-    
-    def _recv_exact_nonblocking(self, num_bytes):
-        """Receive exactly num_bytes (non-blocking with timeout)"""
-        import select
-        data = b''
-        start_time = time.time()
-        timeout = 5.0  # 5 second timeout for receiving
-        
-        while len(data) < num_bytes:
-            if time.time() - start_time > timeout:
-                logging.error(f"Timeout receiving {num_bytes} bytes, got {len(data)}")
-                return None
-            
-            # Wait for data to be available
-            ready, _, _ = select.select([self.client_socket], [], [], 0.1)
-            if ready:
-                try:
-                    chunk = self.client_socket.recv(num_bytes - len(data))
-                    if not chunk:
-                        return None
-                    data += chunk
-                except socket.error:
-                    pass  # Would block, continue waiting
-        
-        return data
-    
     def disconnect(self):
         """Disconnect from the server"""
         self.running = False
         self.connected = False
         self.authenticated = False
+        self.heartbeat_stop.set()
         
         if self.client_socket:
+            try:
+                # shutdown() wakes up the reader thread blocked in recv()
+                self.client_socket.shutdown(socket.SHUT_RDWR)
+            except:
+                pass
             try:
                 self.client_socket.close()
             except:
                 pass
             self.client_socket = None
         
+        self._fail_pending()
+        
         # Wait for listener thread to finish
         if self.listener_thread and threading.current_thread() != self.listener_thread:
             try:
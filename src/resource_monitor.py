@@ -1,6 +1,99 @@
-import psutil
+import os
+import json
 import logging
-from datetime import datetime
+import urllib.request
+from datetime import datetime, timedelta
+
+from config_manager import get_data_dir
+
+LOAD_PROFILE_FILE = os.path.join(get_data_dir(), "load_profile.json")
+LOAD_BUCKET_MINUTES = 15  # Resolution of the time-of-day load profile
+LOAD_PROFILE_ALPHA = 0.02  # Weight of a new sample in its slot's moving average (~3 days of memory at one sample a minute)
+FXSERVER_PLAYERS_URL = "http://127.0.0.1:{port}/players.json"
+
+def get_player_count(port=30120, timeout=1):
+    """Players online according to FXServer's players.json, or None if the server does not answer"""
+    try:
+        with urllib.request.urlopen(FXSERVER_PLAYERS_URL.format(port=port), timeout=timeout) as response:
+            return len(json.loads(response.read()))
+    except Exception:
+        return None
+
+class LoadProfile:
+    """
+    Typical CPU load and player count for each 15 minute slot of the day,
+    learned from samples as moving averages and saved to LOAD_PROFILE_FILE.
+    Used to pick the quietest time for scheduled backups.
+    """
+    
+    def __init__(self, path=LOAD_PROFILE_FILE):
+        self.path = path
+        self.buckets = (24 * 60) // LOAD_BUCKET_MINUTES
+        # One [cpu, players, samples] entry per slot; players is None until FXServer has answered
+        self.slots = [[0.0, None, 0] for _ in range(self.buckets)]
+        self.unsaved = 0
+        self._load()
+    
+    def _bucket(self, when):
+        return (when.hour * 60 + when.minute) // LOAD_BUCKET_MINUTES
+    
+    def record(self, cpu, players=None, when=None):
+        """Add a sample to the slot it was taken in"""
+        slot = self.slots[self._bucket(when or datetime.now())]
+        alpha = max(LOAD_PROFILE_ALPHA, 1 / (slot[2] + 1))  # Plain average until the slot has enough samples
+        slot[0] += alpha * (cpu - slot[0])
+        if players is not None:
+            slot[1] = players if slot[1] is None else slot[1] + alpha * (players - slot[1])
+        slot[2] += 1
+        
+        self.unsaved += 1
+        if self.unsaved >= LOAD_BUCKET_MINUTES:
+            self.save()
+    
+    def predict(self, when):
+        """Expected {"cpu", "players", "samples"} for a time of day, or None without samples"""
+        cpu, players, samples = self.slots[self._bucket(when)]
+        if not samples:
+            return None
+        return {"cpu": cpu, "players": players, "samples": samples}
+    
+    def quietest_slot(self, start, end, player_weight=5.0):
+        """
+        Slot start between start and end with the lowest expected load
+        (CPU percent + player_weight per player). Returns (time, prediction),
+        or (start, None) when there is no history for the window yet.
+        """
+        best_time, best, best_score = start, None, None
+        when = start
+        while when <= end:
+            prediction = self.predict(when)
+            if prediction:
+                score = prediction["cpu"] + player_weight * (prediction["players"] or 0)
+                if best_score is None or score < best_score:
+                    best_time, best, best_score = when, prediction, score
+            # Step to the start of the next slot
+            minutes = LOAD_BUCKET_MINUTES - (when.hour * 60 + when.minute) % LOAD_BUCKET_MINUTES
+            when = when.replace(second=0, microsecond=0) + timedelta(minutes=minutes)
+        return best_time, best
+    
+    def save(self):
+        try:
+            with open(self.path, 'w') as f:
+                json.dump({"bucket_minutes": LOAD_BUCKET_MINUTES, "slots": self.slots}, f)
+            self.unsaved = 0
+        except Exception as e:
+            logging.error(f"Failed to save load profile: {e}")
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("bucket_minutes") == LOAD_BUCKET_MINUTES and len(data.get("slots", [])) == self.buckets:
+                self.slots = data["slots"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.error(f"Failed to load load profile: {e}")
 
 class ResourceMonitor:
     """Monitor system resources (CPU, RAM, Disk, Network) - Works on Windows and Linux"""
@@ -11,13 +104,21 @@ class ResourceMonitor:
         self.ram_history = []
         self.disk_history = []
         self.network_history = []
+        self.last_stats = None
         
         # For network rate calculation
         self.last_network_io = None
         self.last_network_time = None
+        
+        # Long-term load by time of day (see record_load_sample)
+        self.load_profile = LoadProfile()
+        # CPU times at the previous get_load() - its own baseline, as get_current_stats() resets psutil's every second
+        self.load_cpu_times = None
     
     def get_current_stats(self):
         """Get current system resource statistics"""
+        import psutil  # Imported on first use - keeps it off the startup path
+        
         try:
             # CPU usage
             cpu_percent = psutil.cpu_percent(interval=0.1)
@@ -67,6 +168,7 @@ class ResourceMonitor:
             
             # Update history
             self._update_history(stats)
+            self.last_stats = stats
             
             return stats
             
@@ -119,6 +221,42 @@ class ResourceMonitor:
         if len(self.network_history) > self.history_size:
             self.network_history.pop(0)
     
+    def get_history(self):
+        """Get recorded history and the latest sample (oldest value first)"""
+        return {
+            'cpu_percent': list(self.cpu_history),
+            'ram_percent': list(self.ram_history),
+            'disk_percent': list(self.disk_history),
+            'network_rate_mbps': list(self.network_history),
+            'latest': self.last_stats
+        }
+    
+    def get_load(self, fxserver_port=30120):
+        """Current (cpu_percent, players) - CPU averaged since the previous call, players None if unknown"""
+        import psutil
+        
+        times = psutil.cpu_times()
+        previous, self.load_cpu_times = self.load_cpu_times, times
+        if previous is None:
+            # First call - no baseline yet, take a short sample
+            return psutil.cpu_percent(interval=0.1), get_player_count(fxserver_port)
+        
+        # Idle (and on Linux, I/O wait) time counts as not busy, as in psutil.cpu_percent()
+        def idle(cpu_times):
+            return cpu_times.idle + getattr(cpu_times, 'iowait', 0)
+        total = sum(times) - sum(previous)
+        busy = total - (idle(times) - idle(previous))
+        cpu = min(100.0, max(0.0, busy / total * 100)) if total > 0 else 0.0
+        return round(cpu, 1), get_player_count(fxserver_port)
+    
+    def record_load_sample(self, fxserver_port=30120):
+        """Add the current CPU load and player count to the load profile"""
+        try:
+            cpu, players = self.get_load(fxserver_port)
+            self.load_profile.record(cpu, players)
+        except Exception as e:
+            logging.error(f"Error recording load sample: {e}")
+    
     def get_status_indicator(self, percent):
         """Get status indicator emoji based on usage percentage"""
         if percent >= 90:
@@ -0,0 +1,276 @@
+import os
+import json
+import heapq
+import logging
+import itertools
+import threading
+from datetime import datetime, timedelta
+
+from config_manager import get_data_dir
+
+SCHEDULE_STATE_FILE = os.path.join(get_data_dir(), "schedule_state.json")
+MAX_SLEEP = 60  # Seconds - re-read the wall clock at least this often (system sleep, clock changes)
+CATCH_UP_HOURS = 24  # Missed runs older than this are skipped instead of caught up
+CRON_SEARCH_DAYS = 366 * 5  # How far ahead next_after() looks before giving up (e.g. "0 0 30 2 *")
+
+class CronExpression:
+    """
+    Standard 5-field cron expression: minute hour day-of-month month day-of-week.
+    Fields accept *, numbers, ranges (1-5), lists (3,15) and steps (*/15, 0-12/2).
+    Day-of-week runs 0-6 from Sunday (7 is also Sunday). As in cron, when both
+    day fields are restricted a day matching either one is used.
+    """
+    
+    FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+    
+    def __init__(self, expression):
+        self.expression = expression.strip()
+        parts = self.expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(parts)}: '{expression}'")
+        
+        values = [self._parse_field(part, name, low, high) for part, (name, low, high) in zip(parts, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = values
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+        self.sorted_minutes = sorted(self.minutes)
+        self.sorted_hours = sorted(self.hours)
+    
+    @staticmethod
+    def _parse_field(field, name, low, high):
+        values = set()
+        for item in field.split(","):
+            step = 1
+            if "/" in item:
+                item, step_text = item.split("/", 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"Invalid step in cron {name} field: '{field}'")
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start, end = (int(value) for value in item.split("-", 1))
+            else:
+                start = int(item)
+                end = high if step > 1 else start
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron {name} field out of range ({low}-{high}): '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+    
+    def _day_matches(self, date):
+        in_days = date.day in self.days
+        in_weekdays = (date.weekday() + 1) % 7 in self.weekdays
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return in_weekdays
+        if self.any_weekday:
+            return in_days
+        return in_days or in_weekdays
+    
+    def next_after(self, after):
+        """First matching time strictly after the given datetime, or None if there is none within 5 years"""
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        for day_offset in range(CRON_SEARCH_DAYS):
+            if day.month in self.months and self._day_matches(day):
+                first_day = day_offset == 0
+                for hour in self.sorted_hours:
+                    if first_day and hour < start.hour:
+                        continue
+                    for minute in self.sorted_minutes:
+                        if first_day and hour == start.hour and minute < start.minute:
+                            continue
+                        return day.replace(hour=hour, minute=minute)
+            day += timedelta(days=1)
+        return None
+    
+    def __str__(self):
+        return self.expression
+
+def hours_to_cron(hours, minute=0):
+    """Cron expression for "every day at these hours" (the DB_BACKUP_HOURS / SERVER_BACKUP_HOURS settings)"""
+    if not hours:
+        return None
+    return f"{minute} {','.join(str(hour) for hour in sorted(set(hours)))} * * *"
+
+class Scheduler:
+    """
+    Fires named jobs on cron schedules. The next fire time of every job is
+    kept in a heap and the scheduler thread sleeps until the earliest one.
+    
+    The last scheduled time of each job is saved to SCHEDULE_STATE_FILE, so
+    runs missed while the computer was asleep or the controller was closed
+    are caught up once (not once per missed slot) when it comes back, as
+    long as they are less than catch_up_hours old.
+    
+    next_runs() returns the precomputed table of upcoming runs; it only
+    changes when a job fires, so callers can read it as often as they like.
+    """
+    
+    def __init__(self, on_fire, state_file=SCHEDULE_STATE_FILE, catch_up_hours=CATCH_UP_HOURS):
+        self.on_fire = on_fire  # Called as on_fire(name, scheduled_for, missed) on the scheduler thread
+        self.state_file = state_file
+        self.catch_up = timedelta(hours=catch_up_hours)
+        self.jobs = {}  # {name: (CronExpression, label)}
+        self.heap = []  # [(fire time, sequence, name)]
+        self.next_fire = {}  # {name: (fire time, sequence)} - the live entry for each job in the heap
+        self.sequence = itertools.count()
+        self.last_runs = self._load_state()
+        self.table = []
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+    
+    def add(self, name, expression, label=None):
+        """Schedule a job. Raises ValueError for an invalid cron expression."""
+        cron = CronExpression(expression)
+        now = datetime.now()
+        with self.condition:
+            self.jobs[name] = (cron, label or name)
+            
+            last_run = self.last_runs.get(name)
+            missed = self._latest_missed(cron, last_run, now) if last_run else None
+            if missed:
+                # Run once right away for everything missed since last_run
+                self._push(name, missed)
+            else:
+                self._push(name, cron.next_after(now))
+            
+            if last_run is None:
+                # First time this job is scheduled - downtime is measured from now on
+                self.last_runs[name] = now
+                self._save_state()
+            
+            self._rebuild_table()
+            self.condition.notify()
+        logging.info(f"Scheduled {label or name}: '{cron}', next run {self.next_fire.get(name, (None,))[0]}")
+    
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread and threading.current_thread() != self.thread:
+            self.thread.join(timeout=2)
+    
+    def next_runs(self):
+        """Upcoming runs, soonest first: [{"name", "label", "time", "expression"}]"""
+        with self.condition:
+            return list(self.table)
+    
+    def next_run(self):
+        """(time, label) of the soonest run, with labels joined when several jobs share it, or (None, None)"""
+        with self.condition:
+            if not self.table:
+                return None, None
+            soonest = self.table[0]["time"]
+            labels = [entry["label"] for entry in self.table if entry["time"] == soonest]
+            return soonest, "/".join(labels)
+    
+    def _latest_missed(self, cron, last_run, now):
+        """Most recent run due between last_run and now, ignoring runs older than the catch-up window"""
+        latest = None
+        fire_time = cron.next_after(max(last_run, now - self.catch_up))
+        while fire_time and fire_time <= now:
+            latest = fire_time
+            fire_time = cron.next_after(fire_time)
+        return latest
+    
+    def _push(self, name, fire_time):
+        """Queue the next run of a job (call with the condition held)"""
+        if fire_time is None:
+            self.next_fire.pop(name, None)
+            return
+        entry = (fire_time, next(self.sequence))
+        self.next_fire[name] = entry
+        heapq.heappush(self.heap, entry + (name,))
+    
+    def _rebuild_table(self):
+        self.table = sorted(
+            (
+                {"name": name, "label": self.jobs[name][1], "time": fire_time, "expression": str(self.jobs[name][0])}
+                for name, (fire_time, _) in self.next_fire.items()
+            ),
+            key=lambda entry: entry["time"]
+        )
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running:
+                    # Drop entries replaced by a later _push
+                    while self.heap and self.next_fire.get(self.heap[0][2]) != self.heap[0][:2]:
+                        heapq.heappop(self.heap)
+                    
+                    now = datetime.now()
+                    if self.heap and self.heap[0][0] <= now:
+                        break
+                    
+                    # Sleep until the next run, but wake up regularly: the wall clock can
+                    # jump while we wait (system sleep, DST, clock sync) and a wait timeout
+                    # does not follow it
+                    timeout = MAX_SLEEP
+                    if self.heap:
+                        timeout = min(timeout, max(0.0, (self.heap[0][0] - now).total_seconds()))
+                    self.condition.wait(timeout)
+                
+                if not self.running:
+                    return
+                
+                fire_time, _, name = heapq.heappop(self.heap)
+                cron, label = self.jobs[name]
+                now = datetime.now()
+                # Late by more than a minute means the run was missed (asleep, busy or closed)
+                missed = now - fire_time > timedelta(minutes=1)
+                if missed:
+                    # Several slots may have passed - keep the latest one still inside the catch-up window
+                    scheduled_for = fire_time
+                    fire_time = self._latest_missed(cron, fire_time - timedelta(minutes=1), now)
+                
+                # Next run counts from now, so several missed slots collapse into one catch-up run
+                self._push(name, cron.next_after(now))
+                self.last_runs[name] = fire_time or now
+                self._save_state()
+                self._rebuild_table()
+            
+            if fire_time is None:
+                logging.info(f"Skipping missed {label} run from {scheduled_for:%Y-%m-%d %H:%M} (older than {self.catch_up})")
+                continue
+            if missed:
+                logging.info(f"Catching up missed {label} run scheduled for {fire_time:%Y-%m-%d %H:%M}")
+            try:
+                self.on_fire(name, fire_time, missed)
+            except Exception as e:
+                logging.error(f"Error running scheduled {label}: {e}", exc_info=True)
+    
+    def _load_state(self):
+        """Last scheduled run of each job from the state file"""
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            return {name: datetime.fromisoformat(value) for name, value in state.get("last_runs", {}).items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.error(f"Failed to load schedule state: {e}")
+            return {}
+    
+    def _save_state(self):
+        """Persist last runs (call with the condition held)"""
+        try:
+            temp_file = self.state_file + ".tmp"
+            with open(temp_file, 'w') as f:
+                json.dump({"last_runs": {name: value.isoformat() for name, value in self.last_runs.items()}}, f, indent=4)
+            os.replace(temp_file, self.state_file)
+        except Exception as e:
+            logging.error(f"Failed to save schedule state: {e}")
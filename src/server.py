@@ -3,18 +3,21 @@ import shutil
 import time
 import logging
 import zipfile
-import glob
+import fnmatch
 from datetime import datetime
 from config import SERVER_FOLDER, SERVER_BACKUP_DIR, SERVER_BACKUP_KEEP_COUNT, SERVER_BACKUP_THROTTLE
+from backup_catalog import get_catalog, BACKUP_TYPE_SERVER
 
 # Don't create directories on import - do it in a function instead
 def ensure_server_backup_dir():
     """Ensure the server backup directory exists"""
     os.makedirs(SERVER_BACKUP_DIR, exist_ok=True)
 
-def backup_server_folder(callback=None):
+def backup_server_folder(callback=None, cancel_event=None, progress=None):
     """
     Creates a zip backup of the server folder with throttling to reduce resource usage.
+    Stops early if cancel_event is set; progress(files_done=..., files_total=..., bytes_done=..., bytes_total=...)
+    is called as files are added.
     Returns tuple (success, message or filename)
     """
     # Ensure backup directory exists
@@ -27,29 +30,55 @@ def backup_server_folder(callback=None):
     if callback:
         callback(f"Starting server backup to {backup_file}...")
     logging.info(f"Starting server backup to {backup_file}...")
+    started = time.monotonic()
     
     try:
+        # List the files first so progress and ETA can be reported against a total
+        file_list = []
+        bytes_total = 0
+        for root, dirs, files in os.walk(SERVER_FOLDER):
+            for file in files:
+                file_path = os.path.join(root, file)
+                try:
+                    size = os.path.getsize(file_path)
+                except OSError:
+                    size = 0
+                file_list.append((file_path, size))
+                bytes_total += size
+        
+        cancelled = False
         with zipfile.ZipFile(backup_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the directory
-            file_count = 0
-            for root, dirs, files in os.walk(SERVER_FOLDER):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # Calculate path in zip file
-                    rel_path = os.path.relpath(file_path, os.path.dirname(SERVER_FOLDER))
-                    
-                    if callback and file_count % 10 == 0:  # Update status every 10 files
-                        callback(f"Backing up: {rel_path}")
-                    
-                    # Add file to zip
-                    zipf.write(file_path, rel_path)
-                    
-                    # Throttle to reduce resource usage
-                    time.sleep(SERVER_BACKUP_THROTTLE)
-                    file_count += 1
+            bytes_done = 0
+            for file_count, (file_path, size) in enumerate(file_list):
+                if cancel_event and cancel_event.is_set():
+                    cancelled = True
+                    break
+                
+                # Calculate path in zip file
+                rel_path = os.path.relpath(file_path, os.path.dirname(SERVER_FOLDER))
+                
+                if callback and file_count % 10 == 0:  # Update status every 10 files
+                    callback(f"Backing up: {rel_path}")
+                
+                # Add file to zip
+                zipf.write(file_path, rel_path)
+                bytes_done += size
+                if progress:
+                    progress(files_done=file_count + 1, files_total=len(file_list),
+                             bytes_done=bytes_done, bytes_total=bytes_total)
+                
+                # Throttle to reduce resource usage
+                time.sleep(SERVER_BACKUP_THROTTLE)
+        
+        if cancelled:
+            os.remove(backup_file)
+            message = "Server backup cancelled"
+            logging.info(message)
+            return False, message
         
         success_message = f"Successfully created server backup: {backup_file}"
         logging.info(success_message)
+        get_catalog().add_backup(BACKUP_TYPE_SERVER, backup_file, duration=round(time.monotonic() - started, 1))
         return True, backup_file
         
     except Exception as e:
@@ -123,46 +152,39 @@ def restore_server_backup(backup_file, callback=None):
             shutil.rmtree(temp_dir)
         return False, error_message
 
+def is_server_backup(path):
+    """True for a server backup file"""
+    return fnmatch.fnmatch(os.path.basename(path), 'server-backup-*.zip')
+
 def delete_old_server_backups(keep_count=SERVER_BACKUP_KEEP_COUNT):
     """
     Keeps the most recent 'keep_count' server backup files, deleting older ones.
     """
-    # Get all .zip files with their paths
-    backup_files = []
-    for fname in glob.glob(os.path.join(SERVER_BACKUP_DIR, 'server-backup-*.zip')):
-        try:
-            backup_files.append((fname, os.path.getmtime(fname)))
-        except Exception as e:
-            logging.warning(f"Failed to access {fname}: {e}")
+    # Backups beyond keep_count, from the catalog (newest first)
+    catalog = get_catalog()
+    old_backups = catalog.list_backups(BACKUP_TYPE_SERVER, SERVER_BACKUP_DIR, is_server_backup, offset=keep_count)
     
-    # Sort files by modification time (newest first)
-    backup_files.sort(key=lambda x: x[1], reverse=True)
-    
-    # Delete files beyond the keep_count
+    # Delete them, then drop them from the catalog in one go
     deleted = 0
-    for fpath, _ in backup_files[keep_count:]:
+    removed = []
+    for fpath, _, _ in old_backups:
         try:
             os.remove(fpath)
             deleted += 1
             logging.info(f"Deleted old server backup: {fpath}")
+        except FileNotFoundError:
+            pass  # Already deleted outside the application
         except Exception as e:
             logging.warning(f"Failed to delete {fpath}: {e}")
+            continue
+        removed.append(fpath)
+    catalog.remove_backups(removed)
     
     return deleted
 
-def get_server_backup_files():
+def get_server_backup_files(offset=0, limit=None):
     """
-    Returns a list of server backup files sorted by date (newest first)
+    Returns a list of server backup files sorted by date (newest first),
+    from the backup catalog - optionally only 'limit' of them starting at 'offset'
     """
-    backup_files = []
-    if os.path.exists(SERVER_BACKUP_DIR):
-        for fname in glob.glob(os.path.join(SERVER_BACKUP_DIR, 'server-backup-*.zip')):
-            try:
-                basename = os.path.basename(fname)
-                backup_files.append((fname, os.path.getmtime(fname), basename))
-            except Exception as e:
-                logging.warning(f"Failed to access {fname}: {e}")
-    
-    # Sort files by modification time (newest first)
-    backup_files.sort(key=lambda x: x[1], reverse=True)
-    return backup_files
+    return get_catalog().list_backups(BACKUP_TYPE_SERVER, SERVER_BACKUP_DIR, is_server_backup, offset, limit)
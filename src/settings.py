@@ -16,7 +16,32 @@ DEFAULT_SETTINGS = {
         "port": 40100,
         "auth_key": None,
         "whitelist_enabled": False,
-        "whitelisted_ips": []
+        "whitelisted_ips": [],
+        "engine": "threaded",  # "threaded" (one thread per client) or "asyncio" (single event loop)
+        "executor_workers": 4,  # Threads for blocking command handlers in asyncio mode
+        "compression_threshold": 4096,  # Frames at least this many bytes are compressed
+        "max_connections": 64,  # Open connections, authenticated or not
+        "max_connections_per_ip": 4  # Open connections from a single address
+    },
+    "schedule": {
+        # Cron expressions ("minute hour day month weekday"); null uses the backup hours from the Configuration tab
+        "database_backup": None,
+        "server_backup": None,
+        "catch_up_hours": 24,  # Backups missed while asleep or closed are run at startup if this recent
+        "smart_window": {
+            "enabled": False,  # Start scheduled backups at the quietest time within window_minutes of the scheduled time
+            "window_minutes": 120,
+            "fxserver_port": 30120,  # Player counts are read from FXServer's players.json
+            "player_weight": 5.0  # Load of one player in CPU percent when comparing slots
+        }
+    },
+    "jobs": {
+        # Jobs that may use each resource class at once (disk-heavy work is serialized by default)
+        "resource_limits": {"disk_write": 1, "network": 2, "cpu": 2}
+    },
+    "backup_catalog": {
+        "reconcile_minutes": 5,  # How often backups added or deleted outside the application are picked up
+        "checksums": True  # Compute a SHA-256 of each backup in the background
     },
     "ui": {
         "last_tab": 0
@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import logging
+import builtins
+import threading
+
+from config_manager import get_logs_dir
+
+STARTUP_PROFILE_FILE = os.path.join(get_logs_dir(), "startup_profile.log")
+TOP_IMPORTS = 30  # Heaviest imports listed in the report
+
+class StartupProfile:
+    """
+    Startup timing for --profile-startup: wall time of each startup phase
+    and, like `python -X importtime`, the self and cumulative time of every
+    module imported on the main thread. Works in the frozen executable too,
+    where -X options cannot be passed.
+    
+    Create it as early as possible, call mark() at the end of each phase and
+    report() once the window has been drawn.
+    """
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last_mark = self.start
+        self.phases = []  # [(name, seconds)]
+        self.imports = []  # [(depth, module, self seconds, cumulative seconds)] in completion order
+        self.stack = []  # Time spent in nested imports, one entry per import in progress
+        self.thread_id = threading.get_ident()
+        self.original_import = builtins.__import__
+        builtins.__import__ = self._import
+    
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only time first imports on the startup thread (module-level imports are what delays the window)
+        if level or name in sys.modules or threading.get_ident() != self.thread_id:
+            return self.original_import(name, globals, locals, fromlist, level)
+        
+        depth = len(self.stack)
+        self.stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - started
+            nested = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += cumulative
+            self.imports.append((depth, name, cumulative - nested, cumulative))
+    
+    def mark(self, phase):
+        """End the current startup phase"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last_mark))
+        self.last_mark = now
+    
+    def stop(self):
+        """Stop timing imports"""
+        if builtins.__import__ == self._import:
+            builtins.__import__ = self.original_import
+    
+    def report(self):
+        """Stop timing, write the report to STARTUP_PROFILE_FILE and the log, and return it"""
+        self.stop()
+        total = time.perf_counter() - self.start
+        import_total = sum(cumulative for depth, _, _, cumulative in self.imports if depth == 0)
+        
+        lines = [f"Startup profile - {total * 1000:.0f} ms to first paint", ""]
+        lines.append(f"{'phase':<40} {'ms':>8}")
+        for phase, seconds in self.phases:
+            lines.append(f"{phase:<40} {seconds * 1000:>8.1f}")
+        
+        lines += ["", f"Imports: {len(self.imports)} modules, {import_total * 1000:.0f} ms", ""]
+        lines.append(f"Heaviest {TOP_IMPORTS} imports (cumulative includes the modules they import):")
+        lines.append(f"{'self [ms]':>10} | {'cumulative':>10} | module")
+        heaviest = sorted(self.imports, key=lambda entry: entry[3], reverse=True)[:TOP_IMPORTS]
+        for depth, name, own, cumulative in heaviest:
+            lines.append(f"{own * 1000:>10.1f} | {cumulative * 1000:>10.1f} | {'  ' * depth}{name}")
+        summary_lines = len(lines)
+        
+        lines += ["", "All imports in load order (as printed by python -X importtime):"]
+        lines.append(f"{'self [us]':>10} | {'cumulative':>10} | imported package")
+        for depth, name, own, cumulative in self.imports:
+            lines.append(f"{own * 1e6:>10.0f} | {cumulative * 1e6:>10.0f} | {'  ' * depth}{name}")
+        
+        text = "\n".join(lines)
+        try:
+            with open(STARTUP_PROFILE_FILE, 'w') as f:
+                f.write(text + "\n")
+        except Exception as e:
+            logging.error(f"Failed to write startup profile: {e}")
+        
+        # The phase table and heaviest imports go to the log; the full list is only in the file
+        summary = "\n".join(lines[:summary_lines])
+        logging.info(f"{summary}\nFull import breakdown: {STARTUP_PROFILE_FILE}")
+        return text
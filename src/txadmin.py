@@ -1,15 +1,12 @@
 import os
 import logging
-import requests
 import subprocess
 import zipfile
 import shutil
-import glob
+import fnmatch
 import time
-import psutil
 import tarfile
 from datetime import datetime
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from config_manager import is_windows
 import stat
@@ -19,6 +16,7 @@ from config import (
     TXADMIN_SERVER_DIR, TXADMIN_BACKUP_DIR, TXADMIN_DOWNLOAD_DIR,
     TXADMIN_URL, TXADMIN_KEEP_COUNT, SEVEN_ZIP_PATH, AUTO_UPDATE_TXADMIN
 )
+from backup_catalog import get_catalog, BACKUP_TYPE_TXADMIN
 
 # Don't create directories on import - do it in a function instead
 def ensure_txadmin_backup_dir():
@@ -33,6 +31,8 @@ def find_fxserver_processes():
     Finds all processes with FXServer in the name
     Returns a list of process objects
     """
+    import psutil  # Imported on first use - keeps it off the startup path
+    
     processes = []
     for proc in psutil.process_iter(['pid', 'name', 'exe']):
         try:
@@ -221,6 +221,10 @@ def get_latest_txadmin_url(callback=None):
     """
     Scrapes the FiveM website to get the latest recommended txAdmin download URL
     """
+    # requests and BeautifulSoup take longer to import than the rest of the app - only load them when needed
+    import requests
+    from bs4 import BeautifulSoup
+    
     if callback:
         callback("Checking for latest txAdmin version...", 5)
     
@@ -356,9 +360,10 @@ def store_txadmin_version(version_url):
         logging.error(f"Failed to store TxAdmin version: {str(e)}")
         return False
 
-def auto_update_txadmin(callback=None):
+def auto_update_txadmin(callback=None, cancel_event=None, progress=None):
     """
-    Checks for updates and automatically updates TxAdmin if new version is available
+    Checks for updates and automatically updates TxAdmin if new version is available.
+    cancel_event is honoured up to the start of extraction; progress is passed to the download.
     Returns tuple (updated, message)
     """
     update_available, current_url, latest_url = check_for_txadmin_updates(callback)
@@ -376,14 +381,20 @@ def auto_update_txadmin(callback=None):
         backup_success, backup_result = backup_txadmin(callback)
         if not backup_success:
             return False, f"Backup failed: {backup_result}"
+        if cancel_event and cancel_event.is_set():
+            return False, "TxAdmin update cancelled"
         
         # Step 2: Download the update
         if callback:
             callback(f"Downloading update from {latest_url}...")
-        download_success, download_path = download_txadmin(latest_url, callback)
+        download_success, download_path = download_txadmin(latest_url, callback, cancel_event, progress)
         if not download_success:
             return False, f"Download failed: {download_path}"
         
+        # Last point the update can be cancelled - extraction replaces the server files
+        if cancel_event and cancel_event.is_set():
+            return False, "TxAdmin update cancelled"
+        
         # Step 3: Extract the update
         if callback:
             callback("Extracting update...")
@@ -424,6 +435,7 @@ def backup_txadmin(callback=None):
     
     # Ensure backup directory exists
     ensure_txadmin_backup_dir()
+    started = time.monotonic()
     
     try:
         # Create a unique filename with timestamp
@@ -445,6 +457,10 @@ def backup_txadmin(callback=None):
         if callback:
             callback(f"Successfully created txAdmin backup: {backup_file}", 10)
         
+        # The version being replaced - what the backup restores
+        version_url = get_stored_txadmin_version()
+        get_catalog().add_backup(BACKUP_TYPE_TXADMIN, backup_file, duration=round(time.monotonic() - started, 1),
+                                 source_version=extract_version_from_url(version_url) if version_url else None)
         return True, backup_file
     
     except Exception as e:
@@ -454,14 +470,18 @@ def backup_txadmin(callback=None):
             callback(error_message, 10)
         return False, error_message
 
-def download_txadmin(url, callback=None):
+def download_txadmin(url, callback=None, cancel_event=None, progress=None):
     """
     Downloads the txAdmin update from the specified URL.
+    The download stops (and the partial file is removed) if cancel_event is set;
+    progress(bytes_done=..., bytes_total=...) is called for every chunk.
     Returns tuple (success, file_path)
     """
     if callback:
         callback(f"Downloading txAdmin update from {url}...", 20)
     
+    import requests
+    
     try:
         # Ensure download directory exists
         os.makedirs(TXADMIN_DOWNLOAD_DIR, exist_ok=True)
@@ -475,24 +495,45 @@ def download_txadmin(url, callback=None):
             total_size = int(response.headers.get('content-length', 0))
             
             # Display download progress
+            cancelled = False
             if total_size > 0:
                 downloaded = 0
                 chunk_size = 1024 * 1024  # 1MB chunks
                 
                 with open(file_path, 'wb') as f:
                     for chunk in response.iter_content(chunk_size=chunk_size):
+                        if cancel_event and cancel_event.is_set():
+                            cancelled = True
+                            break
                         if chunk:
                             f.write(chunk)
                             downloaded += len(chunk)
                             progress_percent = 20 + int((downloaded / total_size) * 60)  # 20-80%
                             if callback:
                                 callback(f"Downloaded {downloaded / (1024*1024):.1f} MB of {total_size / (1024*1024):.1f} MB ({progress_percent-20:.0f}%)", progress_percent)
+                            if progress:
+                                progress(bytes_done=downloaded, bytes_total=total_size)
             else:
                 # For responses without content length
+                downloaded = 0
                 with open(file_path, 'wb') as f:
                     for chunk in response.iter_content(chunk_size=1024):
+                        if cancel_event and cancel_event.is_set():
+                            cancelled = True
+                            break
                         if chunk:
                             f.write(chunk)
+                            downloaded += len(chunk)
+                            if progress:
+                                progress(bytes_done=downloaded)
+        
+        if cancelled:
+            os.remove(file_path)
+            message = "TxAdmin download cancelled"
+            logging.info(message)
+            if callback:
+                callback(message, 80)
+            return False, message
         
         if callback:
             callback(f"Download complete: {file_path}", 80)
@@ -687,46 +728,39 @@ def restore_txadmin_backup(backup_file, callback=None):
             callback(error_message)
         return False, error_message
 
+def is_txadmin_backup(path):
+    """True for a txAdmin backup file"""
+    return fnmatch.fnmatch(os.path.basename(path), 'txadmin-backup-*.zip')
+
 def delete_old_txadmin_backups(keep_count=TXADMIN_KEEP_COUNT):
     """
     Keeps the most recent 'keep_count' txAdmin backup files, deleting older ones.
     """
-    # Get all zip files with their paths
-    backup_files = []
-    for fname in glob.glob(os.path.join(TXADMIN_BACKUP_DIR, 'txadmin-backup-*.zip')):
-        try:
-            backup_files.append((fname, os.path.getmtime(fname)))
-        except Exception as e:
-            logging.warning(f"Failed to access {fname}: {e}")
+    # Backups beyond keep_count, from the catalog (newest first)
+    catalog = get_catalog()
+    old_backups = catalog.list_backups(BACKUP_TYPE_TXADMIN, TXADMIN_BACKUP_DIR, is_txadmin_backup, offset=keep_count)
     
-    # Sort files by modification time (newest first)
-    backup_files.sort(key=lambda x: x[1], reverse=True)
-    
-    # Delete files beyond the keep_count
+    # Delete them, then drop them from the catalog in one go
     deleted = 0
-    for fpath, _ in backup_files[keep_count:]:
+    removed = []
+    for fpath, _, _ in old_backups:
         try:
             os.remove(fpath)
             deleted += 1
             logging.info(f"Deleted old txAdmin backup: {fpath}")
+        except FileNotFoundError:
+            pass  # Already deleted outside the application
         except Exception as e:
             logging.warning(f"Failed to delete {fpath}: {e}")
+            continue
+        removed.append(fpath)
+    catalog.remove_backups(removed)
     
     return deleted
 
-def get_txadmin_backups():
+def get_txadmin_backups(offset=0, limit=None):
     """
-    Returns a list of txAdmin backup files sorted by date (newest first)
+    Returns a list of txAdmin backup files sorted by date (newest first),
+    from the backup catalog - optionally only 'limit' of them starting at 'offset'
     """
-    backup_files = []
-    if os.path.exists(TXADMIN_BACKUP_DIR):
-        for fname in glob.glob(os.path.join(TXADMIN_BACKUP_DIR, 'txadmin-backup-*.zip')):
-            try:
-                basename = os.path.basename(fname)
-                backup_files.append((fname, os.path.getmtime(fname), basename))
-            except Exception as e:
-                logging.warning(f"Failed to access {fname}: {e}")
-    
-    # Sort files by modification time (newest first)
-    backup_files.sort(key=lambda x: x[1], reverse=True)
-    return backup_files
+    return get_catalog().list_backups(BACKUP_TYPE_TXADMIN, TXADMIN_BACKUP_DIR, is_txadmin_backup, offset, limit)
@@ -2,8 +2,7 @@ import os
 import sys
 import logging
 import subprocess
-from datetime import datetime, timedelta
-from config import LOG_FILE, DB_BACKUP_HOURS, SERVER_BACKUP_HOURS, BACKUP_MINUTE
+from config import LOG_FILE
 from config_manager import get_logs_dir, is_windows
 
 # Ensure logs directory exists
@@ -76,37 +75,3 @@ def restart_application():
     python = sys.executable
     script = os.path.abspath(os.path.join(os.path.dirname(__file__), 'app.py'))
     os.execl(python, python, script)
-
-def calculate_next_backup_time():
-    """
-    Calculate the next scheduled backup time based on current time and schedule
-    """
-    now = datetime.now()
-    
-    # Check all possible backup times for today and tomorrow
-    potential_times = []
-    for day_offset in [0, 1]:  # Today and tomorrow
-        check_date = (now + timedelta(days=day_offset)).date()
-        
-        # Database backups at configured hours
-        for hour in DB_BACKUP_HOURS:
-            backup_time = datetime.combine(check_date, datetime.min.time()).replace(hour=hour, minute=BACKUP_MINUTE)
-            if backup_time > now:
-                potential_times.append((backup_time, "Database"))
-        
-        # Server backups at configured hours
-        for hour in SERVER_BACKUP_HOURS:
-            backup_time = datetime.combine(check_date, datetime.min.time()).replace(hour=hour, minute=BACKUP_MINUTE)
-            if backup_time > now:
-                potential_times.append((backup_time, "Server"))
-    
-    # Return the closest backup time
-    if potential_times:
-        potential_times.sort(key=lambda x: x[0])  # Sort by time
-        return potential_times[0]  # Return time and type
-    else:
-        # Fallback to tomorrow's first backup
-        tomorrow = now + timedelta(days=1)
-        first_hour = min(DB_BACKUP_HOURS + SERVER_BACKUP_HOURS)
-        backup_time = datetime.combine(tomorrow.date(), datetime.min.time()).replace(hour=first_hour, minute=BACKUP_MINUTE)
-        return backup_time, "Database/Server"